@@ -0,0 +1,24 @@
+"""Add cached_tokens to llm_usage
+
+Revision ID: 4e8a0b6c3f21
+Revises: 9b1f4c2d7e10
+Create Date: 2026-10-16 11:02:17.554310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8a0b6c3f21'
+down_revision = '9b1f4c2d7e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('llm_usage', sa.Column('cached_tokens', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('llm_usage', 'cached_tokens')
@@ -0,0 +1,24 @@
+"""Add composite index on llm_usage (user_id, timestamp)
+
+Revision ID: 9b1f4c2d7e10
+Revises: 338cc9f9ac27
+Create Date: 2026-10-16 10:12:41.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1f4c2d7e10'
+down_revision = '338cc9f9ac27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_llm_usage_user_id_timestamp', 'llm_usage', ['user_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_usage_user_id_timestamp', table_name='llm_usage')
@@ -0,0 +1,32 @@
+"""Add task_logs table for append-only task logs
+
+Revision ID: c7d2e5a1b843
+Revises: 4e8a0b6c3f21
+Create Date: 2026-10-16 11:41:05.873012
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e5a1b843'
+down_revision = '4e8a0b6c3f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('task_logs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_logs_task_id'), 'task_logs', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_logs_task_id'), table_name='task_logs')
+    op.drop_table('task_logs')
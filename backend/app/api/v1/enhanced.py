@@ -9,19 +9,23 @@ Includes:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
 import json
 
 from ...database import get_db
-from ...models import Task, Feedback
+from ...models import Task, TaskLog, Feedback
 from ...schemas import TaskDetail, FeedbackSubmit
 from ...services.workflow_monitor import WorkflowMonitor
+from ...services.task_events import get_task_update_hub
 
 router = APIRouter()
 
+# Safety-net re-check for WebSocket clients if a pub/sub event is missed
+TASK_UPDATE_FALLBACK_POLL_SECONDS = 15
+
 
 # WebSocket connection manager
 class ConnectionManager:
@@ -66,10 +70,12 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str, db: Session = D
     Sends updates when task status, logs, or other fields change.
     """
     await manager.connect(websocket, task_id)
+    hub = get_task_update_hub()
+    updates = hub.subscribe(task_id)
 
     try:
         # Send initial status
-        task = db.query(Task).filter(Task.id == task_id).first()
+        task = db.query(Task).options(load_only(Task.status, Task.updated_at)).filter(Task.id == task_id).first()
         if task:
             await websocket.send_json({
                 "type": "status",
@@ -81,10 +87,16 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str, db: Session = D
         # Keep connection alive and send updates
         last_update = None
         while True:
-            # Check for updates every second
-            await asyncio.sleep(1)
-
-            task = db.query(Task).filter(Task.id == task_id).first()
+            # Wake on a published update, or re-check periodically as a fallback
+            try:
+                await asyncio.wait_for(updates.get(), timeout=TASK_UPDATE_FALLBACK_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+            db.expire_all()
+            task = db.query(Task).options(
+                load_only(Task.status, Task.updated_at, Task.branch_name, Task.pr_url)
+            ).filter(Task.id == task_id).first()
             if not task:
                 break
 
@@ -115,6 +127,7 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str, db: Session = D
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        hub.unsubscribe(task_id, updates)
         manager.disconnect(websocket, task_id)
 
 
@@ -138,15 +151,27 @@ def get_task_logs(
             "log_count": int
         }
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).options(load_only(Task.legacy_logs)).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    logs = task.logs or ""
-    log_lines = logs.split('\n')
-
     if tail:
-        log_lines = log_lines[-tail:]
+        # Every entry holds at least one line, so the newest `tail` entries
+        # cover the requested lines without reading the whole log
+        entries = (
+            db.query(TaskLog.message)
+            .filter(TaskLog.task_id == task_id)
+            .order_by(TaskLog.id.desc())
+            .limit(tail)
+            .all()
+        )
+        messages = [message for (message,) in reversed(entries)]
+        if len(entries) < tail and task.legacy_logs:
+            messages.insert(0, task.legacy_logs)
+        log_lines = '\n'.join(messages).split('\n')[-tail:]
+    else:
+        logs = task.logs or ""
+        log_lines = logs.split('\n')
 
     return {
         "task_id": task_id,
@@ -171,7 +196,9 @@ def get_task_status(task_id: str, db: Session = Depends(get_db)) -> Dict[str, An
             "current_step": str
         }
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).options(
+        load_only(Task.status, Task.created_at, Task.updated_at)
+    ).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -221,7 +248,7 @@ def get_task_pr_info(task_id: str, db: Session = Depends(get_db)) -> Dict[str, A
             "has_pr": bool
         }
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).options(load_only(Task.pr_url, Task.branch_name)).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -259,7 +286,7 @@ def submit_feedback(
             "message": str
         }
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).options(load_only(Task.user_id)).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -297,7 +324,7 @@ def get_feedback(task_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
             "feedback": List[dict]
         }
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task.id).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -378,7 +405,9 @@ def get_dashboard(db: Session = Depends(get_db)) -> Dict[str, Any]:
     dashboard = monitor.get_dashboard()
 
     # Add active tasks
-    active_tasks = db.query(Task).filter(
+    active_tasks = db.query(Task).options(
+        load_only(Task.status, Task.created_at, Task.bug_description)
+    ).filter(
         ~Task.status.in_(["COMPLETED", "FAILED", "TIMEOUT"])
     ).order_by(Task.created_at.desc()).all()
 
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from ...database import get_db
-from ...models import Task
+from ...models import Task, TaskLog
 from ...schemas import TaskSubmit, TaskResponse, TaskDetail, TaskListItem
 from ...services.queue import get_task_queue
+from ...services.repo_manager import remove_workspace
 from ...services.worker_tasks import run_task_job
 
 router = APIRouter()
@@ -41,8 +42,7 @@ def submit_task(
             status="QUEUED",
             workspace_path=None,
             branch_name=None,
-            pr_url=None,
-            logs=""
+            pr_url=None
         )
         db.add(db_task)
         db.commit()
@@ -58,7 +58,7 @@ def submit_task(
         if not job:
             # Failed to enqueue (shouldn't happen after can_enqueue check)
             db_task.status = "FAILED"
-            db_task.logs = "Failed to enqueue task"
+            db.add(TaskLog(task_id=db_task.id, message="Failed to enqueue task"))
             db.commit()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,7 +97,12 @@ def get_task(task_id: str, db: Session = Depends(get_db)):
 def list_tasks(db: Session = Depends(get_db)):
     """Get list of all tasks"""
     try:
-        tasks = db.query(Task).order_by(Task.created_at.desc()).all()
+        tasks = (
+            db.query(Task)
+            .options(selectinload(Task.log_entries))
+            .order_by(Task.created_at.desc())
+            .all()
+        )
         return tasks
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list tasks: {str(e)}")
@@ -110,8 +115,9 @@ def cancel_task(task_id: str, db: Session = Depends(get_db)):
 
     This will:
     1. Cancel the job in the queue (if queued/running)
-    2. Delete the task from the database
+    2. Delete the task and its log rows from the database
     3. Remove all job history from Redis
+    4. Remove the task workspace (and its branch in a shared git mirror)
     """
     try:
         # Get task
@@ -134,9 +140,18 @@ def cancel_task(task_id: str, db: Session = Depends(get_db)):
                 print(f"Warning: Failed to cancel/delete job {task.job_id}: {e}")
 
         # Delete task from database
+        workspace_path = task.workspace_path
         db.delete(task)
+        # Log rows have no foreign key to cascade from, so remove them too
+        db.query(TaskLog).filter(TaskLog.task_id == task_id).delete()
         db.commit()
 
+        if workspace_path:
+            try:
+                remove_workspace(workspace_path)
+            except Exception as e:
+                print(f"Warning: Failed to remove workspace {workspace_path}: {e}")
+
         return {
             "success": True,
             "task_id": task_id,
@@ -34,7 +34,7 @@ def get_task_usage(task_id: str, db: Session = Depends(get_db)):
         - Breakdown by model
     """
     # Check if task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task.id).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
@@ -275,10 +275,13 @@ def get_task_metrics(
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
-    # Get tasks in time range
-    tasks = db.query(Task).filter(Task.created_at >= start_date).all()
+    # Count tasks in time range by status
+    status_counts = db.query(
+        Task.status,
+        func.count(Task.id).label("count")
+    ).filter(Task.created_at >= start_date).group_by(Task.status).all()
 
-    if not tasks:
+    if not status_counts:
         return {
             "period_days": days,
             "total_tasks": 0,
@@ -286,18 +289,12 @@ def get_task_metrics(
             "by_status": {}
         }
 
-    # Count by status
-    status_counts = db.query(
-        Task.status,
-        func.count(Task.id).label("count")
-    ).filter(Task.created_at >= start_date).group_by(Task.status).all()
-
     by_status = {row.status: row.count for row in status_counts}
 
     # Calculate success rate
     completed = by_status.get("COMPLETED", 0)
     failed = by_status.get("FAILED", 0)
-    total = len(tasks)
+    total = sum(by_status.values())
     success_rate = (completed / total * 100) if total > 0 else 0
 
     return {
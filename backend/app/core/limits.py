@@ -8,7 +8,7 @@ This module defines all constraints for the ASA system:
 - Timeout configurations
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from enum import Enum
 
 
@@ -34,7 +34,9 @@ class ModelConfig:
         version: str,
         max_tokens_per_call: int,
         max_calls_per_task: int,
-        temperature: float = 0.2
+        temperature: float = 0.2,
+        max_n_per_batch: int = 8,
+        hedge_after_ms: Optional[int] = None
     ):
         self.provider = provider
         self.model = model
@@ -42,6 +44,8 @@ class ModelConfig:
         self.max_tokens_per_call = max_tokens_per_call
         self.max_calls_per_task = max_calls_per_task
         self.temperature = temperature
+        self.max_n_per_batch = max_n_per_batch  # Cap on samples per n= request
+        self.hedge_after_ms = hedge_after_ms  # Async calls only; None disables hedging
 
     def __repr__(self):
         return f"{self.provider}:{self.model}:{self.version}"
@@ -109,7 +113,8 @@ MODEL_CONFIGS: Dict[LLMPurpose, ModelConfig] = {
         version="2024-07-18",
         max_tokens_per_call=1000,
         max_calls_per_task=20,  # Allow many searches
-        temperature=0.0
+        temperature=0.0,
+        hedge_after_ms=3000  # Short, cheap and on the interactive path
     ),
 
     # CIT generation - E2E test creation
@@ -129,7 +134,8 @@ MODEL_CONFIGS: Dict[LLMPurpose, ModelConfig] = {
         version="2024-07-18",
         max_tokens_per_call=1000,
         max_calls_per_task=5,
-        temperature=0.0  # Deterministic for safety
+        temperature=0.0,  # Deterministic for safety
+        hedge_after_ms=8000
     ),
 }
 
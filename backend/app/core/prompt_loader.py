@@ -82,6 +82,10 @@ class PromptVersion:
         """
         Get OpenAI-formatted messages.
 
+        The system message is static and always first, and only the final
+        user message carries variables, so repeated calls share an
+        identical prefix that OpenAI's automatic prompt caching can reuse.
+
         Args:
             **kwargs: Variables for user prompt
 
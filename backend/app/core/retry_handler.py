@@ -9,6 +9,7 @@ Provides decorators and utilities for automatic retry with:
 """
 
 import time
+import asyncio
 import logging
 from typing import Callable, Any, Optional, Type
 from functools import wraps
@@ -31,6 +32,94 @@ class RetryExhausted(Exception):
         )
 
 
+def _retry_wait(
+    error: Exception,
+    attempt: int,
+    error_types: Optional[list[ErrorType]],
+    func_name: str,
+    on_retry: Optional[Callable]
+) -> float:
+    """
+    Decide whether a failed attempt should be retried.
+
+    Returns:
+        Seconds to wait before the next attempt
+
+    Raises:
+        The original error if it is not retryable, or RetryExhausted
+    """
+    if isinstance(error, ASAError):
+        # Check if we should retry this error type
+        if error_types and error.error_type not in error_types:
+            # Not in our retry list, re-raise
+            raise error
+
+        if not error.should_retry:
+            # Error policy says don't retry
+            logger.warning(
+                f"Error is not retryable: {error.error_type.value}. "
+                f"Category: {error.category.value if error.category else 'unknown'}"
+            )
+            raise error
+
+        retry_policy = error.retry_policy
+        if not retry_policy:
+            raise error
+
+        if attempt >= retry_policy.max_attempts:
+            # Exhausted retries
+            logger.error(
+                f"Retry exhausted for {error.error_type.value} "
+                f"after {attempt} attempts"
+            )
+            raise RetryExhausted(error, attempt)
+
+        retry_error = error
+    else:
+        # Classify unknown exception
+        error_type = classify_exception(error)
+
+        logger.info(
+            f"Classified exception {type(error).__name__} as {error_type.value}"
+        )
+
+        # Wrap in ASAError and retry
+        retry_error = ASAError(
+            error_type=error_type,
+            details={"exception_type": type(error).__name__},
+            original_exception=error
+        )
+
+        if not retry_error.should_retry:
+            # Don't retry, re-raise original
+            raise error
+
+        retry_policy = retry_error.retry_policy
+        if not retry_policy or attempt >= retry_policy.max_attempts:
+            # Can't retry or exhausted
+            raise RetryExhausted(error, attempt)
+
+    # Calculate backoff
+    wait_time = min(
+        retry_policy.backoff_seconds * (
+            retry_policy.backoff_multiplier ** (attempt - 1)
+        ),
+        retry_policy.max_backoff_seconds
+    )
+
+    logger.info(
+        f"Retrying {func_name} after {retry_error.error_type.value}. "
+        f"Attempt {attempt}/{retry_policy.max_attempts}. "
+        f"Waiting {wait_time:.1f}s..."
+    )
+
+    # Call retry callback if provided
+    if on_retry:
+        on_retry(attempt, retry_error, wait_time)
+
+    return wait_time
+
+
 def with_retry(
     error_types: Optional[list[ErrorType]] = None,
     on_retry: Optional[Callable] = None
@@ -38,6 +127,9 @@ def with_retry(
     """
     Decorator to automatically retry function calls based on error taxonomy.
 
+    Works on both regular functions and coroutine functions; coroutines
+    back off with asyncio.sleep so the event loop is never blocked.
+
     Args:
         error_types: Optional list of specific error types to handle
                     (if None, handles all ASAErrors based on their policy)
@@ -54,108 +146,29 @@ def with_retry(
             ...
     """
     def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                attempt = 0
+                while True:
+                    attempt += 1
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        wait_time = _retry_wait(e, attempt, error_types, func.__name__, on_retry)
+                        await asyncio.sleep(wait_time)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             attempt = 0
-            last_error: Optional[Exception] = None
-
             while True:
+                attempt += 1
                 try:
-                    attempt += 1
-                    result = func(*args, **kwargs)
-                    return result
-
-                except ASAError as e:
-                    last_error = e
-
-                    # Check if we should retry this error type
-                    if error_types and e.error_type not in error_types:
-                        # Not in our retry list, re-raise
-                        raise
-
-                    if not e.should_retry:
-                        # Error policy says don't retry
-                        logger.warning(
-                            f"Error is not retryable: {e.error_type.value}. "
-                            f"Category: {e.category.value if e.category else 'unknown'}"
-                        )
-                        raise
-
-                    retry_policy = e.retry_policy
-                    if not retry_policy:
-                        raise
-
-                    if attempt >= retry_policy.max_attempts:
-                        # Exhausted retries
-                        logger.error(
-                            f"Retry exhausted for {e.error_type.value} "
-                            f"after {attempt} attempts"
-                        )
-                        raise RetryExhausted(e, attempt)
-
-                    # Calculate backoff
-                    wait_time = min(
-                        retry_policy.backoff_seconds * (
-                            retry_policy.backoff_multiplier ** (attempt - 1)
-                        ),
-                        retry_policy.max_backoff_seconds
-                    )
-
-                    logger.info(
-                        f"Retrying {func.__name__} after {e.error_type.value}. "
-                        f"Attempt {attempt}/{retry_policy.max_attempts}. "
-                        f"Waiting {wait_time:.1f}s..."
-                    )
-
-                    # Call retry callback if provided
-                    if on_retry:
-                        on_retry(attempt, e, wait_time)
-
-                    # Wait before retry
-                    time.sleep(wait_time)
-
+                    return func(*args, **kwargs)
                 except Exception as e:
-                    # Classify unknown exception
-                    last_error = e
-                    error_type = classify_exception(e)
-
-                    logger.info(
-                        f"Classified exception {type(e).__name__} as {error_type.value}"
-                    )
-
-                    # Wrap in ASAError and retry
-                    asa_error = ASAError(
-                        error_type=error_type,
-                        details={"exception_type": type(e).__name__},
-                        original_exception=e
-                    )
-
-                    if not asa_error.should_retry:
-                        # Don't retry, re-raise original
-                        raise
-
-                    retry_policy = asa_error.retry_policy
-                    if not retry_policy or attempt >= retry_policy.max_attempts:
-                        # Can't retry or exhausted
-                        raise RetryExhausted(e, attempt)
-
-                    # Calculate backoff and retry
-                    wait_time = min(
-                        retry_policy.backoff_seconds * (
-                            retry_policy.backoff_multiplier ** (attempt - 1)
-                        ),
-                        retry_policy.max_backoff_seconds
-                    )
-
-                    logger.info(
-                        f"Retrying {func.__name__} after {error_type.value}. "
-                        f"Attempt {attempt}/{retry_policy.max_attempts}. "
-                        f"Waiting {wait_time:.1f}s..."
-                    )
-
-                    if on_retry:
-                        on_retry(attempt, asa_error, wait_time)
-
+                    wait_time = _retry_wait(e, attempt, error_types, func.__name__, on_retry)
                     time.sleep(wait_time)
 
         return wrapper
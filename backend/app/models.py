@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Text, Float, Integer, Boolean
+from sqlalchemy import Column, String, DateTime, Text, Float, Integer, Boolean, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
 import uuid
@@ -14,7 +15,7 @@ class Task(Base):
     workspace_path = Column(String, nullable=True)
     branch_name = Column(String, nullable=True)
     pr_url = Column(String, nullable=True)
-    logs = Column(Text, nullable=True)
+    legacy_logs = Column("logs", Text, nullable=True)  # Pre-TaskLog log text, read-only
     test_output_before = Column(Text, nullable=True)
     e2e_test_path = Column(String, nullable=True)
     job_id = Column(String, nullable=True, index=True)  # RQ job ID for queue tracking
@@ -22,6 +23,30 @@ class Task(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    log_entries = relationship(
+        "TaskLog",
+        primaryjoin="Task.id == foreign(TaskLog.task_id)",
+        order_by="TaskLog.id",
+        viewonly=True,
+    )
+
+    @property
+    def logs(self):
+        """Full log text, stitched from legacy logs and TaskLog rows."""
+        lines = [self.legacy_logs] if self.legacy_logs else []
+        lines.extend(entry.message for entry in self.log_entries)
+        return "\n".join(lines) if lines else self.legacy_logs
+
+
+class TaskLog(Base):
+    """Append-only log lines for a task."""
+    __tablename__ = "task_logs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # Insertion order
+    task_id = Column(String, nullable=False, index=True)
+    message = Column(Text, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
 
 class LLMUsage(Base):
     """Track LLM API usage for cost and observability."""
@@ -34,12 +59,18 @@ class LLMUsage(Base):
     prompt_tokens = Column(Integer, nullable=False, default=0)
     completion_tokens = Column(Integer, nullable=False, default=0)
     total_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0, server_default="0")  # Prompt tokens served from the provider's prompt cache
     cost_usd = Column(Float, nullable=False, default=0.0)
     latency_ms = Column(Float, nullable=False, default=0.0)
     status = Column(String, nullable=False, default="success")
     error_message = Column(Text, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+    __table_args__ = (
+        # Daily per-user budget query: user_id = ? AND timestamp >= ?
+        Index("ix_llm_usage_user_id_timestamp", "user_id", "timestamp"),
+    )
+
 
 class TaskMetrics(Base):
     """Track metrics for task execution and success rates."""
@@ -70,6 +70,19 @@ active_tasks = Gauge(
 )
 
 
+def _openai_pool_connections() -> int:
+    """Read the shared OpenAI client pool size at scrape time."""
+    from app.services.llm_gateway import get_openai_pool_size
+    return get_openai_pool_size()
+
+
+llm_http_pool_connections = Gauge(
+    'llm_http_pool_connections',
+    'Open connections in the shared OpenAI HTTP client pools'
+)
+llm_http_pool_connections.set_function(_openai_pool_connections)
+
+
 def setup_opentelemetry(
     service_name: str = "asa-backend",
     enable_console_export: bool = False,
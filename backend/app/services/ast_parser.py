@@ -4,12 +4,20 @@ AST Parser Service - Uses tree-sitter for structural code parsing.
 Extracts functions, classes, and methods from Python source code.
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import os
+import pickle
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Dict, Any, Optional
+from dataclasses import dataclass, replace
 from pathlib import Path
 import tree_sitter_python as tspython
 from tree_sitter import Language, Parser
 
+from app.services.code_index import INDEX_READ_WORKERS, SKIP_DIRS, iter_python_files
+
 
 @dataclass
 class CodeNode:
@@ -24,6 +32,128 @@ class CodeNode:
     signature: Optional[str] = None
 
 
+# Workspaces with fewer files are parsed in-process; below this the pool's
+# startup and IPC cost outweighs the parallel speedup
+PARALLEL_PARSE_MIN_FILES = 64
+PARSE_CHUNK_SIZE = 32
+
+# Per-process parser for pool workers (tree-sitter parsers don't pickle)
+_worker_parser: Optional["ASTParser"] = None
+
+
+def _parse_one(file_path: str) -> List[CodeNode]:
+    """Parse a file in a pool worker; only the extracted nodes cross IPC."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ASTParser()
+    return _worker_parser.parse_file(file_path)
+
+
+def _hash_file(file_path: str) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it can't be read."""
+    try:
+        return hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+# Parsed nodes are cached on disk by content hash; ASA_AST_CACHE=0 disables
+AST_CACHE_PATH = Path.home() / ".asa" / "ast_cache.sqlite"
+
+# Bump when ASTParser's extraction or the CodeNode fields change, so nodes
+# cached by an older version are never served
+AST_CACHE_VERSION = 1
+AST_CACHE_TABLE = f"ast_cache_v{AST_CACHE_VERSION}"
+
+# Oldest entries are evicted beyond this many cached files
+AST_CACHE_MAX_ENTRIES = int(os.getenv("ASA_AST_CACHE_MAX_ENTRIES", "50000"))
+
+
+class ASTCache:
+    """
+    Persistent cache of parsed nodes keyed by SHA-256 of the file content.
+
+    Parsing is a pure function of the content, so the cache is shared by
+    every workspace; file paths are re-stamped on read. Each
+    AST_CACHE_VERSION has its own table, and tables of other versions are
+    dropped on open.
+    """
+
+    def __init__(self, path: Path = AST_CACHE_PATH, max_entries: int = AST_CACHE_MAX_ENTRIES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        stale = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'ast_cache%' AND name != ?",
+            (AST_CACHE_TABLE,)
+        ).fetchall()
+        for (name,) in stale:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {AST_CACHE_TABLE} (sha TEXT PRIMARY KEY, nodes BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def get_many(self, shas: Iterable[str]) -> Dict[str, List[CodeNode]]:
+        """Return cached node lists for the given content hashes; unreadable entries are misses."""
+        shas = list(shas)
+        found: Dict[str, List[CodeNode]] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(shas), 500):
+                batch = shas[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT sha, nodes FROM {AST_CACHE_TABLE} WHERE sha IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for sha, blob in rows:
+                    try:
+                        found[sha] = pickle.loads(blob)
+                    except Exception:
+                        continue
+        return found
+
+    def put_many(self, items: Dict[str, List[CodeNode]]) -> None:
+        """Store node lists by content hash, evicting the oldest beyond max_entries."""
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {AST_CACHE_TABLE} (sha, nodes) VALUES (?, ?)",
+                [(sha, pickle.dumps(nodes, protocol=pickle.HIGHEST_PROTOCOL)) for sha, nodes in items.items()]
+            )
+            # Rows get increasing rowids as they are written, so everything
+            # below the newest max_entries rowids is the oldest
+            self._conn.execute(
+                f"DELETE FROM {AST_CACHE_TABLE} WHERE rowid <= (SELECT MAX(rowid) FROM {AST_CACHE_TABLE}) - ?",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+_ast_cache: Optional[ASTCache] = None
+
+
+def get_ast_cache() -> Optional[ASTCache]:
+    """
+    Get or create the global AST cache.
+
+    Returns:
+        The cache, or None if disabled via ASA_AST_CACHE=0 or unavailable
+    """
+    global _ast_cache
+
+    if os.getenv("ASA_AST_CACHE", "1").lower() in ("0", "false", "off"):
+        return None
+
+    if _ast_cache is None:
+        try:
+            _ast_cache = ASTCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"AST cache unavailable, parsing without it: {e}")
+            return None
+    return _ast_cache
+
+
 class ASTParser:
     """Parse Python code using tree-sitter to extract structural elements."""
 
@@ -270,7 +400,7 @@ class ASTParser:
 
     def parse_workspace(self, workspace_path: str) -> List[CodeNode]:
         """
-        Parse all Python files in a workspace.
+        Parse all Python files in a workspace, reusing cached parses.
 
         Args:
             workspace_path: Path to the workspace directory
@@ -278,17 +408,54 @@ class ASTParser:
         Returns:
             List of all CodeNode objects found in the workspace
         """
-        workspace = Path(workspace_path)
-        skip_dirs = {'.git', 'venv', 'node_modules', 'dist', 'build', '__pycache__'}
+        file_paths = [
+            str(py_file)
+            for py_file in iter_python_files(workspace_path, SKIP_DIRS | {'__pycache__'})
+        ]
+
+        # Files whose content was parsed before (in any workspace) are
+        # served from the AST cache; only the rest are parsed
+        cache = get_ast_cache()
+        hashes: Dict[str, str] = {}
+        cached: Dict[str, List[CodeNode]] = {}
+        if cache is not None:
+            # Keep many reads in flight; threads release the GIL in read()
+            # and hashlib, so cold-cache reads overlap instead of queueing
+            with ThreadPoolExecutor(max_workers=INDEX_READ_WORKERS) as executor:
+                for file_path, digest in zip(file_paths, executor.map(_hash_file, file_paths)):
+                    if digest is not None:
+                        hashes[file_path] = digest
+            try:
+                cached = cache.get_many(set(hashes.values()))
+            except Exception as e:
+                print(f"AST cache read failed: {e}")
+
+        to_parse = [p for p in file_paths if hashes.get(p) not in cached]
+
+        workers = os.cpu_count() or 1
+        if len(to_parse) >= PARALLEL_PARSE_MIN_FILES and workers > 1:
+            # tree-sitter parsing is CPU-bound, so shard files across cores
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_parse_one, to_parse, chunksize=PARSE_CHUNK_SIZE))
+        else:
+            parsed = [self.parse_file(file_path) for file_path in to_parse]
+        results = dict(zip(to_parse, parsed))
+
+        if cache is not None:
+            misses = {hashes[p]: nodes for p, nodes in results.items() if p in hashes}
+            if misses:
+                try:
+                    cache.put_many(misses)
+                except sqlite3.Error as e:
+                    print(f"AST cache write failed: {e}")
 
         all_nodes = []
-        for py_file in workspace.rglob('*.py'):
-            # Skip directories
-            if any(part in skip_dirs for part in py_file.parts):
-                continue
-
-            nodes = self.parse_file(str(py_file))
-            all_nodes.extend(nodes)
-
-        print(f"Parsed {len(all_nodes)} code nodes from workspace")
+        for file_path in file_paths:
+            if file_path in results:
+                all_nodes.extend(results[file_path])
+            else:
+                all_nodes.extend(replace(node, file_path=file_path) for node in cached[hashes[file_path]])
+
+        print(f"Parsed {len(all_nodes)} code nodes from workspace "
+              f"({len(file_paths) - len(to_parse)} of {len(file_paths)} files from cache)")
         return all_nodes
@@ -10,23 +10,17 @@ Features:
 """
 
 import os
-import sys
 import time
-from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, defer
 
 from app.database import SessionLocal
-from app.models import Task
+from app.models import Task, TaskLog
 from app.services.state_machine import StateMachine, TaskState, TransitionCondition
-
-# Add project root to path
-_orchestrator_file = Path(__file__).resolve()
-project_root = _orchestrator_file.parent.parent.parent.parent
-if project_root.exists():
-    sys.path.insert(0, str(project_root))
+from app.services.task_events import publish_task_update
 
 
 class AutonomousOrchestrator:
@@ -68,12 +62,25 @@ class AutonomousOrchestrator:
         Args:
             task_id: ID of task to process
         """
-        db = SessionLocal()
-        try:
+        with SessionLocal() as db:
             orchestrator = AutonomousOrchestrator(db=db)
             orchestrator.run(task_id)
-        finally:
-            db.close()
+
+    def _get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Load the task without its legacy log text.
+
+        Goes through the identity map, so a state that re-reads the task only
+        hits the database once a commit has expired it, and then selects
+        just the columns the pipeline uses.
+
+        Args:
+            task_id: Task ID to load
+
+        Returns:
+            The task, or None if it does not exist
+        """
+        return self.db.get(Task, task_id, options=[defer(Task.legacy_logs)])
 
     def run(self, task_id: str) -> None:
         """
@@ -83,7 +90,7 @@ class AutonomousOrchestrator:
             task_id: Task ID to process
         """
         # Load task
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
         if not task:
             print(f"Task {task_id} not found")
             return
@@ -117,17 +124,22 @@ class AutonomousOrchestrator:
                     state_machine.transition("failure", error=str(e))
                 except ValueError:
                     # No valid failure transition, force FAILED state
-                    task.status = TaskState.FAILED.value
-                    self.db.commit()
+                    self._set_status(task_id, TaskState.FAILED.value)
                     break
 
+        # The CIT runner container (if any) only serves this task
+        if self.enable_cit:
+            workspace_path = self._get_task(task_id).workspace_path
+            if workspace_path:
+                from app.services.docker_sandbox import stop_runner_container
+                stop_runner_container(workspace_path)
+
         # Workflow complete
         final_state = state_machine.get_current_state()
         self._log(task_id, f"Workflow complete: {final_state.value}")
 
         # Update task status
-        task.status = final_state.value
-        self.db.commit()
+        self._set_status(task_id, final_state.value)
 
         # Log summary
         summary = state_machine.get_summary()
@@ -151,11 +163,7 @@ class AutonomousOrchestrator:
             Result condition (success, failure, etc.)
         """
         # Update task status in DB
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            task.status = state.value
-            task.updated_at = datetime.utcnow()
-            self.db.commit()
+        self._set_status(task_id, state.value)
 
         # Execute state-specific logic
         if state == TaskState.INIT:
@@ -200,7 +208,7 @@ class AutonomousOrchestrator:
 
     def _state_clone_repo(self, task_id: str) -> str:
         """Clone repository."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             from app.services.repo_manager import create_workspace, clone_repo
@@ -220,7 +228,7 @@ class AutonomousOrchestrator:
 
     def _state_index_code(self, task_id: str) -> str:
         """Index codebase."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             # Try semantic indexing first
@@ -260,7 +268,7 @@ class AutonomousOrchestrator:
 
     def _state_verify_bug_behavior(self, task_id: str) -> str:
         """Verify bug with CIT Agent E2E test."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             from app.services.cit_agent import CITAgent
@@ -285,17 +293,15 @@ class AutonomousOrchestrator:
 
     def _state_run_tests_before(self, task_id: str) -> str:
         """Run tests to verify bug exists."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             from app.services.test_runner import run_tests
 
             tests_passed, test_output = run_tests(task.workspace_path, task.test_command)
 
-            # Truncate output
-            truncated = test_output[-5000:] if len(test_output) > 5000 else test_output
-
-            task.test_output_before = truncated
+            # run_tests already returns only the bounded output tail
+            task.test_output_before = test_output
             self.db.commit()
 
             if tests_passed:
@@ -311,7 +317,7 @@ class AutonomousOrchestrator:
 
     def _state_generate_fix(self, task_id: str) -> str:
         """Generate and apply fix."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             # Try enhanced CodeAgent first
@@ -391,14 +397,13 @@ class AutonomousOrchestrator:
 
     def _state_run_tests_after(self, task_id: str) -> str:
         """Run tests after applying fix."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
-            from app.services.test_runner import run_tests
+            from app.services.test_runner import MODE_AFTER, run_tests
 
-            tests_passed, test_output = run_tests(task.workspace_path, task.test_command)
+            tests_passed, test_output = run_tests(task.workspace_path, task.test_command, MODE_AFTER)
 
-            truncated = test_output[-5000:] if len(test_output) > 5000 else test_output
             self._log(task_id, f"Test result: {'PASS' if tests_passed else 'FAIL'}")
 
             if tests_passed:
@@ -412,7 +417,7 @@ class AutonomousOrchestrator:
 
     def _state_verify_fix_behavior(self, task_id: str) -> str:
         """Verify fix with CIT Agent E2E test."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         if not hasattr(task, 'e2e_test_path') or not task.e2e_test_path:
             self._log(task_id, "No E2E test to verify")
@@ -437,7 +442,7 @@ class AutonomousOrchestrator:
 
     def _state_create_pr_branch(self, task_id: str) -> str:
         """Create PR branch."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._get_task(task_id)
 
         try:
             from app.services.repo_manager import create_pr_branch_local
@@ -491,19 +496,47 @@ class AutonomousOrchestrator:
 
         return f"\n### File List (first {len(python_files)} Python files)\n" + "\n".join(f"- {f}" for f in python_files)
 
+    def _set_status(self, task_id: str, status: str) -> bool:
+        """
+        Write a status change in a single UPDATE and commit.
+
+        Args:
+            task_id: Task ID
+            status: New status value
+
+        Returns:
+            False if the task no longer exists
+        """
+        result = self.db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(status=status, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        if result.rowcount == 0:
+            return False
+
+        publish_task_update(task_id)
+        return True
+
     def _log(self, task_id: str, message: str) -> None:
         """Add log message to task."""
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task:
+        now = datetime.utcnow()
+        log_line = f"[{now.isoformat()}] {message}"
+
+        # Touch updated_at without loading the task; rowcount says if it exists
+        result = self.db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
             return
 
-        timestamp = datetime.utcnow().isoformat()
-        log_line = f"[{timestamp}] {message}"
-
-        existing_logs = task.logs or ""
-        task.logs = existing_logs + "\n" + log_line if existing_logs else log_line
-
-        task.updated_at = datetime.utcnow()
+        self.db.add(TaskLog(task_id=task_id, message=log_line))
         self.db.commit()
+        publish_task_update(task_id)
 
         print(log_line)
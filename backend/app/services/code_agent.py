@@ -10,14 +10,35 @@ Generates precise code fixes using LLMs with:
 
 import os
 import json
+import hashlib
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 
 from app.services.patch_schema import CodePatch, PatchSet, PatchType
 from app.services.patch_applicator import PatchApplicator
+from app.services.llm_cache import get_llm_cache
 from app.services.llm_gateway import LLMGateway
 from app.core.limits import LLMPurpose
 
+# Generated patch sets are reused for a week in the LLM cache
+FIX_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+def fix_cache_key(bug_description: str, test_failure_log: str, code_context: str) -> str:
+    """
+    Build the content-addressed cache key for a generated fix.
+
+    Args:
+        bug_description: Description of the bug
+        test_failure_log: Output from failing tests
+        code_context: Code snippets sent to the LLM
+
+    Returns:
+        Cache key for the serialized PatchSet
+    """
+    payload = json.dumps([bug_description, test_failure_log, code_context])
+    return "fix:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class CodeAgent:
     """
@@ -55,6 +76,9 @@ class CodeAgent:
         """
         Generate a structured fix using LLM.
 
+        When ASA_LLM_CACHE is enabled, a fix generated earlier for the same
+        bug, failure log and code context is returned without an LLM call.
+
         Args:
             bug_description: Description of the bug to fix
             test_failure_log: Output from failing tests
@@ -64,6 +88,15 @@ class CodeAgent:
         Returns:
             PatchSet with generated patches
         """
+        cache = get_llm_cache() if not additional_context else None
+        cache_key = None
+        if cache is not None:
+            cache_key = fix_cache_key(bug_description, test_failure_log, code_context)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("Reusing cached fix for identical bug, failure log and context")
+                return PatchSet.from_json(cached)
+
         # Build comprehensive prompt
         prompt = self._build_fix_prompt(
             bug_description=bug_description,
@@ -107,12 +140,20 @@ class CodeAgent:
             patch_set = PatchSet.from_dict(patch_data)
 
             print(f"Generated {len(patch_set.patches)} patch(es)")
+
+            if cache_key is not None:
+                cache.set(cache_key, patch_set.to_json(), ttl=FIX_CACHE_TTL_SECONDS)
+
             return patch_set
 
         except Exception as e:
             print(f"Error generating fix: {e}")
             raise Exception(f"Failed to generate fix: {str(e)}")
 
+        finally:
+            # Write buffered usage now so budget checks and reports see it
+            self.llm_gateway.flush_usage()
+
     def _get_system_prompt(self) -> str:
         """Get the system prompt for the LLM."""
         return """You are an expert software engineer specializing in bug fixes.
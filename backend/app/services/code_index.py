@@ -1,7 +1,38 @@
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
+import hashlib
 import os
 
+# File reads are I/O-bound, so threads are enough (no parsing happens here)
+INDEX_READ_WORKERS = 16
+
+SKIP_DIRS = frozenset({'.git', 'venv', 'node_modules', 'dist', 'build'})
+
+
+def iter_python_files(workspace_path, skip_dirs=SKIP_DIRS) -> Iterator[Path]:
+    """
+    Yield the workspace's Python files, never descending into skip_dirs.
+
+    Pruning during the walk avoids listing .git, virtualenvs and
+    node_modules at all, which usually dominate a workspace's file count.
+    """
+    for dirpath, dirnames, filenames in os.walk(workspace_path):
+        dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+        for filename in filenames:
+            if filename.endswith('.py'):
+                yield Path(dirpath, filename)
+
+
+def _read_file(py_file: Path) -> Optional[str]:
+    try:
+        # One read per file; decoding in Python is cheaper than a text wrapper
+        return py_file.read_bytes().decode('utf-8', errors='ignore')
+    except Exception as e:
+        print(f"Error reading {py_file}: {e}")
+        return None
+
 @dataclass
 class CodeSnippet:
     file_path: str
@@ -16,19 +47,31 @@ class CodeIndex:
 
     def build_index(self) -> None:
         """Walk the workspace and read Python files, storing content in memory."""
-        skip_dirs = {'.git', 'venv', 'node_modules', 'dist', 'build'}
-
-        for py_file in self.workspace_path.rglob('*.py'):
-            # Check if any part of the path is in skip_dirs
-            if any(part in skip_dirs for part in py_file.parts):
-                continue
-
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                self.file_contents[str(py_file)] = content
-            except Exception as e:
-                print(f"Error reading {py_file}: {e}")
+        py_files = list(iter_python_files(self.workspace_path))
+
+        with ThreadPoolExecutor(max_workers=INDEX_READ_WORKERS) as executor:
+            for py_file, content in zip(py_files, executor.map(_read_file, py_files)):
+                if content is not None:
+                    self.file_contents[str(py_file)] = content
+
+    def update(self, file_paths) -> None:
+        """Re-read only the given files, dropping ones that no longer exist."""
+        for file_path in map(str, file_paths):
+            if file_path.endswith('.py') and os.path.isfile(file_path):
+                content = _read_file(Path(file_path))
+                if content is not None:
+                    self.file_contents[file_path] = content
+                    continue
+            self.file_contents.pop(file_path, None)
+
+    def digest(self) -> str:
+        """Hash of the indexed files' relative paths and contents."""
+        h = hashlib.sha256()
+        for file_path in sorted(self.file_contents):
+            rel_path = os.path.relpath(file_path, self.workspace_path)
+            h.update(rel_path.encode("utf-8") + b"\0")
+            h.update(self.file_contents[file_path].encode("utf-8") + b"\0")
+        return h.hexdigest()
 
     def search(self, bug_description: str, max_results: int = 10) -> list[CodeSnippet]:
         """
@@ -1,16 +1,62 @@
 """
 Docker Sandbox - Isolated test execution environment.
 
-Provides disposable Docker containers for running Playwright tests safely.
+Provides Docker containers for running Playwright tests safely. Each run
+uses a disposable container by default; with ASA_CIT_PERSISTENT_RUNNER=true,
+tests are exec'ed into a network-less runner container that mounts only
+the task's own workspace, so verify_bug and verify_fix share one cold
+start. Call stop_runner_container when the task ends.
 """
 
+import os
+import atexit
 import subprocess
 import json
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 
+USE_PERSISTENT_RUNNER = os.getenv("ASA_CIT_PERSISTENT_RUNNER", "false").lower() == "true"
+
+# Runner containers shared by all sandboxes in this process:
+# (image, task workspace) -> container ID
+_runner_containers: Dict[Tuple[str, str], str] = {}
+_runner_lock = threading.Lock()
+
+
+def stop_runner_container(workspace_path: str) -> None:
+    """
+    Remove the runner container(s) of a task workspace.
+
+    Called when the task ends; a no-op if no runner was started for it.
+
+    Args:
+        workspace_path: Path to the task workspace
+    """
+    workspace = str(Path(workspace_path).resolve())
+
+    with _runner_lock:
+        keys = [key for key in _runner_containers if key[1] == workspace]
+        container_ids = [_runner_containers.pop(key) for key in keys]
+
+    if container_ids:
+        subprocess.run(['docker', 'rm', '-f', *container_ids], capture_output=True, text=True)
+
+
+def _stop_runner_containers() -> None:
+    """Remove any runner containers still left when the worker process exits."""
+    with _runner_lock:
+        container_ids = list(_runner_containers.values())
+        _runner_containers.clear()
+
+    if container_ids:
+        subprocess.run(['docker', 'rm', '-f', *container_ids], capture_output=True, text=True)
+
+
+atexit.register(_stop_runner_containers)
+
 
 class DockerSandbox:
     """Manage Docker containers for isolated test execution."""
@@ -62,6 +108,9 @@ class DockerSandbox:
         """
         Run a Playwright test in an isolated Docker container.
 
+        With persistent runners enabled, the test is exec'ed into this
+        workspace's runner container, which mounts no other workspace.
+
         Args:
             test_file_path: Path to the test file (relative to workspace)
             workspace_path: Path to the workspace directory
@@ -93,6 +142,16 @@ class DockerSandbox:
 
         print(f"Running test in Docker: {rel_test_path}")
 
+        if USE_PERSISTENT_RUNNER:
+            runner_id = self._get_runner_container(workspace)
+            if runner_id:
+                return self._exec_in_runner(
+                    runner_id,
+                    '/workspace',
+                    ['npx', 'playwright', 'test', str(rel_test_path), '--reporter=json'],
+                    timeout
+                )
+
         # Build docker run command
         # Mount workspace as /workspace in container
         # Run npx playwright test
@@ -124,6 +183,101 @@ class DockerSandbox:
             print(f"Error running test: {e}")
             return -1, "", str(e)
 
+    def _get_runner_container(self, workspace: Path) -> Optional[str]:
+        """
+        Get the running runner container for a task workspace, starting it if needed.
+
+        Only that workspace is mounted (at /workspace), so tests of one task
+        cannot see any other task's checkout.
+
+        Args:
+            workspace: Task workspace directory
+
+        Returns:
+            Container ID, or None if the runner could not be started
+        """
+        key = (self.image, str(workspace))
+
+        with _runner_lock:
+            container_id = _runner_containers.get(key)
+            if container_id:
+                result = subprocess.run(
+                    ['docker', 'inspect', '-f', '{{.State.Running}}', container_id],
+                    capture_output=True,
+                    text=True
+                )
+                if result.stdout.strip() == 'true':
+                    return container_id
+                del _runner_containers[key]
+
+            try:
+                result = subprocess.run(
+                    [
+                        'docker', 'run', '-d',
+                        '--rm',
+                        '--network', 'none',  # Disable network access for security
+                        '-v', f'{workspace}:/workspace',
+                        '--label', 'com.asa.type=cit-runner',
+                        self.image,
+                        'sleep', 'infinity'
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+            except subprocess.CalledProcessError as e:
+                print(f"Warning: Could not start runner container: {e.stderr}")
+                return None
+
+            container_id = result.stdout.strip()
+            _runner_containers[key] = container_id
+            print(f"Started runner container {container_id[:12]} for {workspace}")
+            return container_id
+
+    def _exec_in_runner(
+        self,
+        container_id: str,
+        workdir: str,
+        command: list,
+        timeout: int
+    ) -> Tuple[int, str, str]:
+        """
+        Run a command in a runner container.
+
+        The command is wrapped in `timeout` inside the container, since
+        killing the docker client would leave it running there.
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+        """
+        cmd = [
+            'docker', 'exec',
+            '-w', workdir,
+            container_id,
+            'timeout', '-s', 'KILL', str(timeout),
+            *command
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout + 10
+            )
+            if result.returncode == 137:
+                print(f"Test execution timed out after {timeout} seconds")
+                return -1, result.stdout, f"Test execution timed out after {timeout} seconds"
+
+            return result.returncode, result.stdout, result.stderr
+
+        except subprocess.TimeoutExpired:
+            print(f"Test execution timed out after {timeout} seconds")
+            return -1, "", f"Test execution timed out after {timeout} seconds"
+        except Exception as e:
+            print(f"Error running test: {e}")
+            return -1, "", str(e)
+
     def run_command(
         self,
         command: str,
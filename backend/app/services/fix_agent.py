@@ -8,11 +8,13 @@ Handles:
 
 import os
 import json
+import hashlib
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from sqlalchemy.orm import Session
 
 from app.services.code_index import CodeIndex, CodeSnippet
+from app.services.llm_cache import get_llm_cache
 from app.services.llm_gateway import LLMGateway
 from app.core.limits import LLMPurpose
 
@@ -22,6 +24,25 @@ except ImportError:
     SemanticCodeIndex = None
     SearchResult = None
 
+# Patches are memoized for this long in the LLM cache
+PATCH_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def patch_cache_key(bug_description: str, failing_output: str, index_digest: str) -> str:
+    """
+    Build the memoization key for a generated patch.
+
+    Args:
+        bug_description: Task bug description
+        failing_output: Output from the failing test run
+        index_digest: Digest of the indexed code (CodeIndex.digest())
+
+    Returns:
+        Cache key for the patch list
+    """
+    payload = json.dumps([bug_description, failing_output, index_digest])
+    return "patch:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class FixAgent:
     """LLM-driven agent for generating code fixes."""
@@ -45,6 +66,10 @@ class FixAgent:
         """
         Generate a structured patch to fix the failing tests.
 
+        Results are memoized in the LLM cache (when ASA_LLM_CACHE is enabled)
+        keyed by the bug, the failing output and the index digest, so retries
+        on an unchanged workspace skip the LLM call.
+
         Args:
             task: Task object with bug_description attribute
             failing_output: Output from the failing test run
@@ -60,6 +85,15 @@ class FixAgent:
                 }
             ]
         """
+        cache = get_llm_cache() if hasattr(code_index, 'digest') else None
+        cache_key = None
+        if cache is not None:
+            cache_key = patch_cache_key(task.bug_description, failing_output, code_index.digest())
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("Reusing memoized patch for unchanged code and test output")
+                return json.loads(cached)
+
         # Get context using semantic or simple search
         if hasattr(code_index, 'get_context'):
             # SemanticCodeIndex has a get_context method
@@ -117,12 +151,37 @@ class FixAgent:
                 if not all(k in patch for k in ["file_path", "old_snippet", "new_snippet"]):
                     raise ValueError(f"Invalid patch format: {patch}")
 
+            if cache_key is not None:
+                cache.set(
+                    cache_key,
+                    json.dumps(self._relative_patches(patches, code_index.workspace_path)),
+                    ttl=PATCH_CACHE_TTL_SECONDS
+                )
+
             return patches
 
         except Exception as e:
             print(f"Error generating patch: {e}")
             raise Exception(f"Failed to generate patch: {str(e)}")
 
+        finally:
+            self.llm_gateway.flush_usage()
+
+    @staticmethod
+    def _relative_patches(patches: List[Dict[str, str]], workspace_path) -> List[Dict[str, str]]:
+        """Rewrite absolute file paths inside the workspace as relative ones."""
+        workspace = Path(workspace_path).resolve()
+        relative = []
+        for patch in patches:
+            file_path = Path(patch["file_path"])
+            if file_path.is_absolute():
+                try:
+                    file_path = file_path.resolve().relative_to(workspace)
+                except ValueError:
+                    pass
+            relative.append({**patch, "file_path": str(file_path)})
+        return relative
+
     def _build_context(self, snippets: List[CodeSnippet]) -> str:
         """Build context string from code snippets."""
         if not snippets:
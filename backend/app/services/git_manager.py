@@ -9,11 +9,13 @@ Features:
 """
 
 import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 import git
-from git import Repo, GitCommandError
+from git import Actor, Repo, GitCommandError
 
 
 class GitAuthenticationError(Exception):
@@ -41,22 +43,43 @@ class GitManager:
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
         self.git_username = git_username or os.getenv("GIT_USERNAME", "ASA Bot")
         self.git_email = git_email or os.getenv("GIT_EMAIL", "asa@bot.com")
+        self._actor = Actor(self.git_username, self.git_email)
+
+        # Long-running `git cat-file --batch-check` helpers, one per repo path
+        self._batch_procs: Dict[str, subprocess.Popen] = {}
+
+        # GitPython Repo handles, keyed by realpath
+        self._repo_cache: Dict[str, Repo] = {}
+
+        # Repos whose origin already points at the authenticated URL
+        self._authed_repos: Set[str] = set()
 
     def clone_repo(
         self,
         repo_url: str,
         workspace_path: str,
         branch: str = "main",
-        depth: Optional[int] = None
+        depth: Optional[int] = 1,
+        full_history: bool = False,
+        filter_blobs: bool = True,
+        sparse_paths: Optional[List[str]] = None
     ) -> Repo:
         """
         Clone a git repository with authentication.
 
+        By default only the tip of a single branch is fetched (no tags), which
+        is all a fix-commit-push workflow needs. File contents are fetched as
+        a partial clone, so blobs are only downloaded when checked out; with
+        sparse_paths only those directories are checked out at all.
+
         Args:
             repo_url: Repository URL (HTTPS or SSH)
             workspace_path: Local path to clone to
             branch: Branch to checkout (default: main)
-            depth: Clone depth for shallow clone (None = full clone)
+            depth: Clone depth for shallow clone (default: 1, None = full clone)
+            full_history: Fetch the full history regardless of depth
+            filter_blobs: Partial clone with --filter=blob:none
+            sparse_paths: Restrict the checkout to these paths (sparse-checkout)
 
         Returns:
             GitPython Repo object
@@ -76,18 +99,39 @@ class GitManager:
         try:
             clone_kwargs = {
                 'branch': branch,
+                'single_branch': True,
+                'no_tags': True,
             }
 
-            if depth:
+            if depth and not full_history:
                 clone_kwargs['depth'] = depth
 
+            if filter_blobs:
+                clone_kwargs['filter'] = 'blob:none'
+
+            if sparse_paths:
+                # Check out only after the sparse cone is configured
+                clone_kwargs['no_checkout'] = True
+
             repo = Repo.clone_from(
                 authenticated_url,
                 workspace_path,
                 **clone_kwargs
             )
 
+            if sparse_paths:
+                repo.git.sparse_checkout('set', *sparse_paths)
+                repo.git.checkout(branch)
+
             print(f"✓ Successfully cloned repository")
+
+            # Replace any stale handle for this path with the fresh clone
+            key = os.path.realpath(workspace_path)
+            self._repo_cache[key] = repo
+
+            # Origin was cloned from the authenticated URL already
+            if authenticated_url != repo_url:
+                self._authed_repos.add(key)
             return repo
 
         except GitCommandError as e:
@@ -97,6 +141,57 @@ class GitManager:
                 )
             raise
 
+    def clone_many(
+        self,
+        repos: List[Tuple[str, str]],
+        branch: str = "main",
+        max_workers: int = 8,
+        **clone_kwargs
+    ) -> List[Repo]:
+        """
+        Clone several repositories concurrently.
+
+        Clones are network-bound, so running them side by side amortizes
+        connection setup and server-side latency across the batch. The
+        worker count bounds the number of concurrent git processes (and
+        their file descriptors).
+
+        Args:
+            repos: List of (repo_url, workspace_path) pairs
+            branch: Branch to checkout in every clone
+            max_workers: Maximum number of concurrent clones
+            **clone_kwargs: Extra arguments forwarded to clone_repo
+
+        Returns:
+            List of Repo objects in input order
+
+        Raises:
+            The first clone error, after all clones have finished
+        """
+        if not repos:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(repos)))) as executor:
+            futures = [
+                executor.submit(self.clone_repo, repo_url, workspace_path, branch, **clone_kwargs)
+                for repo_url, workspace_path in repos
+            ]
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            raise errors[0]
+
+        return [f.result() for f in futures]
+
+    def _get_repo(self, repo_path: str) -> Repo:
+        """Get a cached Repo handle, opening the repository on first use."""
+        key = os.path.realpath(repo_path)
+        repo = self._repo_cache.get(key)
+        if repo is None:
+            repo = Repo(repo_path)
+            self._repo_cache[key] = repo
+        return repo
+
     def _add_auth_to_url(self, repo_url: str) -> str:
         """Add authentication token to HTTPS URL."""
         if not self.github_token:
@@ -106,12 +201,21 @@ class GitManager:
         if not repo_url.startswith('https://'):
             return repo_url
 
+        # Fast path: splice the token in front of the netloc
+        # Format: https://{token}@github.com/user/repo.git
+        rest = repo_url[8:]
+        slash = rest.find('/')
+        netloc = rest if slash == -1 else rest[:slash]
+        if netloc:
+            if '@' in netloc:
+                return repo_url
+            return f"https://{self.github_token}@{rest}"
+
         # Parse URL
         parsed = urlparse(repo_url)
 
         # Add token to netloc
         if '@' not in parsed.netloc:
-            # Format: https://{token}@github.com/user/repo.git
             authenticated_netloc = f"{self.github_token}@{parsed.netloc}"
             authenticated_url = urlunparse((
                 parsed.scheme,
@@ -139,7 +243,7 @@ class GitManager:
             branch_name: Name of new branch
             base_branch: Branch to create from (None = current branch)
         """
-        repo = Repo(repo_path)
+        repo = self._get_repo(repo_path)
 
         # Checkout base branch if specified
         if base_branch and base_branch != repo.active_branch.name:
@@ -154,37 +258,67 @@ class GitManager:
         repo_path: str,
         message: str,
         author_name: Optional[str] = None,
-        author_email: Optional[str] = None
+        author_email: Optional[str] = None,
+        stage_all: bool = False
     ) -> str:
         """
         Stage all changes and create a commit.
 
+        Only the paths reported by `git status` are staged, so the worktree
+        is not re-walked.
+
         Args:
             repo_path: Path to git repository
             message: Commit message
             author_name: Override default author name
             author_email: Override default author email
+            stage_all: Fall back to `git add .` instead of staging known paths
 
         Returns:
             Commit SHA
         """
-        repo = Repo(repo_path)
-
-        # Stage all changes
-        repo.git.add('.')
+        repo = self._get_repo(repo_path)
+
+        if stage_all:
+            repo.git.add('.')
+            # After `git add .` nothing is untracked; compare the index with
+            # HEAD the same way `git commit` does (exit status 1 = changes)
+            status, _, _ = repo.git.diff_index(
+                '--cached', '--quiet', 'HEAD',
+                with_extended_output=True,
+                with_exceptions=False
+            )
+            has_changes = status != 0
+        else:
+            modified, staged, untracked = self._status(repo_path)
+            paths_to_stage = sorted(set(modified) | set(untracked))
+
+            if paths_to_stage:
+                # Deleted files must be removed from the index, not added
+                present, removed = [], []
+                for path in paths_to_stage:
+                    exists = os.path.lexists(os.path.join(repo_path, path))
+                    (present if exists else removed).append(path)
+                if present:
+                    repo.index.add(present)
+                if removed:
+                    repo.index.remove(removed)
+
+            has_changes = bool(paths_to_stage or staged)
 
         # Check if there are changes to commit
-        if not repo.is_dirty() and not repo.untracked_files:
+        if not has_changes:
             print("No changes to commit")
             return ""
 
-        # Configure user if not already set
-        with repo.config_writer() as config:
-            config.set_value('user', 'name', author_name or self.git_username)
-            config.set_value('user', 'email', author_email or self.git_email)
+        # Pass identity per commit instead of rewriting .git/config
+        if author_name or author_email:
+            actor = Actor(author_name or self.git_username, author_email or self.git_email)
+        else:
+            actor = self._actor
 
         # Create commit
-        commit = repo.index.commit(message)
+        commit = repo.index.commit(message, author=actor, committer=actor)
         print(f"✓ Created commit: {commit.hexsha[:8]}")
         return commit.hexsha
 
@@ -204,7 +338,7 @@ class GitManager:
             remote: Remote name (default: origin)
             force: Force push
         """
-        repo = Repo(repo_path)
+        repo = self._get_repo(repo_path)
 
         if branch_name:
             # Push specific branch
@@ -213,17 +347,19 @@ class GitManager:
             # Push current branch
             refspec = repo.active_branch.name
 
-        # Setup authenticated remote if token available
-        if self.github_token and remote == 'origin':
+        # Setup authenticated remote once per repo if token available
+        key = os.path.realpath(repo_path)
+        if self.github_token and remote == 'origin' and key not in self._authed_repos:
             self._setup_authenticated_remote(repo)
+            self._authed_repos.add(key)
 
-        # Push
-        push_kwargs = {}
+        # Push all refspecs in a single atomic invocation
+        push_args = ['--atomic']
         if force:
-            push_kwargs['force'] = True
+            push_args.append('--force')
 
         try:
-            repo.remotes[remote].push(refspec, **push_kwargs)
+            repo.git.push(*push_args, remote, refspec)
             print(f"✓ Pushed {refspec} to {remote}")
         except GitCommandError as e:
             if "authentication failed" in str(e).lower():
@@ -249,6 +385,111 @@ class GitManager:
         except Exception as e:
             print(f"Warning: Could not setup authenticated remote: {e}")
 
+    def _batch_check(self, repo_path: str, rev: str) -> Optional[str]:
+        """
+        Resolve a revision to its object SHA via a persistent cat-file process.
+
+        Queries are streamed over the helper's pipes instead of forking a new
+        git process for every lookup.
+
+        Args:
+            repo_path: Path to git repository
+            rev: Revision to resolve (e.g. "HEAD", "origin/main")
+
+        Returns:
+            Object SHA, or None if the revision does not exist
+        """
+        key = os.path.realpath(repo_path)
+        proc = self._batch_procs.get(key)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                ['git', '-C', key, 'cat-file',
+                 '--batch-check=%(objectname) %(objecttype) %(objectsize)'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            self._batch_procs[key] = proc
+
+        proc.stdin.write(f"{rev}\n")
+        proc.stdin.flush()
+        line = proc.stdout.readline().strip()
+
+        if not line or line.endswith(" missing") or line.endswith(" ambiguous"):
+            return None
+        return line.split(" ", 1)[0]
+
+    def _status(self, repo_path: str) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Get working tree status from a single `git status` call.
+
+        Not cached: worktree edits do not touch .git/index, so nothing
+        cheaper than `git status` itself tells whether a result is stale.
+
+        Args:
+            repo_path: Path to git repository
+
+        Returns:
+            Tuple of (modified, staged, untracked) path lists
+        """
+        result = subprocess.run(
+            ['git', '-C', repo_path, 'status', '--porcelain=v2', '-z', '--untracked-files=normal'],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+
+        modified: List[str] = []
+        staged: List[str] = []
+        untracked: List[str] = []
+
+        entries = iter(result.stdout.split('\0'))
+        for entry in entries:
+            if not entry:
+                continue
+            kind = entry[0]
+            if kind == '?':
+                untracked.append(entry[2:])
+                continue
+            if kind not in ('1', '2', 'u'):
+                continue
+
+            # Ordinary (1), rename/copy (2) and unmerged (u) entries carry
+            # a fixed number of space-separated fields before the path.
+            fields = {'1': 8, '2': 9, 'u': 10}[kind]
+            parts = entry.split(' ', fields)
+            xy, path = parts[1], parts[fields]
+            if kind == '2':
+                next(entries, None)  # original path of the rename
+
+            if xy[0] != '.':
+                staged.append(path)
+            if xy[1] != '.':
+                modified.append(path)
+
+        return modified, staged, untracked
+
+    def close(self) -> None:
+        """Terminate any persistent git helper processes and cached repos."""
+        for proc in self._batch_procs.values():
+            if proc.poll() is None:
+                proc.stdin.close()
+                proc.wait()
+        self._batch_procs.clear()
+
+        for repo in self._repo_cache.values():
+            repo.close()
+        self._repo_cache.clear()
+
+    def __del__(self):
+        """Clean up helper processes."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def get_repo_info(self, repo_path: str) -> dict:
         """
         Get repository information.
@@ -259,15 +500,17 @@ class GitManager:
         Returns:
             Dictionary with repo info
         """
-        repo = Repo(repo_path)
+        repo = self._get_repo(repo_path)
+        head_sha = self._batch_check(repo_path, "HEAD")
+        modified, staged, untracked = self._status(repo_path)
 
         return {
             "active_branch": repo.active_branch.name,
-            "is_dirty": repo.is_dirty(),
-            "untracked_files": len(repo.untracked_files),
+            "is_dirty": bool(modified or staged),
+            "untracked_files": len(untracked),
             "remote_url": repo.remotes.origin.url if repo.remotes else None,
             "commits_ahead": self._commits_ahead(repo),
-            "last_commit": repo.head.commit.hexsha[:8] if repo.head.commit else None
+            "last_commit": head_sha[:8] if head_sha else None
         }
 
     def _commits_ahead(self, repo: Repo) -> int:
@@ -278,9 +521,12 @@ class GitManager:
             if not tracking:
                 return 0
 
-            # Count commits ahead
-            commits = list(repo.iter_commits(f'{tracking.name}..HEAD'))
-            return len(commits)
+            # Tracking ref may not exist locally (e.g. never fetched)
+            if not self._batch_check(repo.working_tree_dir, tracking.name):
+                return 0
+
+            # Count commits ahead without materializing commit objects
+            return int(repo.git.rev_list('--count', f'{tracking.name}..HEAD'))
         except Exception:
             return 0
 
@@ -294,28 +540,26 @@ class GitManager:
         Returns:
             Human-readable diff summary
         """
-        repo = Repo(repo_path)
+        modified, staged, untracked = self._status(repo_path)
 
-        if not repo.is_dirty() and not repo.untracked_files:
+        if not modified and not staged and not untracked:
             return "No changes"
 
         summary_parts = []
 
         # Modified files
-        modified = [item.a_path for item in repo.index.diff(None)]
         if modified:
             summary_parts.append(f"Modified: {', '.join(modified)}")
 
         # Staged files
-        staged = [item.a_path for item in repo.index.diff('HEAD')]
         if staged:
             summary_parts.append(f"Staged: {', '.join(staged)}")
 
         # Untracked files
-        if repo.untracked_files:
-            summary_parts.append(f"Untracked: {', '.join(repo.untracked_files[:5])}")
-            if len(repo.untracked_files) > 5:
-                summary_parts.append(f"... and {len(repo.untracked_files) - 5} more")
+        if untracked:
+            summary_parts.append(f"Untracked: {', '.join(untracked[:5])}")
+            if len(untracked) > 5:
+                summary_parts.append(f"... and {len(untracked) - 5} more")
 
         return "\n".join(summary_parts)
 
@@ -9,13 +9,141 @@ Features:
 """
 
 import os
-from typing import Optional, List, Dict, Any
+import re
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
-from github import Github, GithubException
-from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from github import Github, GithubException, InputFileContent
+from urllib3.util.retry import Retry
+from github.Repository import Repository
 from sqlalchemy.orm import Session
 
-from app.services.run_report import generate_pr_body_for_task
+from app.services.run_report import RunReport
+
+
+# Matches both SSH (git@host:owner/repo.git) and HTTPS (https://host/owner/repo[.git]) URLs
+_REPO_URL_RE = re.compile(r'^(?:git@[^:]+:|https?://[^/]+/)([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+# Opt-in: test logs larger than this are also uploaded to a secret gist.
+# Anyone with the link can read a secret gist and it outlives the PR, so
+# logs from private repos stay off by default (only the inline tail is kept)
+UPLOAD_LOGS_TO_GIST = os.getenv("ASA_PR_LOG_GISTS", "false").lower() == "true"
+GIST_THRESHOLD_BYTES = 4096
+
+# Labels applied to every automated fix PR
+FIX_PR_LABELS = ["bug", "automated-fix", "asa-bot"]
+
+# Static parts of the legacy PR body, rendered once at import time
+_PR_HEADER = (
+    "## 🤖 Automated Fix by ASA\n\n"
+    "This pull request was automatically generated by the ASA (Automated Software Agent) system.\n\n"
+)
+
+_PR_CHECKLIST = (
+    "## ✓ Review Checklist\n\n"
+    "- [ ] Code changes are minimal and focused\n"
+    "- [ ] All tests pass\n"
+    "- [ ] No unintended side effects\n"
+    "- [ ] Code follows project style guidelines\n"
+    "- [ ] Documentation updated (if needed)\n\n"
+)
+
+_PR_FOOTER = (
+    "---\n\n"
+    "🤖 *Generated by [ASA](https://github.com/your-org/asa) - Automated Software Agent*\n"
+)
+
+_PR_TEMPLATE = (
+    _PR_HEADER
+    + "## 🐛 Bug Description\n\n{bug}\n\n"
+    + "## 🔧 Fix Summary\n\n{fix}\n\n"
+    + "{patches_section}"
+    + "{confidence_section}"
+    + "## ✅ Test Results\n\n"
+    + "{before_section}"
+    + "{after_section}"
+    + _PR_CHECKLIST
+    + _PR_FOOTER
+    + "📅 *Created on {created}*"
+)
+
+
+def _render_patches(patches_applied: List[Dict[str, Any]]) -> str:
+    """Render the "Changes Made" section of the PR body."""
+    entries = "".join(
+        f"### {i}. {patch.get('description', 'Code patch')}\n"
+        f"- **File**: `{patch.get('file_path', 'unknown')}`\n"
+        f"- **Lines**: {patch.get('start_line', '?')}-{patch.get('end_line', '?')}\n"
+        f"- **Type**: {patch.get('patch_type', 'replace')}\n\n"
+        for i, patch in enumerate(patches_applied, 1)
+    )
+    return f"## 📝 Changes Made\n\n{entries}"
+
+
+# Confidence bars for 0-100% in 10% steps
+_CONF_BARS = ["█" * i for i in range(11)]
+
+
+def _render_confidence(confidence_score: float) -> str:
+    """Render the "Confidence Score" section of the PR body."""
+    confidence_pct = confidence_score * 100
+    confidence_bar = _CONF_BARS[max(0, min(10, int(confidence_pct / 10)))]
+    return f"## 📊 Confidence Score\n\n**{confidence_pct:.1f}%** `{confidence_bar}`\n\n"
+
+
+def _render_test_log(heading: str, log: str, full_log_url: Optional[str]) -> str:
+    """Render a test log subsection, keeping the last 500 chars inline."""
+    link = f"[Full log]({full_log_url})\n" if full_log_url else ""
+    return f"### {heading}\n```\n{log[-500:]}\n```\n{link}\n"
+
+
+# REST and GraphQL endpoints used directly over the shared requests session
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+GITHUB_TIMEOUT_SECONDS = 15
+
+# Retry transient gateway errors on both the PyGithub and GraphQL paths
+_GITHUB_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+
+# Shared GitHub clients, one per token, so HTTP connections are reused
+_github_clients: Dict[str, Github] = {}
+_github_sessions: Dict[str, requests.Session] = {}
+
+
+def get_github_client(github_token: str) -> Github:
+    """Get or create the shared GitHub client for a token."""
+    client = _github_clients.get(github_token)
+    if client is None:
+        client = Github(
+            github_token,
+            per_page=100,
+            timeout=GITHUB_TIMEOUT_SECONDS,
+            retry=_GITHUB_RETRY,
+            pool_size=20
+        )
+        _github_clients[github_token] = client
+    return client
+
+
+def get_github_session(github_token: str) -> requests.Session:
+    """Get or create the shared HTTP session used for GraphQL calls."""
+    session = _github_sessions.get(github_token)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"Bearer {github_token}",
+            "Accept": "application/vnd.github+json",
+        })
+        session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=_GITHUB_RETRY
+        ))
+        _github_sessions[github_token] = session
+    return session
 
 
 class GitHubPRManager:
@@ -32,7 +160,11 @@ class GitHubPRManager:
         if not self.github_token:
             raise ValueError("GitHub token required. Set GITHUB_TOKEN environment variable.")
 
-        self.github = Github(self.github_token)
+        self.github = get_github_client(self.github_token)
+        self._http = get_github_session(self.github_token)
+
+        # Repository objects keyed by (owner, name)
+        self._repo_cache: Dict[Tuple[str, str], Repository] = {}
 
     def create_pull_request(
         self,
@@ -68,52 +200,186 @@ class GitHubPRManager:
                 "created_at": timestamp
             }
         """
-        # Parse repo from URL
         owner, repo_name = self._parse_repo_url(repo_url)
+        labels = labels or []
+        assignees = assignees or []
+        reviewers = reviewers or []
 
-        # Get repository
-        try:
-            repo = self.github.get_repo(f"{owner}/{repo_name}")
-        except GithubException as e:
-            raise ValueError(f"Failed to access repository {owner}/{repo_name}: {e}")
-
-        # Create PR
         try:
-            pr = repo.create_pull(
-                title=title,
-                body=body,
-                head=head_branch,
-                base=base_branch
+            # Round trip 1: resolve node IDs for the repo, labels and users
+            ids = self._resolve_node_ids(owner, repo_name, assignees + reviewers)
+
+            # Round trip 2: create the PR
+            data = self._graphql(
+                """
+                mutation($input: CreatePullRequestInput!) {
+                  createPullRequest(input: $input) {
+                    pullRequest { id number url state createdAt }
+                  }
+                }
+                """,
+                {
+                    "input": {
+                        "repositoryId": ids["repository_id"],
+                        "baseRefName": base_branch,
+                        "headRefName": head_branch,
+                        "title": title,
+                        "body": body,
+                    }
+                }
+            )
+            pr = data["createPullRequest"]["pullRequest"]
+            print(f"✓ Created PR #{pr['number']}: {pr['url']}")
+
+            # Round trip 3: labels, assignees and reviewers in one batch.
+            # The PR ID is only known after creation, so this cannot be
+            # folded into the createPullRequest request.
+            label_ids = [ids["labels"][name] for name in labels if name in ids["labels"]]
+            missing_labels = [name for name in labels if name not in ids["labels"]]
+            self._update_pr_metadata(
+                pr_id=pr["id"],
+                label_ids=label_ids,
+                assignee_ids=[ids["users"][login] for login in assignees],
+                reviewer_ids=[ids["users"][login] for login in reviewers]
             )
 
-            print(f"✓ Created PR #{pr.number}: {pr.html_url}")
+            # GraphQL cannot create labels; REST creates unknown labels on the fly
+            if missing_labels:
+                response = self._http.post(
+                    f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/issues/{pr['number']}/labels",
+                    json={"labels": missing_labels},
+                    timeout=GITHUB_TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
 
-            # Add labels
             if labels:
-                pr.add_to_labels(*labels)
                 print(f"✓ Added labels: {', '.join(labels)}")
-
-            # Add assignees
             if assignees:
-                pr.add_to_assignees(*assignees)
                 print(f"✓ Assigned to: {', '.join(assignees)}")
-
-            # Request reviewers
             if reviewers:
-                pr.create_review_request(reviewers=reviewers)
                 print(f"✓ Requested review from: {', '.join(reviewers)}")
 
             return {
-                "number": pr.number,
-                "url": pr.url,
-                "html_url": pr.html_url,
-                "state": pr.state,
-                "created_at": pr.created_at.isoformat()
+                "number": pr["number"],
+                "url": f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/pulls/{pr['number']}",
+                "html_url": pr["url"],
+                "state": pr["state"].lower(),
+                "created_at": datetime.fromisoformat(pr["createdAt"].replace("Z", "+00:00")).isoformat()
             }
 
-        except GithubException as e:
+        except (requests.RequestException, KeyError) as e:
             raise ValueError(f"Failed to create PR: {e}")
 
+    def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a GitHub GraphQL query or mutation.
+
+        Args:
+            query: GraphQL document
+            variables: Query variables
+
+        Returns:
+            The "data" object of the response
+
+        Raises:
+            ValueError: If GitHub returns an HTTP or GraphQL error
+        """
+        response = self._http.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            timeout=GITHUB_TIMEOUT_SECONDS
+        )
+        if response.status_code != 200:
+            raise ValueError(f"GitHub GraphQL request failed ({response.status_code}): {response.text[:200]}")
+
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", "unknown error") for error in payload["errors"])
+            raise ValueError(f"GitHub GraphQL error: {messages}")
+
+        return payload["data"]
+
+    def _resolve_node_ids(self, owner: str, repo_name: str, logins: List[str]) -> Dict[str, Any]:
+        """
+        Look up the repository, label and user node IDs in one query.
+
+        Users are fetched through aliased fields (u0, u1, ...) so any number
+        of assignees/reviewers costs a single round trip.
+
+        Returns:
+            {"repository_id": str, "labels": {name: id}, "users": {login: id}}
+        """
+        logins = list(dict.fromkeys(logins))
+        user_vars = "".join(f", $u{i}: String!" for i in range(len(logins)))
+        user_fields = "\n".join(f"u{i}: user(login: $u{i}) {{ id }}" for i in range(len(logins)))
+
+        variables: Dict[str, Any] = {"owner": owner, "name": repo_name}
+        variables.update({f"u{i}": login for i, login in enumerate(logins)})
+
+        data = self._graphql(
+            f"""
+            query($owner: String!, $name: String!{user_vars}) {{
+              repository(owner: $owner, name: $name) {{
+                id
+                labels(first: 100) {{ nodes {{ id name }} }}
+              }}
+              {user_fields}
+            }}
+            """,
+            variables
+        )
+
+        repository = data["repository"]
+        if repository is None:
+            raise ValueError(f"Failed to access repository {owner}/{repo_name}")
+
+        return {
+            "repository_id": repository["id"],
+            "labels": {label["name"]: label["id"] for label in repository["labels"]["nodes"]},
+            "users": {login: data[f"u{i}"]["id"] for i, login in enumerate(logins)}
+        }
+
+    def _update_pr_metadata(
+        self,
+        pr_id: str,
+        label_ids: List[str],
+        assignee_ids: List[str],
+        reviewer_ids: List[str]
+    ) -> None:
+        """Add labels, assignees and review requests in one aliased mutation."""
+        declarations = ["$prId: ID!"]
+        fields = []
+        variables: Dict[str, Any] = {"prId": pr_id}
+
+        if label_ids:
+            declarations.append("$labelIds: [ID!]!")
+            fields.append(
+                "lbl: addLabelsToLabelable(input: {labelableId: $prId, labelIds: $labelIds}) { clientMutationId }"
+            )
+            variables["labelIds"] = label_ids
+
+        if assignee_ids:
+            declarations.append("$assigneeIds: [ID!]!")
+            fields.append(
+                "asg: addAssigneesToAssignable(input: {assignableId: $prId, assigneeIds: $assigneeIds}) { clientMutationId }"
+            )
+            variables["assigneeIds"] = assignee_ids
+
+        if reviewer_ids:
+            declarations.append("$reviewerIds: [ID!]")
+            fields.append(
+                "rev: requestReviews(input: {pullRequestId: $prId, userIds: $reviewerIds}) { clientMutationId }"
+            )
+            variables["reviewerIds"] = reviewer_ids
+
+        if not fields:
+            return
+
+        self._graphql(
+            f"mutation({', '.join(declarations)}) {{\n" + "\n".join(fields) + "\n}",
+            variables
+        )
+
     def create_fix_pr(
         self,
         repo_url: str,
@@ -147,14 +413,52 @@ class GitHubPRManager:
         Returns:
             PR information dictionary
         """
+        title, body = self._prepare_fix_pr(
+            task_id=task_id,
+            db=db,
+            bug_description=bug_description,
+            fix_summary=fix_summary,
+            test_results_before=test_results_before,
+            test_results_after=test_results_after,
+            patches_applied=patches_applied,
+            confidence_score=confidence_score
+        )
+
+        return self.create_pull_request(
+            repo_url=repo_url,
+            head_branch=head_branch,
+            base_branch=base_branch,
+            title=title,
+            body=body,
+            labels=FIX_PR_LABELS
+        )
+
+    def _prepare_fix_pr(
+        self,
+        task_id: str,
+        db: Session,
+        bug_description: Optional[str] = None,
+        fix_summary: Optional[str] = None,
+        test_results_before: Optional[str] = None,
+        test_results_after: Optional[str] = None,
+        patches_applied: Optional[List[Dict[str, Any]]] = None,
+        confidence_score: Optional[float] = None
+    ) -> Tuple[str, str]:
+        """
+        Build the title and body for a fix PR.
+
+        Uses RunReport when available and falls back to the legacy template.
+
+        Returns:
+            Tuple of (title, body)
+        """
         # Generate PR body using RunReport (uses the comprehensive template)
         try:
-            body = generate_pr_body_for_task(task_id, db)
-            # Extract title from bug_description in task
-            from app.models import Task
-            task = db.query(Task).filter(Task.id == task_id).first()
-            if task and task.bug_description:
-                title = self._generate_pr_title(task.bug_description)
+            report = RunReport(task_id, db)
+            body = report.generate_pr_body()
+            # Title comes from the task the report already loaded
+            if report.task.bug_description:
+                title = self._generate_pr_title(report.task.bug_description)
             else:
                 title = self._generate_pr_title(bug_description or "Automated bug fix")
         except Exception as e:
@@ -170,19 +474,18 @@ class GitHubPRManager:
                 confidence_score=confidence_score
             )
 
-        return self.create_pull_request(
-            repo_url=repo_url,
-            head_branch=head_branch,
-            base_branch=base_branch,
-            title=title,
-            body=body,
-            labels=["bug", "automated-fix", "asa-bot"]
-        )
+        return title, body
 
-    def _generate_pr_title(self, bug_description: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _generate_pr_title(bug_description: str) -> str:
         """Generate PR title from bug description."""
-        # Truncate and clean
-        title = bug_description.strip()
+        # Clean only when there is surrounding whitespace
+        title = bug_description
+        if title[:1].isspace() or title[-1:].isspace():
+            title = title.strip()
+
+        # Truncate
         if len(title) > 72:
             title = title[:69] + "..."
 
@@ -198,83 +501,85 @@ class GitHubPRManager:
         confidence_score: Optional[float]
     ) -> str:
         """Generate comprehensive PR description."""
-        sections = []
-
-        # Header
-        sections.append("## 🤖 Automated Fix by ASA")
-        sections.append("")
-        sections.append("This pull request was automatically generated by the ASA (Automated Software Agent) system.")
-        sections.append("")
-
-        # Bug description
-        sections.append("## 🐛 Bug Description")
-        sections.append("")
-        sections.append(bug_description)
-        sections.append("")
-
-        # Fix summary
-        sections.append("## 🔧 Fix Summary")
-        sections.append("")
-        sections.append(fix_summary)
-        sections.append("")
-
-        # Patches applied
-        if patches_applied:
-            sections.append("## 📝 Changes Made")
-            sections.append("")
-            for i, patch in enumerate(patches_applied, 1):
-                sections.append(f"### {i}. {patch.get('description', 'Code patch')}")
-                sections.append(f"- **File**: `{patch.get('file_path', 'unknown')}`")
-                sections.append(f"- **Lines**: {patch.get('start_line', '?')}-{patch.get('end_line', '?')}")
-                sections.append(f"- **Type**: {patch.get('patch_type', 'replace')}")
-                sections.append("")
-
-        # Confidence score
-        if confidence_score is not None:
-            sections.append("## 📊 Confidence Score")
-            sections.append("")
-            confidence_pct = confidence_score * 100
-            confidence_bar = "█" * int(confidence_pct / 10)
-            sections.append(f"**{confidence_pct:.1f}%** `{confidence_bar}`")
-            sections.append("")
-
-        # Test results
-        sections.append("## ✅ Test Results")
-        sections.append("")
-
-        if test_results_before:
-            sections.append("### Before Fix")
-            sections.append("```")
-            sections.append(test_results_before[-500:])  # Last 500 chars
-            sections.append("```")
-            sections.append("")
-
-        if test_results_after:
-            sections.append("### After Fix")
-            sections.append("```")
-            sections.append(test_results_after[-500:])
-            sections.append("```")
-            sections.append("")
-
-        # Checklist
-        sections.append("## ✓ Review Checklist")
-        sections.append("")
-        sections.append("- [ ] Code changes are minimal and focused")
-        sections.append("- [ ] All tests pass")
-        sections.append("- [ ] No unintended side effects")
-        sections.append("- [ ] Code follows project style guidelines")
-        sections.append("- [ ] Documentation updated (if needed)")
-        sections.append("")
-
-        # Footer
-        sections.append("---")
-        sections.append("")
-        sections.append("🤖 *Generated by [ASA](https://github.com/your-org/asa) - Automated Software Agent*")
-        sections.append(f"📅 *Created on {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}*")
-
-        return "\n".join(sections)
-
-    def _parse_repo_url(self, repo_url: str) -> tuple:
+        # Full logs go to a gist (if enabled) when they are too large for the PR body
+        log_links = self._upload_test_logs(test_results_before, test_results_after)
+
+        return _PR_TEMPLATE.format(
+            bug=bug_description,
+            fix=fix_summary,
+            patches_section=_render_patches(patches_applied) if patches_applied else "",
+            confidence_section=_render_confidence(confidence_score) if confidence_score is not None else "",
+            before_section=_render_test_log("Before Fix", test_results_before, log_links.get("before")) if test_results_before else "",
+            after_section=_render_test_log("After Fix", test_results_after, log_links.get("after")) if test_results_after else "",
+            created=datetime.now().strftime('%Y-%m-%d %H:%M UTC')
+        )
+
+    def _upload_test_logs(
+        self,
+        test_results_before: Optional[str],
+        test_results_after: Optional[str]
+    ) -> Dict[str, str]:
+        """
+        Upload large test logs to a secret gist, if ASA_PR_LOG_GISTS=true.
+
+        Logs under GIST_THRESHOLD_BYTES stay inline only. Both logs share a
+        single gist so at most one API call is made.
+
+        Returns:
+            Mapping of "before"/"after" to the gist URL for uploaded logs
+        """
+        if not UPLOAD_LOGS_TO_GIST:
+            return {}
+
+        files = {}
+        if test_results_before and len(test_results_before) > GIST_THRESHOLD_BYTES:
+            files["before"] = test_results_before
+        if test_results_after and len(test_results_after) > GIST_THRESHOLD_BYTES:
+            files["after"] = test_results_after
+
+        if not files:
+            return {}
+
+        try:
+            gist = self.github.get_user().create_gist(
+                False,
+                {f"{name}.txt": InputFileContent(content) for name, content in files.items()},
+                "ASA test results"
+            )
+        except GithubException as e:
+            print(f"⚠️ Could not upload test logs to gist: {e}")
+            return {}
+
+        return {name: gist.html_url for name in files}
+
+    def _get_repo(self, owner: str, repo_name: str) -> Repository:
+        """
+        Get a GitHub repository, fetching it once per manager.
+
+        Args:
+            owner: Repository owner
+            repo_name: Repository name
+
+        Returns:
+            PyGithub Repository object
+
+        Raises:
+            ValueError: If the repository cannot be accessed
+        """
+        key = (owner, repo_name)
+        repo = self._repo_cache.get(key)
+        if repo is None:
+            try:
+                repo = self.github.get_repo(f"{owner}/{repo_name}")
+            except GithubException as e:
+                raise ValueError(f"Failed to access repository {owner}/{repo_name}: {e}")
+            self._repo_cache[key] = repo
+
+        return repo
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_repo_url(repo_url: str) -> Tuple[str, str]:
         """
         Parse repository owner and name from URL.
 
@@ -288,20 +593,11 @@ class GitHubPRManager:
         # https://github.com/owner/repo
         # https://github.com/owner/repo.git
         # git@github.com:owner/repo.git
-
-        if repo_url.startswith('git@'):
-            # SSH format
-            parts = repo_url.replace('git@github.com:', '').replace('.git', '').split('/')
-        else:
-            # HTTPS format
-            parsed = urlparse(repo_url)
-            parts = parsed.path.strip('/').replace('.git', '').split('/')
-
-        if len(parts) != 2:
+        match = _REPO_URL_RE.match(repo_url)
+        if not match:
             raise ValueError(f"Invalid repository URL: {repo_url}")
 
-        owner, repo_name = parts
-        return owner, repo_name
+        return match.group(1), match.group(2)
 
     def add_comment(self, repo_url: str, pr_number: int, comment: str) -> None:
         """
@@ -312,8 +608,7 @@ class GitHubPRManager:
             pr_number: PR number
             comment: Comment text (markdown)
         """
-        owner, repo_name = self._parse_repo_url(repo_url)
-        repo = self.github.get_repo(f"{owner}/{repo_name}")
+        repo = self._get_repo(*self._parse_repo_url(repo_url))
         pr = repo.get_pull(pr_number)
         pr.create_issue_comment(comment)
         print(f"✓ Added comment to PR #{pr_number}")
@@ -368,20 +663,6 @@ def create_automated_pr(
     """
     manager = GitHubPRManager(github_token=github_token)
 
-    # Extract patch information if provided (legacy)
-    patches_info = None
-    if patch_set and hasattr(patch_set, 'patches'):
-        patches_info = [
-            {
-                "file_path": p.file_path,
-                "start_line": p.start_line,
-                "end_line": p.end_line,
-                "patch_type": p.patch_type.value,
-                "description": p.description
-            }
-            for p in patch_set.patches
-        ]
-
     # Create PR using RunReport
     pr_info = manager.create_fix_pr(
         repo_url=repo_url,
@@ -390,11 +671,99 @@ def create_automated_pr(
         task_id=task_id,
         db=db,
         bug_description=bug_description,
-        fix_summary=patch_set.rationale if patch_set and hasattr(patch_set, 'rationale') else None,
         test_results_before=test_results_before,
         test_results_after=test_results_after,
-        patches_applied=patches_info,
-        confidence_score=patch_set.confidence if patch_set and hasattr(patch_set, 'confidence') else None
+        **_legacy_patch_fields(patch_set)
     )
 
     return pr_info
+
+
+def create_automated_prs(
+    pr_requests: List[Dict[str, Any]],
+    db: Session,
+    github_token: Optional[str] = None,
+    max_workers: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Create PRs for many tasks, overlapping the GitHub API round trips.
+
+    PR titles and bodies are rendered sequentially because they read from
+    the (non thread-safe) database session; only the GitHub calls run
+    concurrently, sharing one client and repository cache.
+
+    Args:
+        pr_requests: List of dicts with the keyword arguments accepted by
+            create_automated_pr (repo_url, branch_name, task_id, ...),
+            plus an optional base_branch (default: "main")
+        db: Database session (required for RunReport)
+        github_token: Optional GitHub token
+        max_workers: Maximum number of PRs created in parallel
+
+    Returns:
+        List of PR information dictionaries in input order. Failed entries
+        contain {"task_id": ..., "error": ...} instead.
+    """
+    manager = GitHubPRManager(github_token=github_token)
+
+    prepared: List[Tuple[Dict[str, Any], str, str]] = []
+    for request in pr_requests:
+        title, body = manager._prepare_fix_pr(
+            task_id=request["task_id"],
+            db=db,
+            bug_description=request.get("bug_description"),
+            test_results_before=request.get("test_results_before"),
+            test_results_after=request.get("test_results_after"),
+            **_legacy_patch_fields(request.get("patch_set"))
+        )
+        prepared.append((request, title, body))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prepared) or 1))) as executor:
+        futures = [
+            executor.submit(
+                manager.create_pull_request,
+                repo_url=request["repo_url"],
+                head_branch=request["branch_name"],
+                base_branch=request.get("base_branch", "main"),
+                title=title,
+                body=body,
+                labels=FIX_PR_LABELS
+            )
+            for request, title, body in prepared
+        ]
+
+    results: List[Dict[str, Any]] = []
+    for (request, _, _), future in zip(prepared, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"⚠️ Failed to create PR for task {request['task_id']}: {e}")
+            results.append({"task_id": request["task_id"], "error": str(e)})
+
+    return results
+
+
+def _legacy_patch_fields(patch_set: Optional[Any]) -> Dict[str, Any]:
+    """Extract legacy PR template fields from a PatchSet, if provided."""
+    if not patch_set:
+        return {}
+
+    fields: Dict[str, Any] = {}
+
+    if hasattr(patch_set, 'patches'):
+        fields["patches_applied"] = [
+            {
+                "file_path": p.file_path,
+                "start_line": p.start_line,
+                "end_line": p.end_line,
+                "patch_type": p.patch_type.value,
+                "description": p.description
+            }
+            for p in patch_set.patches
+        ]
+    if hasattr(patch_set, 'rationale'):
+        fields["fix_summary"] = patch_set.rationale
+    if hasattr(patch_set, 'confidence'):
+        fields["confidence_score"] = patch_set.confidence
+
+    return fields
@@ -0,0 +1,242 @@
+"""
+LLM Response Cache - Short-circuit repeated deterministic LLM calls.
+
+Only temperature=0 requests are cached, keyed by a hash of the request
+parameters. Two backends are available:
+- In-memory LRU with TTL (single process)
+- Redis (shared across RQ workers)
+
+Enabled via the ASA_LLM_CACHE environment variable:
+- "0" (default): disabled
+- "1" / "memory": in-process cache
+- "redis": Redis-backed cache
+
+A second, semantic tier (SemanticLLMCache) matches near-duplicate prompts
+by embedding similarity. It is enabled separately via ASA_LLM_SEMANTIC_CACHE
+and only applies to purposes where a paraphrased prompt is safe to answer
+with the same response.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheConfig:
+    """Configuration for the LLM response cache."""
+
+    DEFAULT_TTL_SECONDS = 3600
+    MAX_MEMORY_ENTRIES = 1024
+
+    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_DB = 1
+    REDIS_KEY_PREFIX = "asa:llm_cache:"
+
+    SEMANTIC_EMBEDDING_MODEL = "text-embedding-3-small"
+    SEMANTIC_SIMILARITY_THRESHOLD = 0.92
+    SEMANTIC_MAX_ENTRIES = 512
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """
+    Build a stable cache key for a chat completion request.
+
+    Args:
+        model: Model name
+        messages: Chat messages
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+
+    Returns:
+        Hex sha256 digest of the request parameters
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = LLMCacheConfig.MAX_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int = LLMCacheConfig.DEFAULT_TTL_SECONDS) -> None:
+        """Store a response for ttl seconds."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisLLMCache:
+    """Redis-backed cache shared by all workers."""
+
+    def __init__(self):
+        import redis
+
+        self.redis_conn = redis.Redis(
+            host=LLMCacheConfig.REDIS_HOST,
+            port=LLMCacheConfig.REDIS_PORT,
+            db=LLMCacheConfig.REDIS_DB,
+            decode_responses=True
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on miss or Redis error."""
+        try:
+            return self.redis_conn.get(LLMCacheConfig.REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            # A cache outage must never fail the LLM call
+            logger.warning(f"[LLMCache] Redis get failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, ttl: int = LLMCacheConfig.DEFAULT_TTL_SECONDS) -> None:
+        """Store a response for ttl seconds, ignoring Redis errors."""
+        try:
+            self.redis_conn.set(LLMCacheConfig.REDIS_KEY_PREFIX + key, value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"[LLMCache] Redis set failed: {e}")
+
+
+def messages_to_text(messages: List[Dict[str, str]]) -> str:
+    """Flatten chat messages into one string for embedding."""
+    return "\n".join(f"{m.get('role', '')}: {m.get('content', '')}" for m in messages)
+
+
+class SemanticLLMCache:
+    """
+    In-process cache keyed by prompt embedding.
+
+    Entries are partitioned by scope (model, temperature, max_tokens) so a
+    hit always comes from an identically configured request; within a scope
+    the most similar entry wins if its cosine similarity reaches the
+    threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float = LLMCacheConfig.SEMANTIC_SIMILARITY_THRESHOLD,
+        max_entries: int = LLMCacheConfig.SEMANTIC_MAX_ENTRIES
+    ):
+        import numpy as np
+
+        self._np = np
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Tuple[object, str]]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _normalize(self, embedding: List[float]):
+        vector = self._np.asarray(embedding, dtype=self._np.float32)
+        norm = self._np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, scope: str, embedding: List[float]) -> Optional[str]:
+        """Return the response of the closest entry in scope, or None."""
+        with self._lock:
+            entries = self._entries.get(scope)
+            if not entries:
+                return None
+            matrix = self._np.stack([vector for vector, _ in entries])
+            values = [value for _, value in entries]
+
+        scores = matrix @ self._normalize(embedding)
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+        return values[best]
+
+    def set(self, scope: str, embedding: List[float], value: str) -> None:
+        """Store a response; the oldest scope's entries are evicted first."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._entries.setdefault(scope, []).append((vector, value))
+            self._entries.move_to_end(scope)
+            self._size += 1
+            while self._size > self.max_entries:
+                oldest_scope, oldest = next(iter(self._entries.items()))
+                oldest.pop(0)
+                self._size -= 1
+                if not oldest:
+                    del self._entries[oldest_scope]
+
+
+# Global cache instances
+_llm_cache: Optional[Union[LLMCache, RedisLLMCache]] = None
+_semantic_llm_cache: Optional[SemanticLLMCache] = None
+
+
+def get_llm_cache() -> Optional[Union[LLMCache, RedisLLMCache]]:
+    """
+    Get or create the global LLM cache.
+
+    Returns:
+        The configured cache, or None if caching is disabled
+    """
+    global _llm_cache
+
+    mode = os.getenv("ASA_LLM_CACHE", "0").lower()
+    if mode in ("0", "", "false", "off"):
+        return None
+
+    if _llm_cache is None:
+        _llm_cache = RedisLLMCache() if mode == "redis" else LLMCache()
+    return _llm_cache
+
+
+def get_semantic_llm_cache() -> Optional[SemanticLLMCache]:
+    """
+    Get or create the global semantic LLM cache.
+
+    Returns:
+        The semantic cache, or None unless ASA_LLM_SEMANTIC_CACHE=1
+    """
+    global _semantic_llm_cache
+
+    if os.getenv("ASA_LLM_SEMANTIC_CACHE", "0").lower() not in ("1", "true", "on"):
+        return None
+
+    if _semantic_llm_cache is None:
+        _semantic_llm_cache = SemanticLLMCache()
+    return _semantic_llm_cache
@@ -17,11 +17,17 @@ Provides:
 
 import os
 import time
+import queue
+import asyncio
+import atexit
+import threading
 import warnings
-from typing import Optional, Dict, Any, List
+from contextlib import nullcontext
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from openai.types.chat import ChatCompletion
+from sqlalchemy import case, func, or_
 
 from app.database import SessionLocal
 from app.models import LLMUsage
@@ -52,6 +58,81 @@ MODEL_PRICING = {
     },
 }
 
+# Per-token (input, output) prices derived from MODEL_PRICING; unknown
+# models are billed as gpt-4
+_PRICE_TABLE: Dict[str, Tuple[float, float]] = {
+    model: (pricing["input"] / 1_000_000, pricing["output"] / 1_000_000)
+    for model, pricing in MODEL_PRICING.items()
+}
+_DEFAULT_PRICE = _PRICE_TABLE["gpt-4"]
+
+
+# Usage rows are written by a background thread in batches so the
+# per-call commit stays off the LLM request path
+USAGE_FLUSH_BATCH_SIZE = 100
+USAGE_FLUSH_INTERVAL_SECONDS = 0.5
+
+_usage_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+_usage_writer: Optional[threading.Thread] = None
+_usage_writer_lock = threading.Lock()
+
+
+def _write_usage_batch(batch: List[Dict[str, Any]]) -> None:
+    """Insert a batch of usage rows with a single commit."""
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(LLMUsage, batch)
+        db.commit()
+    except Exception as e:
+        # Don't let logging errors kill the writer thread
+        db.rollback()
+        print(f"Warning: Failed to log LLM usage: {e}")
+    finally:
+        db.close()
+
+
+def _usage_writer_loop() -> None:
+    """Drain the usage queue, flushing every N rows or every interval."""
+    while True:
+        batch = [_usage_queue.get()]
+        deadline = time.monotonic() + USAGE_FLUSH_INTERVAL_SECONDS
+
+        while len(batch) < USAGE_FLUSH_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_usage_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        _write_usage_batch(batch)
+        for _ in batch:
+            _usage_queue.task_done()
+
+
+def _ensure_usage_writer() -> None:
+    """Start the usage writer thread on first use."""
+    global _usage_writer
+    if _usage_writer is not None:
+        return
+
+    with _usage_writer_lock:
+        if _usage_writer is None:
+            _usage_writer = threading.Thread(
+                target=_usage_writer_loop,
+                name="llm-usage-writer",
+                daemon=True
+            )
+            _usage_writer.start()
+            atexit.register(flush_usage_log)
+
+
+def flush_usage_log() -> None:
+    """Block until every queued usage row has been written."""
+    if _usage_writer is not None:
+        _usage_queue.join()
+
 
 class LLMClient:
     """
@@ -96,6 +177,7 @@ class LLMClient:
             raise ValueError("OpenAI API key not provided. Set OPENAI_API_KEY environment variable.")
 
         self.client = OpenAI(api_key=self.api_key)
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
         self.task_id = task_id
         self.user_id = user_id
         self.enable_otel = enable_otel
@@ -132,29 +214,36 @@ class LLMClient:
         """
         start_time = time.time()
 
-        # Create OpenTelemetry span if enabled
-        span_context = None
-        if self.enable_otel and self.tracer:
-            span_context = self.tracer.start_as_current_span(
-                "llm.chat_completion",
-                attributes={
-                    "llm.model": model,
-                    "llm.temperature": temperature,
-                    "llm.max_tokens": max_tokens,
-                    "llm.task_id": self.task_id or "none",
-                    "llm.user_id": self.user_id or "none",
-                }
-            )
-
-        try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
-            )
+        with self._span(model, temperature, max_tokens) as span:
+            try:
+                # Call OpenAI API
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs
+                )
+            except Exception as e:
+                # Log failed request
+                latency_ms = (time.time() - start_time) * 1000
+                self._log_usage(
+                    model=model,
+                    prompt_tokens=0,
+                    completion_tokens=0,
+                    total_tokens=0,
+                    cost_usd=0.0,
+                    latency_ms=latency_ms,
+                    status="error",
+                    error_message=str(e)
+                )
+
+                if span is not None:
+                    span.set_attribute("llm.status", "error")
+                    span.set_attribute("llm.error", str(e))
+                    span.set_attribute("llm.latency_ms", latency_ms)
+
+                raise
 
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
@@ -179,47 +268,123 @@ class LLMClient:
                 status="success"
             )
 
-            # Add span attributes
-            if span_context:
-                span_context.__enter__()
-                span = span_context.__enter__()
-                span.set_attribute("llm.prompt_tokens", prompt_tokens)
-                span.set_attribute("llm.completion_tokens", completion_tokens)
-                span.set_attribute("llm.total_tokens", total_tokens)
-                span.set_attribute("llm.cost_usd", cost_usd)
-                span.set_attribute("llm.latency_ms", latency_ms)
-                span.set_attribute("llm.status", "success")
+            if span is not None:
+                span.set_attributes({
+                    "llm.prompt_tokens": prompt_tokens,
+                    "llm.completion_tokens": completion_tokens,
+                    "llm.total_tokens": total_tokens,
+                    "llm.cost_usd": cost_usd,
+                    "llm.latency_ms": latency_ms,
+                    "llm.status": "success",
+                })
 
             return response
 
+    def _span(self, model: str, temperature: float, max_tokens: int):
+        """
+        Start the llm.chat_completion span, or a no-op context if tracing is off.
+
+        Returns:
+            Context manager yielding the active span (or None)
+        """
+        if not (self.enable_otel and self.tracer):
+            return nullcontext()
+
+        return self.tracer.start_as_current_span(
+            "llm.chat_completion",
+            attributes={
+                "llm.model": model,
+                "llm.temperature": temperature,
+                "llm.max_tokens": max_tokens,
+                "llm.task_id": self.task_id or "none",
+                "llm.user_id": self.user_id or "none",
+            }
+        )
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        temperature: float = 0.2,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> ChatCompletion:
+        """
+        Async variant of chat_completion using AsyncOpenAI.
+
+        Usage is pushed onto the background writer queue, so nothing here
+        blocks the event loop on the database.
+
+        Args:
+            messages: Chat messages
+            model: Model name (e.g., "gpt-4", "gpt-4-turbo")
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional arguments passed to OpenAI API
+
+        Returns:
+            ChatCompletion response
+        """
+        start_time = time.time()
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
         except Exception as e:
-            # Log failed request
-            latency_ms = (time.time() - start_time) * 1000
             self._log_usage(
                 model=model,
                 prompt_tokens=0,
                 completion_tokens=0,
                 total_tokens=0,
                 cost_usd=0.0,
-                latency_ms=latency_ms,
+                latency_ms=(time.time() - start_time) * 1000,
                 status="error",
                 error_message=str(e)
             )
+            raise
 
-            # Add error to span
-            if span_context:
-                span = span_context.__enter__()
-                span.set_attribute("llm.status", "error")
-                span.set_attribute("llm.error", str(e))
-                span.set_attribute("llm.latency_ms", latency_ms)
+        usage = response.usage
+        prompt_tokens = usage.prompt_tokens if usage else 0
+        completion_tokens = usage.completion_tokens if usage else 0
+
+        self._log_usage(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=usage.total_tokens if usage else 0,
+            cost_usd=self._calculate_cost(model, prompt_tokens, completion_tokens),
+            latency_ms=(time.time() - start_time) * 1000,
+            status="success"
+        )
 
-            raise
+        return response
 
-        finally:
-            if span_context:
-                span_context.__exit__(None, None, None)
+    async def achat_completions(
+        self,
+        message_batches: List[List[Dict[str, str]]],
+        **kwargs
+    ) -> List[ChatCompletion]:
+        """
+        Run independent chat completions concurrently.
+
+        Args:
+            message_batches: One message list per completion
+            **kwargs: Arguments passed to each achat_completion call
+
+        Returns:
+            Responses in the same order as message_batches
+        """
+        return await asyncio.gather(
+            *(self.achat_completion(messages, **kwargs) for messages in message_batches)
+        )
 
-    def _calculate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    @staticmethod
+    def _calculate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
         """
         Calculate cost in USD based on token usage.
 
@@ -231,14 +396,8 @@ class LLMClient:
         Returns:
             Cost in USD
         """
-        # Get pricing for model (default to gpt-4 if unknown)
-        pricing = MODEL_PRICING.get(model, MODEL_PRICING["gpt-4"])
-
-        # Calculate cost (pricing is per 1M tokens)
-        input_cost = (prompt_tokens / 1_000_000) * pricing["input"]
-        output_cost = (completion_tokens / 1_000_000) * pricing["output"]
-
-        return input_cost + output_cost
+        input_price, output_price = _PRICE_TABLE.get(model, _DEFAULT_PRICE)
+        return prompt_tokens * input_price + completion_tokens * output_price
 
     def _log_usage(
         self,
@@ -252,7 +411,7 @@ class LLMClient:
         error_message: Optional[str] = None
     ) -> None:
         """
-        Log LLM usage to database.
+        Queue LLM usage for the background writer.
 
         Args:
             model: Model name
@@ -264,30 +423,20 @@ class LLMClient:
             status: Request status ("success" or "error")
             error_message: Optional error message
         """
-        try:
-            db = SessionLocal()
-
-            usage_record = LLMUsage(
-                task_id=self.task_id,
-                user_id=self.user_id,
-                model=model,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                cost_usd=cost_usd,
-                latency_ms=latency_ms,
-                status=status,
-                error_message=error_message,
-                timestamp=datetime.utcnow()
-            )
-
-            db.add(usage_record)
-            db.commit()
-            db.close()
-
-        except Exception as e:
-            # Don't let logging errors break the main flow
-            print(f"Warning: Failed to log LLM usage: {e}")
+        _ensure_usage_writer()
+        _usage_queue.put({
+            "task_id": self.task_id,
+            "user_id": self.user_id,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "cost_usd": cost_usd,
+            "latency_ms": latency_ms,
+            "status": status,
+            "error_message": error_message,
+            "timestamp": datetime.utcnow(),
+        })
 
     def get_task_usage(self, task_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -303,10 +452,11 @@ class LLMClient:
         if not task_id:
             raise ValueError("No task_id provided")
 
+        # Make sure rows from this process are visible to the query
+        flush_usage_log()
+
         db = SessionLocal()
         try:
-            from sqlalchemy import func
-
             # Query usage for this task
             result = db.query(
                 func.count(LLMUsage.id).label("request_count"),
@@ -339,10 +489,10 @@ class LLMClient:
         if not user_id:
             raise ValueError("No user_id provided")
 
+        flush_usage_log()
+
         db = SessionLocal()
         try:
-            from sqlalchemy import func
-
             # Query usage for this user
             result = db.query(
                 func.count(LLMUsage.id).label("request_count"),
@@ -361,6 +511,32 @@ class LLMClient:
         finally:
             db.close()
 
+    def _get_combined_usage(self, task_id: str, user_id: str) -> Tuple[float, float]:
+        """
+        Get task and user cost totals in a single query.
+
+        Args:
+            task_id: Task ID
+            user_id: User ID
+
+        Returns:
+            Tuple of (task_cost_usd, user_cost_usd)
+        """
+        flush_usage_log()
+
+        db = SessionLocal()
+        try:
+            # Rows matching either ID are scanned once via the task_id and
+            # user_id indexes; CASE splits the sums per scope
+            result = db.query(
+                func.sum(case((LLMUsage.task_id == task_id, LLMUsage.cost_usd), else_=0.0)).label("task_cost"),
+                func.sum(case((LLMUsage.user_id == user_id, LLMUsage.cost_usd), else_=0.0)).label("user_cost"),
+            ).filter(or_(LLMUsage.task_id == task_id, LLMUsage.user_id == user_id)).first()
+
+            return float(result.task_cost or 0.0), float(result.user_cost or 0.0)
+        finally:
+            db.close()
+
     def check_usage_limits(
         self,
         max_cost_per_task: Optional[float] = None,
@@ -381,28 +557,34 @@ class LLMClient:
             "violations": []
         }
 
+        check_task = bool(max_cost_per_task and self.task_id)
+        check_user = bool(max_cost_per_user and self.user_id)
+
+        if check_task and check_user:
+            # One aggregate query covers both limits
+            task_cost, user_cost = self._get_combined_usage(self.task_id, self.user_id)
+        else:
+            task_cost = self.get_task_usage()["total_cost_usd"] if check_task else 0.0
+            user_cost = self.get_user_usage()["total_cost_usd"] if check_user else 0.0
+
         # Check task limits
-        if max_cost_per_task and self.task_id:
-            task_usage = self.get_task_usage()
-            if task_usage["total_cost_usd"] > max_cost_per_task:
-                result["within_limits"] = False
-                result["violations"].append({
-                    "type": "task_cost_limit",
-                    "task_id": self.task_id,
-                    "current_cost": task_usage["total_cost_usd"],
-                    "limit": max_cost_per_task
-                })
+        if check_task and task_cost > max_cost_per_task:
+            result["within_limits"] = False
+            result["violations"].append({
+                "type": "task_cost_limit",
+                "task_id": self.task_id,
+                "current_cost": task_cost,
+                "limit": max_cost_per_task
+            })
 
         # Check user limits
-        if max_cost_per_user and self.user_id:
-            user_usage = self.get_user_usage()
-            if user_usage["total_cost_usd"] > max_cost_per_user:
-                result["within_limits"] = False
-                result["violations"].append({
-                    "type": "user_cost_limit",
-                    "user_id": self.user_id,
-                    "current_cost": user_usage["total_cost_usd"],
-                    "limit": max_cost_per_user
-                })
+        if check_user and user_cost > max_cost_per_user:
+            result["within_limits"] = False
+            result["violations"].append({
+                "type": "user_cost_limit",
+                "user_id": self.user_id,
+                "current_cost": user_cost,
+                "limit": max_cost_per_user
+            })
 
         return result
@@ -15,15 +15,50 @@ Features:
 - Prompt versioning with schema validation
 """
 
+import io
 import os
 import time
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime, timedelta
-from openai import OpenAI, APIError, RateLimitError, APITimeoutError
+import httpx
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    APIError,
+    RateLimitError,
+    APITimeoutError,
+    DefaultHttpxClient,
+    DefaultAsyncHttpxClient
+)
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 from app.core.limits import (
     LLMPurpose,
     ModelConfig,
@@ -37,9 +72,199 @@ from app.core.retry_handler import with_retry
 from app.core.prompt_loader import load_prompt, PromptVersion
 from app.models import LLMUsage, Task
 from app.database import SessionLocal
+from app.services.llm_cache import (
+    LLMCacheConfig,
+    get_llm_cache,
+    get_semantic_llm_cache,
+    make_cache_key,
+    messages_to_text
+)
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for the shared OpenAI clients. Keep-alive
+# connections are reused across calls so bursts do not pay a TLS handshake
+# per request or hit httpx.PoolTimeout.
+OPENAI_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=30.0
+)
+
+# Shared OpenAI clients, one per API key. Building a client is expensive
+# (SSL context, connection pool), and the client is thread-safe. It is not
+# fork-safe: processes forked after first use (e.g. multiprocessing with
+# the fork start method) must not reuse these clients.
+_openai_clients: Dict[str, OpenAI] = {}
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """Get or create the shared OpenAI client for an API key."""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        client = OpenAI(
+            api_key=api_key,
+            http_client=DefaultHttpxClient(limits=OPENAI_HTTP_LIMITS)
+        )
+        _openai_clients[api_key] = client
+    return client
+
+
+def get_openai_pool_size() -> int:
+    """Count open connections across the shared sync OpenAI clients."""
+    total = 0
+    for client in list(_openai_clients.values()):
+        transport = getattr(client._client, "_transport", None)
+        pool = getattr(transport, "_pool", None)
+        total += len(getattr(pool, "connections", ()))
+    return total
+
+
+# Async clients hold connections bound to an event loop, so they are
+# shared per loop rather than per process
+_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get or create the AsyncOpenAI client for an API key on the running loop."""
+    clients = _async_openai_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=OPENAI_HTTP_LIMITS)
+        )
+        clients[api_key] = client
+    return client
+
+
+# aiohttp sessions for the raw async path, shared per loop like the
+# AsyncOpenAI clients above
+_aiohttp_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+
+def use_raw_http() -> bool:
+    """Whether achat_completion should bypass the SDK (ASA_LLM_RAW_HTTP=1)."""
+    return HAS_AIOHTTP and os.getenv("ASA_LLM_RAW_HTTP", "0").lower() in ("1", "true", "on")
+
+
+def get_aiohttp_session() -> "aiohttp.ClientSession":
+    """Get or create the aiohttp session for the running loop."""
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=200, ttl_dns_cache=300)
+        )
+        _aiohttp_sessions[loop] = session
+    return session
+
+
+def _to_namespace(value: Any) -> Any:
+    """Recursively turn parsed JSON into attribute-accessible objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+# Worker threads for parallel_chat_completions. The sync OpenAI client is
+# thread-safe, so threads can share it and overlap on the network.
+PARALLEL_LLM_WORKERS = 16
+_llm_executor = ThreadPoolExecutor(max_workers=PARALLEL_LLM_WORKERS, thread_name_prefix="llm-gateway")
+
+# Buffered usage rows are written once this many accumulate; callers
+# flush_usage() when they finish so the rest reach the DB too
+USAGE_FLUSH_THRESHOLD = 10
+
+# Built once so flushes reuse SQLAlchemy's compiled-statement cache entry
+_USAGE_INSERT = LLMUsage.__table__.insert()
+
+# orjson parses LLM JSON responses several times faster when installed;
+# its JSONDecodeError subclasses json.JSONDecodeError
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# tiktoken encoders per model; loading one reads a large BPE table
+_token_encoders: Dict[str, Any] = {}
+
+# Chat formatting overhead per message (role, separators)
+TOKENS_PER_MESSAGE = 3
+
+
+def estimate_prompt_tokens(model: str, messages: List[Dict[str, str]]) -> int:
+    """
+    Estimate prompt tokens for a chat request before sending it.
+
+    Uses tiktoken when installed, otherwise ~4 characters per token.
+
+    Args:
+        model: Model name
+        messages: Chat messages
+
+    Returns:
+        Estimated prompt token count
+    """
+    contents = [message.get("content") or "" for message in messages]
+    overhead = TOKENS_PER_MESSAGE * len(messages)
+
+    if not HAS_TIKTOKEN:
+        return sum(len(content) for content in contents) // 4 + overhead
+
+    encoder = _token_encoders.get(model)
+    if encoder is None:
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoder = tiktoken.get_encoding("o200k_base")
+        _token_encoders[model] = encoder
+
+    return sum(len(encoder.encode(content)) for content in contents) + overhead
+
+
+# OpenAI Batch API requests are billed at half the synchronous price
+BATCH_COST_DISCOUNT = 0.5
+
+# Batch statuses that mean the job is still running
+_BATCH_PENDING_STATUSES = ("validating", "in_progress", "finalizing")
+
+# Purposes whose answers may be reused for a semantically similar prompt.
+# Code/test generation is excluded: small prompt changes must change output.
+SEMANTIC_CACHE_PURPOSES = frozenset({
+    LLMPurpose.CODE_ANALYSIS,
+    LLMPurpose.BUG_DETECTION,
+    LLMPurpose.SEMANTIC_SEARCH,
+})
+
+# Errors chat_completion/achat_completion retry with backoff
+RETRYABLE_LLM_ERRORS = [
+    ErrorType.LLM_RATE_LIMIT,
+    ErrorType.LLM_TIMEOUT,
+    ErrorType.NETWORK_TIMEOUT,
+    ErrorType.NETWORK_CONNECTION
+]
+
+
+@dataclass
+class _PreparedCall:
+    """Resolved parameters and cache state for one gateway call."""
+    purpose: LLMPurpose
+    model: str
+    request: Dict[str, Any]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    cache: Optional[Any] = None
+    cache_key: Optional[str] = None
+    cached_text: Optional[str] = None
+    semantic_cache: Optional[Any] = None
+    semantic_scope: Optional[str] = None
+    embedding: Optional[List[float]] = None
+
 
 class LLMGateway:
     """
@@ -71,31 +296,46 @@ class LLMGateway:
         self.db = db or SessionLocal()
         self._owns_db = db is None
 
+        # Usage rows waiting to be written in one bulk insert
+        self._pending_usage: List[Dict[str, Any]] = []
+        self._usage_lock = threading.Lock()
+
+        # Sessions are not thread-safe; serializes DB access from worker threads
+        self._db_lock = threading.RLock()
+
         # Initialize OpenAI client
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable required")
 
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client = get_openai_client(api_key)
 
         # Track calls for this instance
         self._call_counts: Dict[LLMPurpose, int] = {}
         self._total_tokens = 0
         self._total_cost = 0.0
 
+        # DB usage snapshot for budget checks, see _budget_usage
+        self._usage_baseline: Optional[Dict[str, Any]] = None
+
     def __del__(self):
-        """Clean up database session if we own it."""
+        """
+        Clean up database session if we own it.
+
+        Buffered usage is not written here: a commit at GC time could also
+        commit a caller's pending changes. Callers flush_usage() explicitly.
+        """
+        if getattr(self, "_pending_usage", None):
+            logger.warning(
+                f"[LLMGateway] Dropping {len(self._pending_usage)} unflushed usage row(s) "
+                f"for task {self.task_id}"
+            )
+
         if self._owns_db and self.db:
             self.db.close()
 
-    @with_retry(
-        error_types=[
-            ErrorType.LLM_RATE_LIMIT,
-            ErrorType.LLM_TIMEOUT,
-            ErrorType.NETWORK_TIMEOUT,
-            ErrorType.NETWORK_CONNECTION
-        ]
-    )
+    @with_retry(error_types=RETRYABLE_LLM_ERRORS)
     def chat_completion(
         self,
         purpose: LLMPurpose,
@@ -122,12 +362,452 @@ class LLMGateway:
         Raises:
             ASAError: If budget limits exceeded or API errors occur
         """
-        # Get model config for this purpose
-        config = get_model_config(purpose)
+        call = self._prepare_call(purpose, messages, max_tokens, temperature, metadata, schema_version)
+        if call.cached_text is not None:
+            return call.cached_text
+
+        # Make API call with timeout
+        start_time = time.time()
+
+        try:
+            response = self.client.chat.completions.create(**call.request)
+        except Exception as e:
+            raise self._call_error(call, e, start_time)
+
+        return self._complete_call(call, response, start_time)
+
+    def stream_chat_completion(
+        self,
+        purpose: LLMPurpose,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        schema_version: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion, yielding text as it is generated.
+
+        Budget checks, caching and usage logging match chat_completion.
+        Usage is taken from the final chunk (stream_options include_usage)
+        and logged once the stream is exhausted. There are no automatic
+        retries, since part of the response may already have been consumed.
+
+        Args:
+            purpose: Purpose of this LLM call (determines model)
+            messages: Chat messages in OpenAI format
+            max_tokens: Optional override for max tokens
+            temperature: Optional override for temperature
+            metadata: Optional metadata to log with usage
+            schema_version: Optional schema version for tracking
+
+        Yields:
+            Text deltas; a cached response is yielded in one piece
+
+        Raises:
+            ASAError: If budget limits exceeded or API errors occur
+        """
+        call = self._prepare_call(purpose, messages, max_tokens, temperature, metadata, schema_version)
+        if call.cached_text is not None:
+            yield call.cached_text
+            return
+
+        start_time = time.time()
+        parts: List[str] = []
+        usage = None
+
+        try:
+            stream = self.client.chat.completions.create(
+                **call.request,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            raise self._call_error(call, e, start_time)
+
+        if usage is None:
+            usage = SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+
+        # Record usage (and fill the cache) exactly as for a full response
+        response = SimpleNamespace(
+            usage=usage,
+            choices=[SimpleNamespace(message=SimpleNamespace(content="".join(parts)))]
+        )
+        self._complete_call(call, response, start_time)
+
+    @with_retry(error_types=RETRYABLE_LLM_ERRORS)
+    async def achat_completion(
+        self,
+        purpose: LLMPurpose,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        schema_version: Optional[str] = None,
+        hedge_after_ms: Optional[int] = None
+    ) -> str:
+        """
+        Async variant of chat_completion using AsyncOpenAI.
+
+        Budget checks, caching, usage logging and retries behave exactly as
+        in chat_completion; only the API call itself is awaited. With
+        ASA_LLM_RAW_HTTP=1 (and aiohttp installed) the call goes straight to
+        /chat/completions through aiohttp instead of the SDK.
+
+        If hedging is enabled (hedge_after_ms, or the purpose's
+        ModelConfig.hedge_after_ms) and the call has not returned by then, an
+        identical request is fired and the first successful response wins.
+        Only the winning response's usage is recorded.
+
+        Args:
+            hedge_after_ms: Hedging deadline override; 0 disables hedging
+
+        Returns:
+            Generated text response
+
+        Raises:
+            ASAError: If budget limits exceeded or API errors occur
+        """
+        call = self._prepare_call(purpose, messages, max_tokens, temperature, metadata, schema_version)
+        if call.cached_text is not None:
+            return call.cached_text
+
+        if hedge_after_ms is None:
+            hedge_after_ms = get_model_config(purpose).hedge_after_ms
+
+        start_time = time.time()
+
+        try:
+            if hedge_after_ms:
+                response = await self._hedged_send(call.request, hedge_after_ms)
+            else:
+                response = await self._send_async(call.request)
+        except Exception as e:
+            raise self._call_error(call, e, start_time)
+
+        return self._complete_call(call, response, start_time)
+
+    async def _send_async(self, request: Dict[str, Any]) -> Any:
+        """Send one chat completion request over the configured async transport."""
+        if use_raw_http():
+            return await self._raw_chat(request)
+        return await get_async_openai_client(self.api_key).chat.completions.create(**request)
+
+    async def _hedged_send(self, request: Dict[str, Any], hedge_after_ms: int) -> Any:
+        """
+        Send a request, duplicating it if it is still pending after the deadline.
+
+        The first successful response is returned and the other request is
+        cancelled. If both fail, the primary request's error is raised.
+        """
+        primary = asyncio.create_task(self._send_async(request))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after_ms / 1000)
+        if done:
+            return primary.result()
+
+        logger.info(f"[LLMGateway] No response after {hedge_after_ms}ms, sending hedged request")
+        pending = {primary, asyncio.create_task(self._send_async(request))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _raw_chat(self, request: Dict[str, Any]) -> Any:
+        """
+        POST a chat completion request with aiohttp, bypassing the SDK.
+
+        Args:
+            request: Request parameters as built by _prepare_call
+
+        Returns:
+            Response with the same attribute shape as the SDK's ChatCompletion
+
+        Raises:
+            ASAError: On rate limits, timeouts, connection and HTTP errors
+        """
+        body = {key: value for key, value in request.items() if key != "timeout"}
+        timeout = aiohttp.ClientTimeout(total=request.get("timeout"))
+
+        try:
+            async with get_aiohttp_session().post(
+                f"{OPENAI_BASE_URL}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json=body,
+                timeout=timeout
+            ) as resp:
+                if resp.status == 429:
+                    raise ASAError(ErrorType.LLM_RATE_LIMIT, message=await resp.text())
+                if resp.status >= 400:
+                    text = await resp.text()
+                    raise ASAError(
+                        classify_exception(Exception(f"{resp.status} {text}")),
+                        message=f"OpenAI API error {resp.status}: {text[:200]}"
+                    )
+                payload = await resp.json(loads=_json_loads)
+        except asyncio.TimeoutError as e:
+            raise ASAError(ErrorType.LLM_TIMEOUT, message="LLM request timed out", original_exception=e)
+        except aiohttp.ClientConnectionError as e:
+            raise ASAError(
+                ErrorType.NETWORK_CONNECTION,
+                message=f"Connection to OpenAI failed: {e}",
+                original_exception=e
+            )
+
+        return _to_namespace(payload)
+
+    async def abatch(
+        self,
+        purpose: LLMPurpose,
+        messages_list: List[List[Dict[str, str]]],
+        max_concurrency: int = 8,
+        **kwargs
+    ) -> List[str]:
+        """
+        Run independent completions for one purpose concurrently.
+
+        Args:
+            purpose: Purpose shared by all calls
+            messages_list: One message list per call
+            max_concurrency: Maximum in-flight requests
+            **kwargs: Additional arguments passed to achat_completion
+
+        Returns:
+            Responses in the same order as messages_list
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(messages: List[Dict[str, str]]) -> str:
+            async with semaphore:
+                return await self.achat_completion(purpose, messages, **kwargs)
+
+        return await asyncio.gather(*(run(messages) for messages in messages_list))
+
+    @with_retry(error_types=RETRYABLE_LLM_ERRORS)
+    def batch_chat_completion(
+        self,
+        purpose: LLMPurpose,
+        messages: List[Dict[str, str]],
+        n: int,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Sample several completions for one prompt in a single request.
+
+        Uses the API's n parameter, so the prompt is sent and billed once
+        and only completion tokens scale with n. The call counts once
+        against the purpose's call budget.
+
+        Args:
+            purpose: Purpose of this LLM call (determines model)
+            messages: Chat messages in OpenAI format
+            n: Number of completions (capped at the purpose's max_n_per_batch)
+            max_tokens: Optional override for max tokens per completion
+            temperature: Optional override for temperature
+            metadata: Optional metadata to log with usage
+
+        Returns:
+            List of generated texts, one per choice
+
+        Raises:
+            ASAError: If budget limits exceeded or API errors occur
+        """
+        n = max(1, min(n, get_model_config(purpose).max_n_per_batch))
+
+        # Identical samples are never what a caller of n>1 wants, so skip the cache
+        call = self._prepare_call(
+            purpose, messages, max_tokens, temperature,
+            {**(metadata or {}), "no_cache": True}, None
+        )
+        call.request["n"] = n
 
-        # Check budget before making call
+        start_time = time.time()
+
+        try:
+            response = self.client.chat.completions.create(**call.request)
+        except Exception as e:
+            raise self._call_error(call, e, start_time)
+
+        # Usage covers all choices: prompt tokens once, completion tokens summed
+        self._complete_call(call, response, start_time)
+
+        return [choice.message.content for choice in response.choices]
+
+    def submit_batch(self, purpose: LLMPurpose, requests: List[Dict[str, Any]]) -> str:
+        """
+        Submit chat completions to the OpenAI Batch API.
+
+        Batch jobs finish within 24h at half the price, which suits
+        background work such as repo-wide classification or evaluation.
+        Collect results with poll_batch.
+
+        Args:
+            purpose: Purpose of the calls (determines model)
+            requests: Dicts with "custom_id" and "messages", plus optional
+                "max_tokens" and "temperature" overrides
+
+        Returns:
+            Batch job ID
+
+        Raises:
+            ASAError: If budget limits are already exceeded
+        """
+        config = get_model_config(purpose)
         self._check_budgets(purpose, config)
 
+        buffer = io.BytesIO()
+        for request in requests:
+            temperature = request.get("temperature")
+            line = {
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": config.model,
+                    "messages": request["messages"],
+                    "max_tokens": request.get("max_tokens") or config.max_tokens_per_call,
+                    "temperature": temperature if temperature is not None else config.temperature,
+                },
+            }
+            buffer.write(json.dumps(line).encode("utf-8") + b"\n")
+
+        input_file = self.client.files.create(
+            file=("batch.jsonl", buffer.getvalue()),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"task_id": self.task_id or "", "purpose": purpose.value}
+        )
+
+        logger.info(
+            f"[LLMGateway] Submitted batch {batch.id} with {len(requests)} request(s) "
+            f"for {purpose.value} (task: {self.task_id})"
+        )
+        return batch.id
+
+    def poll_batch(self, purpose: LLMPurpose, batch_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Check a batch job and collect its results once it has finished.
+
+        Usage for every completed request is logged at the discounted
+        batch price.
+
+        Args:
+            purpose: Purpose the batch was submitted with
+            batch_id: ID returned by submit_batch
+
+        Returns:
+            None while the batch is still running, otherwise response text
+            keyed by custom_id (None for requests that failed)
+
+        Raises:
+            ASAError: If the batch failed, expired or was cancelled
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_PENDING_STATUSES:
+            return None
+
+        if batch.status != "completed":
+            raise ASAError(
+                ErrorType.LLM_INVALID_RESPONSE,
+                message=f"LLM batch {batch_id} ended with status {batch.status}",
+                details={"batch_id": batch_id, "status": batch.status}
+            )
+
+        results: Dict[str, Optional[str]] = {}
+        output = self.client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                results[item["custom_id"]] = None
+                continue
+
+            body = response["body"]
+            usage = body.get("usage", {})
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
+            cost = calculate_cost(body.get("model", ""), prompt_tokens, completion_tokens) * BATCH_COST_DISCOUNT
+
+            self._call_counts[purpose] = self._call_counts.get(purpose, 0) + 1
+            self._total_tokens += total_tokens
+            self._total_cost += cost
+            self._log_usage(
+                purpose=purpose, model=body.get("model", ""),
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                total_tokens=total_tokens, cost=cost, latency_ms=0.0,
+                status="success", metadata={"batch_id": batch_id}
+            )
+            results[item["custom_id"]] = body["choices"][0]["message"]["content"]
+
+        # Requests that errored out are reported in a separate file
+        if batch.error_file_id:
+            for line in self.client.files.content(batch.error_file_id).text.splitlines():
+                if line.strip():
+                    results.setdefault(json.loads(line)["custom_id"], None)
+
+        logger.info(f"[LLMGateway] Batch {batch_id} completed with {len(results)} result(s)")
+        return results
+
+    def parallel_chat_completions(self, calls: List[Dict[str, Any]]) -> List[str]:
+        """
+        Run independent chat_completion calls concurrently on worker threads.
+
+        A sync alternative to abatch: N calls finish in roughly the time of
+        the slowest one instead of the sum. Each call keeps chat_completion's
+        retries, caching, budgets and usage logging.
+
+        Args:
+            calls: Keyword arguments for chat_completion, one dict per call
+
+        Returns:
+            Response texts in the same order as calls
+
+        Raises:
+            ASAError: The first failure, after all calls have finished
+        """
+        futures = [_llm_executor.submit(self.chat_completion, **call) for call in calls]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    def _prepare_call(
+        self,
+        purpose: LLMPurpose,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        metadata: Optional[Dict[str, Any]],
+        schema_version: Optional[str]
+    ) -> "_PreparedCall":
+        """
+        Resolve model config, consult the response cache and check budgets.
+
+        Raises:
+            ASAError: If budget limits would be exceeded
+        """
+        # Get model config for this purpose
+        config = get_model_config(purpose)
+
         # Use config defaults or overrides
         max_tokens = max_tokens or config.max_tokens_per_call
         temperature = temperature if temperature is not None else config.temperature
@@ -140,108 +820,170 @@ class LLMGateway:
         if schema_version:
             enhanced_metadata["schema_version"] = schema_version
 
+        call = _PreparedCall(
+            purpose=purpose,
+            model=model,
+            request={
+                "model": model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "timeout": TimeoutConfig.LLM_CALL_TIMEOUT_SECONDS,
+            },
+            metadata=enhanced_metadata
+        )
+
+        # Deterministic calls can be served from the response cache
+        if temperature == 0 and not enhanced_metadata.get("no_cache"):
+            call.cache = get_llm_cache()
+        if call.cache is not None:
+            call.cache_key = make_cache_key(model, messages, temperature, max_tokens)
+            call.cached_text = call.cache.get(call.cache_key)
+            if call.cached_text is not None:
+                self._log_cache_hit(call)
+                return call
+
+        # Near-duplicate prompts can be served from the semantic cache
+        if temperature == 0 and not enhanced_metadata.get("no_cache") and purpose in SEMANTIC_CACHE_PURPOSES:
+            call.semantic_cache = get_semantic_llm_cache()
+        if call.semantic_cache is not None:
+            call.semantic_scope = f"{model}:{temperature}:{max_tokens}"
+            call.embedding = self._embed(messages)
+            if call.embedding is not None:
+                call.cached_text = call.semantic_cache.get(call.semantic_scope, call.embedding)
+                if call.cached_text is not None:
+                    self._log_cache_hit(call, semantic=True)
+                    return call
+
+        # Check budget before making call, including what this call may use
+        projected_prompt = estimate_prompt_tokens(model, messages)
+        self._check_budgets(
+            purpose, config,
+            projected_tokens=projected_prompt + max_tokens,
+            projected_cost=calculate_cost(model, projected_prompt, max_tokens)
+        )
+
         logger.info(
             f"[LLMGateway] Calling {model} for {purpose.value} "
             f"(task: {self.task_id}, max_tokens: {max_tokens}, "
             f"schema_version: {schema_version or 'none'})"
         )
 
-        # Make API call with timeout
-        start_time = time.time()
+        return call
+
+    def _log_cache_hit(self, call: "_PreparedCall", semantic: bool = False) -> None:
+        """Record a zero-cost usage row for a response served from cache."""
+        metadata = {**call.metadata, "cached": True}
+        if semantic:
+            metadata["semantic"] = True
 
+        self._log_usage(
+            purpose=call.purpose, model=call.model, prompt_tokens=0,
+            completion_tokens=0, total_tokens=0, cost=0.0,
+            latency_ms=0.0, status="cache_hit", metadata=metadata
+        )
+        logger.info(
+            f"[LLMGateway] {'Semantic cache' if semantic else 'Cache'} hit "
+            f"for {call.model} ({call.purpose.value})"
+        )
+
+    def _embed(self, messages: List[Dict[str, str]]) -> Optional[List[float]]:
+        """Embed a prompt for the semantic cache; None if embedding fails."""
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                timeout=TimeoutConfig.LLM_CALL_TIMEOUT_SECONDS
+            response = self.client.embeddings.create(
+                model=LLMCacheConfig.SEMANTIC_EMBEDDING_MODEL,
+                input=messages_to_text(messages)
             )
+            return response.data[0].embedding
+        except Exception as e:
+            # A cache failure must never fail the LLM call
+            logger.warning(f"[LLMGateway] Prompt embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def _complete_call(self, call: "_PreparedCall", response: Any, start_time: float) -> str:
+        """Record usage for a successful response and return its text."""
+        latency_ms = (time.time() - start_time) * 1000
+
+        # Extract usage
+        usage = response.usage
+        prompt_tokens = usage.prompt_tokens
+        completion_tokens = usage.completion_tokens
+        total_tokens = usage.total_tokens
+
+        # Prompt tokens served from OpenAI's automatic prompt cache
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0)
+        if not isinstance(cached_tokens, int):
+            cached_tokens = 0
+
+        # Calculate cost
+        cost = calculate_cost(call.model, prompt_tokens, completion_tokens)
+
+        # Update tracking
+        with self._usage_lock:
+            self._call_counts[call.purpose] = self._call_counts.get(call.purpose, 0) + 1
+            self._total_tokens += total_tokens
+            self._total_cost += cost
 
-            latency_ms = (time.time() - start_time) * 1000
-
-            # Extract usage
-            usage = response.usage
-            prompt_tokens = usage.prompt_tokens
-            completion_tokens = usage.completion_tokens
-            total_tokens = usage.total_tokens
+        # Log usage to database
+        self._log_usage(
+            purpose=call.purpose,
+            model=call.model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=total_tokens,
+            cost=cost,
+            latency_ms=latency_ms,
+            status="success",
+            metadata=call.metadata,
+            cached_tokens=cached_tokens
+        )
 
-            # Calculate cost
-            cost = calculate_cost(model, prompt_tokens, completion_tokens)
+        # Extract response text
+        response_text = response.choices[0].message.content
 
-            # Update tracking
-            self._call_counts[purpose] = self._call_counts.get(purpose, 0) + 1
-            self._total_tokens += total_tokens
-            self._total_cost += cost
+        if call.cache is not None and response_text is not None:
+            call.cache.set(call.cache_key, response_text)
+        if call.embedding is not None and response_text is not None:
+            call.semantic_cache.set(call.semantic_scope, call.embedding, response_text)
 
-            # Log usage to database
-            self._log_usage(
-                purpose=purpose,
-                model=model,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                cost=cost,
-                latency_ms=latency_ms,
-                status="success",
-                metadata=enhanced_metadata
-            )
+        logger.info(
+            f"[LLMGateway] Success: {total_tokens} tokens "
+            f"({cached_tokens} cached), ${cost:.4f}, {latency_ms:.0f}ms"
+        )
 
-            # Extract response text
-            response_text = response.choices[0].message.content
+        return response_text
 
-            logger.info(
-                f"[LLMGateway] Success: {total_tokens} tokens, "
-                f"${cost:.4f}, {latency_ms:.0f}ms"
-            )
+    def _call_error(self, call: "_PreparedCall", error: Exception, start_time: float) -> Exception:
+        """
+        Log a failed API call and map it onto the error taxonomy.
 
-            return response_text
+        Returns:
+            The exception the caller should raise
+        """
+        latency_ms = (time.time() - start_time) * 1000
+        self._log_usage(
+            purpose=call.purpose, model=call.model, prompt_tokens=0,
+            completion_tokens=0, total_tokens=0, cost=0.0,
+            latency_ms=latency_ms, status="error",
+            error_message=str(error), metadata=call.metadata
+        )
 
-        except RateLimitError as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self._log_usage(
-                purpose=purpose, model=model, prompt_tokens=0,
-                completion_tokens=0, total_tokens=0, cost=0.0,
-                latency_ms=latency_ms, status="error",
-                error_message=str(e), metadata=enhanced_metadata
-            )
-            logger.warning(f"[LLMGateway] Rate limit hit: {e}")
-            raise ASAError(ErrorType.LLM_RATE_LIMIT, original_exception=e)
+        if isinstance(error, RateLimitError):
+            logger.warning(f"[LLMGateway] Rate limit hit: {error}")
+            return ASAError(ErrorType.LLM_RATE_LIMIT, original_exception=error)
 
-        except APITimeoutError as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self._log_usage(
-                purpose=purpose, model=model, prompt_tokens=0,
-                completion_tokens=0, total_tokens=0, cost=0.0,
-                latency_ms=latency_ms, status="error",
-                error_message=str(e), metadata=enhanced_metadata
-            )
-            logger.warning(f"[LLMGateway] Timeout: {e}")
-            raise ASAError(ErrorType.LLM_TIMEOUT, original_exception=e)
+        if isinstance(error, APITimeoutError):
+            logger.warning(f"[LLMGateway] Timeout: {error}")
+            return ASAError(ErrorType.LLM_TIMEOUT, original_exception=error)
 
-        except APIError as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self._log_usage(
-                purpose=purpose, model=model, prompt_tokens=0,
-                completion_tokens=0, total_tokens=0, cost=0.0,
-                latency_ms=latency_ms, status="error",
-                error_message=str(e), metadata=enhanced_metadata
-            )
-            logger.error(f"[LLMGateway] API error: {e}")
+        if isinstance(error, APIError):
+            logger.error(f"[LLMGateway] API error: {error}")
             # Classify and wrap the error
-            error_type = classify_exception(e)
-            raise ASAError(error_type, original_exception=e)
+            return ASAError(classify_exception(error), original_exception=error)
 
-        except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self._log_usage(
-                purpose=purpose, model=model, prompt_tokens=0,
-                completion_tokens=0, total_tokens=0, cost=0.0,
-                latency_ms=latency_ms, status="error",
-                error_message=str(e), metadata=enhanced_metadata
-            )
-            logger.error(f"[LLMGateway] Unexpected error: {e}")
-            raise
+        logger.error(f"[LLMGateway] Unexpected error: {error}")
+        return error
 
     def chat_completion_with_prompt(
         self,
@@ -290,7 +1032,7 @@ class LLMGateway:
 
         # Parse JSON response
         try:
-            response_json = json.loads(response_text)
+            response_json = _json_loads(response_text)
         except json.JSONDecodeError as e:
             logger.error(f"[LLMGateway] Failed to parse JSON response: {e}")
             raise ASAError(
@@ -321,10 +1063,23 @@ class LLMGateway:
 
         return response_json
 
-    def _check_budgets(self, purpose: LLMPurpose, config: ModelConfig):
+    def _check_budgets(
+        self,
+        purpose: LLMPurpose,
+        config: ModelConfig,
+        projected_tokens: int = 0,
+        projected_cost: float = 0.0
+    ):
         """
         Check if budget limits would be exceeded.
 
+        Args:
+            purpose: Purpose of the upcoming call
+            config: Model config for the purpose
+            projected_tokens: Upper bound on tokens the call will use
+                (estimated prompt + max_tokens)
+            projected_cost: Upper bound on the call's cost
+
         Raises:
             ASAError: If any budget limit would be exceeded
         """
@@ -338,52 +1093,92 @@ class LLMGateway:
                 details={"purpose": purpose.value, "count": call_count, "limit": config.max_calls_per_task}
             )
 
+        if not (self.task_id or self.user_id):
+            return
+
+        usage = self._budget_usage()
+
         # Check total token budget for task
         if self.task_id:
-            task_usage = self._get_task_usage()
-
-            if task_usage["total_tokens"] >= BudgetLimits.MAX_TOKENS_PER_TASK:
+            # Reject up front when the call could push usage over the limit
+            if (usage["task_tokens"] >= BudgetLimits.MAX_TOKENS_PER_TASK or
+                    usage["task_tokens"] + projected_tokens > BudgetLimits.MAX_TOKENS_PER_TASK):
                 raise ASAError(
                     ErrorType.TOKEN_BUDGET_EXCEEDED,
                     details={
                         "task_id": self.task_id,
-                        "tokens_used": task_usage["total_tokens"],
+                        "tokens_used": usage["task_tokens"],
+                        "projected_tokens": projected_tokens,
                         "limit": BudgetLimits.MAX_TOKENS_PER_TASK
                     }
                 )
 
-            if task_usage["total_cost"] >= BudgetLimits.MAX_COST_PER_TASK_USD:
+            if (usage["task_cost"] >= BudgetLimits.MAX_COST_PER_TASK_USD or
+                    usage["task_cost"] + projected_cost > BudgetLimits.MAX_COST_PER_TASK_USD):
                 raise ASAError(
                     ErrorType.COST_BUDGET_EXCEEDED,
                     details={
                         "task_id": self.task_id,
-                        "cost_usd": task_usage["total_cost"],
+                        "cost_usd": usage["task_cost"],
+                        "projected_cost_usd": projected_cost,
                         "limit": BudgetLimits.MAX_COST_PER_TASK_USD
                     }
                 )
 
         # Check user daily limits
         if self.user_id:
-            user_usage = self._get_user_daily_usage()
-
-            if user_usage["total_cost"] >= BudgetLimits.MAX_COST_PER_USER_PER_DAY_USD:
+            if usage["user_daily_cost"] >= BudgetLimits.MAX_COST_PER_USER_PER_DAY_USD:
                 raise ASAError(
                     ErrorType.COST_BUDGET_EXCEEDED,
                     details={
                         "user_id": self.user_id,
-                        "cost_usd": user_usage["total_cost"],
+                        "cost_usd": usage["user_daily_cost"],
                         "limit": BudgetLimits.MAX_COST_PER_USER_PER_DAY_USD,
                         "period": "daily"
                     }
                 )
 
+    def _budget_usage(self) -> Dict[str, Any]:
+        """
+        Get task and daily user usage for budget checks.
+
+        The database is queried once per gateway (and again after midnight
+        or invalidate_usage_cache()); after that this gateway's own calls
+        are added in memory.
+        """
+        today_start = datetime.utcnow().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+        baseline = self._usage_baseline
+        if baseline is None or baseline["day"] != today_start:
+            with self._db_lock:
+                task_usage = self._get_task_usage()
+                user_usage = self._get_user_daily_usage()
+
+                # The DB totals already include this gateway's calls so far
+                baseline = self._usage_baseline = {
+                    "day": today_start,
+                    "task_tokens": task_usage["total_tokens"] - self._total_tokens,
+                    "task_cost": task_usage["total_cost"] - self._total_cost,
+                    "user_daily_cost": user_usage["total_cost"] - self._total_cost,
+                }
+
+        return {
+            "task_tokens": baseline["task_tokens"] + self._total_tokens,
+            "task_cost": baseline["task_cost"] + self._total_cost,
+            "user_daily_cost": baseline["user_daily_cost"] + self._total_cost,
+        }
+
+    def invalidate_usage_cache(self) -> None:
+        """Re-read usage from the database on the next budget check."""
+        self._usage_baseline = None
+
     def _get_task_usage(self) -> Dict[str, Any]:
         """Get current usage for this task."""
         if not self.task_id:
             return {"total_tokens": 0, "total_cost": 0.0}
 
-        from sqlalchemy import func
-
         result = self.db.query(
             func.sum(LLMUsage.total_tokens).label("total_tokens"),
             func.sum(LLMUsage.cost_usd).label("total_cost")
@@ -391,9 +1186,12 @@ class LLMGateway:
             LLMUsage.task_id == self.task_id
         ).first()
 
+        # Rows not yet flushed still count against the budget
+        pending = self._pending_totals("task_id", self.task_id)
+
         return {
-            "total_tokens": int(result.total_tokens or 0),
-            "total_cost": float(result.total_cost or 0.0)
+            "total_tokens": int(result.total_tokens or 0) + pending["total_tokens"],
+            "total_cost": float(result.total_cost or 0.0) + pending["total_cost"]
         }
 
     def _get_user_daily_usage(self) -> Dict[str, Any]:
@@ -401,8 +1199,6 @@ class LLMGateway:
         if not self.user_id:
             return {"total_cost": 0.0}
 
-        from sqlalchemy import func
-
         today_start = datetime.utcnow().replace(
             hour=0, minute=0, second=0, microsecond=0
         )
@@ -414,8 +1210,10 @@ class LLMGateway:
             LLMUsage.timestamp >= today_start
         ).first()
 
+        pending = self._pending_totals("user_id", self.user_id, since=today_start)
+
         return {
-            "total_cost": float(result.total_cost or 0.0)
+            "total_cost": float(result.total_cost or 0.0) + pending["total_cost"]
         }
 
     def _log_usage(
@@ -429,24 +1227,56 @@ class LLMGateway:
         latency_ms: float,
         status: str,
         error_message: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        cached_tokens: int = 0
     ):
-        """Log usage to database."""
-        usage_record = LLMUsage(
-            task_id=self.task_id,
-            user_id=self.user_id,
-            model=model,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=total_tokens,
-            cost_usd=cost,
-            latency_ms=latency_ms,
-            status=status,
-            error_message=error_message
-        )
+        """Buffer a usage row; rows are written every USAGE_FLUSH_THRESHOLD calls and on flush_usage()."""
+        row = {
+            "task_id": self.task_id,
+            "user_id": self.user_id,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
+            "cost_usd": cost,
+            "latency_ms": latency_ms,
+            "status": status,
+            "error_message": error_message,
+            "timestamp": datetime.utcnow(),
+        }
+
+        with self._usage_lock:
+            self._pending_usage.append(row)
+            should_flush = len(self._pending_usage) >= USAGE_FLUSH_THRESHOLD
+
+        if should_flush:
+            self.flush_usage()
+
+    def flush_usage(self) -> None:
+        """Write all buffered usage rows in one insert and commit."""
+        with self._usage_lock:
+            rows, self._pending_usage = self._pending_usage, []
+
+        if not rows:
+            return
 
-        self.db.add(usage_record)
-        self.db.commit()
+        with self._db_lock:
+            self.db.execute(_USAGE_INSERT, rows)
+            self.db.commit()
+
+    def _pending_totals(self, key: str, value: str, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Sum tokens and cost of buffered rows matching key == value."""
+        with self._usage_lock:
+            rows = [
+                row for row in self._pending_usage
+                if row[key] == value and (since is None or row["timestamp"] >= since)
+            ]
+
+        return {
+            "total_tokens": sum(row["total_tokens"] for row in rows),
+            "total_cost": sum(row["cost_usd"] for row in rows)
+        }
 
     def get_usage_summary(self) -> Dict[str, Any]:
         """
@@ -455,6 +1285,8 @@ class LLMGateway:
         Returns:
             Dictionary with usage statistics
         """
+        self.flush_usage()
+
         return {
             "task_id": self.task_id,
             "user_id": self.user_id,
@@ -496,4 +1328,7 @@ def call_llm(
         Generated text
     """
     gateway = LLMGateway(task_id=task_id, user_id=user_id)
-    return gateway.chat_completion(purpose, messages, **kwargs)
+    try:
+        return gateway.chat_completion(purpose, messages, **kwargs)
+    finally:
+        gateway.flush_usage()
@@ -1,25 +1,77 @@
-import time
-import sys
+import asyncio
+import importlib
 import os
-from pathlib import Path
+import time
 
 from datetime import datetime
 
-from typing import Optional
+from functools import lru_cache
+
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import SessionLocal
 
-from app.models import Task
+from app.models import Task, TaskLog
+
+from app.services.code_index import CodeIndex, iter_python_files
+
+from app.services.repo_manager import (
+    clone_repo,
+    create_pr_branch_local,
+    create_workspace,
+    get_head_commit
+)
+
+from app.services.task_events import publish_task_update
+
+from app.services.test_runner import MODE_AFTER, MODE_BEFORE, is_pytest_command, run_tests
+
+
+@lru_cache(maxsize=None)
+def _lazy_import(module_name: str):
+    """
+    Import a heavy or optional module on first use and keep the reference.
+
+    Modules with heavy dependencies (ChromaDB, OpenAI) stay out of the
+    module-level imports; a failed import raises ImportError and is
+    retried on the next call.
+    """
+    return importlib.import_module(module_name)
+
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_timestamp_prefix = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time in isoformat() layout, with microseconds.
+
+    Log lines arrive in bursts, so the strftime of the whole-second part is
+    reused until the second changes; only the microseconds are formatted
+    per call.
+    """
+    global _timestamp_prefix
+
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_prefix
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_prefix = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
+# Statuses after which no further transition may be written
+TERMINAL_STATUSES = ("COMPLETED", "FAILED", "TIMEOUT", "CANCELLED")
+
+
+class TaskStopped(Exception):
+    """The task was deleted or finished elsewhere; the pipeline must stop."""
 
-# Add project root to path to import from src/core
-# File is at: backend/app/services/orchestrator.py
-# Need to go up 3 levels to reach project root (ASA/)
-_orchestrator_file = Path(__file__).resolve()
-project_root = _orchestrator_file.parent.parent.parent.parent
-if project_root.exists() and (project_root / "src" / "core" / "repo_manager.py").exists():
-    sys.path.insert(0, str(project_root))
 
 class TaskOrchestrator:
 
@@ -35,37 +87,102 @@ class TaskOrchestrator:
 
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, enable_cit: Optional[bool] = None):
 
         self.db = db
 
+        # CIT steps are decided once per orchestrator; cit_agent (Docker,
+
+        # LLM clients) is only imported when they run
+
+        if enable_cit is None:
+
+            enable_cit = os.getenv("ENABLE_CIT_AGENT", "false").lower() == "true"
+
+        self.enable_cit = enable_cit
+
+        # Log lines buffered until the next status change writes them
+
+        self._pending_logs: List[Dict[str, str]] = []
+
+        # Code index built in INDEXING_CODE and reused by GENERATING_FIX,
+
+        # which re-indexes only the Python files changed in between
+
+        self._code_index = None
+
+        self._index_snapshot: Optional[Dict[str, Tuple[int, int]]] = None
+
+        # Workspace the CIT agent ran in; its runner container is removed
+        # when the task ends
+
+        self._cit_workspace: Optional[str] = None
+
     @staticmethod
 
     def start_task(task_id: str) -> None:
 
         """
 
-        Entry point used by FastAPI BackgroundTasks.
+        Blocking entry point for callers without an event loop.
 
         Example usage:
 
-            background_tasks.add_task(TaskOrchestrator.start_task, task.id)
+            TaskOrchestrator.start_task(task.id)
 
         """
 
-        db = SessionLocal()
+        asyncio.run(TaskOrchestrator.run_task(task_id))
 
-        try:
+    @staticmethod
+
+    async def run_task(task_id: str) -> None:
+
+        """
+
+        Async entry point used by FastAPI BackgroundTasks.
+
+        Async background tasks run on the event loop instead of the
+
+        threadpool, so many tasks can wait on I/O concurrently.
+
+        Example usage:
+
+            background_tasks.add_task(TaskOrchestrator.run_task, task.id)
+
+        """
+
+        # The orchestrator is the only writer of its task's columns, so the
+
+        # loaded Task stays valid across commits and need not be re-read
+
+        with SessionLocal(expire_on_commit=False) as db:
 
             orchestrator = TaskOrchestrator(db=db)
 
-            orchestrator._run(task_id)
+            try:
 
-        finally:
+                await orchestrator._run(task_id)
+
+            except TaskStopped as e:
 
-            db.close()
+                print(f"[TaskOrchestrator] {e}. Stopping.")
 
-    def _run(self, task_id: str) -> None:
+            finally:
+
+                # Lines logged after the last status change (e.g. before an
+
+                # unexpected exception) would otherwise be lost
+
+                await asyncio.to_thread(orchestrator._flush_remaining_logs)
+
+                if orchestrator._cit_workspace:
+                    docker_sandbox = _lazy_import("app.services.docker_sandbox")
+                    await asyncio.to_thread(
+                        docker_sandbox.stop_runner_container, orchestrator._cit_workspace
+                    )
+
+    async def _run(self, task_id: str) -> None:
 
         """
 
@@ -83,209 +200,250 @@ class TaskOrchestrator:
 
         - COMPLETED/FAILED
 
+        Blocking work (git, indexing, test runs, LLM calls, DB commits) is
+
+        pushed to a worker thread with asyncio.to_thread so the event loop
+
+        stays free.
+
         """
 
         # Step 1 - CLONING_REPO
 
-        if not self._set_status(task_id, "CLONING_REPO"):
+        # Load the task once (without the legacy log text); every step
 
-            # Task not found, nothing else to do
+        # below works on this instance
 
-            return
+        task = await asyncio.to_thread(
+
+            self.db.get, Task, task_id, options=[defer(Task.legacy_logs)]
+
+        )
+
+        if task is None:
+
+            # In a real app you might want structured logging here
+
+            print(f"[TaskOrchestrator] Task {task_id} not found. Stopping.")
 
-        # Load task to get repo_url
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task:
             return
 
-        try:
-            # Import here to avoid circular imports
-            from src.core.repo_manager import create_workspace, clone_repo
+        await self._set_status(task, "CLONING_REPO")
 
+        try:
             # Create workspace for this task
-            workspace_path = create_workspace(task_id)
+            workspace_path = await asyncio.to_thread(create_workspace, task_id)
             
             # Store workspace_path on Task
             task.workspace_path = workspace_path
             self.db.add(task)
-            self.db.commit()
+            await asyncio.to_thread(self.db.commit)
             
             # Clone the repo into the workspace
-            clone_repo(task.repo_url, workspace_path)
+            await asyncio.to_thread(clone_repo, task.repo_url, workspace_path)
             
             # Log success
-            self._add_log(task_id, f"Successfully cloned {task.repo_url} to {workspace_path}")
+            self._add_log(task, f"Successfully cloned {task.repo_url} to {workspace_path}")
             
             # Move to INDEXING_CODE on success
-            if not self._set_status(task_id, "INDEXING_CODE"):
-                return
+            await self._set_status(task, "INDEXING_CODE")
 
         except Exception as e:
             # Log error and move to FAILED
             error_msg = f"Failed to clone repository: {str(e)}"
-            self._add_log(task_id, error_msg)
-            self._set_status(task_id, "FAILED")
+            self._add_log(task, error_msg)
+            await self._set_status(task, "FAILED")
             return
 
         # Step 2 - INDEXING_CODE
-        # Load task to get workspace_path
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task or not task.workspace_path:
-            self._add_log(task_id, "No workspace_path, skipping indexing")
-            self._set_status(task_id, "FAILED")
+        if not task.workspace_path:
+            self._add_log(task, "No workspace_path, skipping indexing")
+            await self._set_status(task, "FAILED")
             return
         else:
             try:
                 # Use SemanticCodeIndex for better context (falls back to CodeIndex if unavailable)
                 try:
-                    from app.services.semantic_index import SemanticCodeIndex
+                    semantic_index = _lazy_import("app.services.semantic_index")
 
-                    index = SemanticCodeIndex(task.workspace_path)
-                    index.build_index()
+                    # Tasks on the same repo@commit share one build per worker
+                    commit_sha = await asyncio.to_thread(get_head_commit, task.workspace_path)
+                    index = await asyncio.to_thread(
+                        semantic_index.get_shared_index,
+                        task.repo_url, commit_sha, task.workspace_path
+                    )
                     stats = index.get_stats()
-                    self._add_log(task_id, f"Semantic index built: {stats['total_nodes']} nodes "
+                    self._add_log(task, f"Semantic index built: {stats['total_nodes']} nodes "
                                           f"({stats['functions']} functions, {stats['classes']} classes, "
                                           f"{stats['methods']} methods)")
                 except ImportError as e:
                     # Fall back to simple CodeIndex
-                    self._add_log(task_id, "Semantic indexing not available, using simple index")
-                    from app.services.code_index import CodeIndex
-
+                    self._add_log(task, "Semantic indexing not available, using simple index")
                     index = CodeIndex(task.workspace_path)
-                    index.build_index()
-                    self._add_log(task_id, f"Indexed {len(index.file_contents)} Python files")
+                    await asyncio.to_thread(index.build_index)
+                    self._add_log(task, f"Indexed {len(index.file_contents)} Python files")
+
+                self._code_index = index
+                self._index_snapshot = await asyncio.to_thread(
+                    self._workspace_snapshot, task.workspace_path
+                )
             except Exception as e:
                 error_msg = f"Failed to index code: {str(e)}"
-                self._add_log(task_id, error_msg)
-                self._set_status(task_id, "FAILED")
+                self._add_log(task, error_msg)
+                await self._set_status(task, "FAILED")
                 return
 
         # Step 2.5 - VERIFYING_BUG_BEHAVIOR (optional CIT Agent step)
-        enable_cit = os.getenv("ENABLE_CIT_AGENT", "false").lower() == "true"
-
-        if enable_cit:
-            if not self._set_status(task_id, "VERIFYING_BUG_BEHAVIOR"):
-                return
-
-            task = self.db.query(Task).filter(Task.id == task_id).first()
-            if not task or not task.workspace_path:
-                self._add_log(task_id, "No workspace_path, skipping behavioral verification")
-            else:
-                try:
-                    from app.services.cit_agent import CITAgent
-
-                    self._add_log(task_id, "Generating E2E test to verify bug behavior...")
+        enable_cit = self.enable_cit
 
-                    cit_agent = CITAgent(use_docker=True)
+        # The pre-fix unit tests don't depend on the CIT result, so start them
+        # now and let the two overlap. Only for pytest: the E2E test is a
+        # .spec.js file that pytest never collects, but npm-style runners might
+        unit_tests = None
+        if enable_cit and task.workspace_path and is_pytest_command((task.test_command or "pytest").split()):
+            unit_tests = asyncio.create_task(asyncio.to_thread(
+                run_tests, task.workspace_path, task.test_command, MODE_BEFORE
+            ))
 
-                    # Verify bug exists using behavioral test
-                    bug_exists, test_result, test_file = cit_agent.verify_bug(
-                        bug_description=task.bug_description,
-                        workspace_path=task.workspace_path,
-                        app_context=""  # Could be enhanced with repo context
-                    )
+        try:
+            if enable_cit:
+                await self._set_status(task, "VERIFYING_BUG_BEHAVIOR")
 
-                    # Log results
-                    self._add_log(task_id, f"Behavioral test result: {test_result.get_summary()}")
+                if not task.workspace_path:
+                    self._add_log(task, "No workspace_path, skipping behavioral verification")
+                else:
+                    try:
+                        CITAgent = _lazy_import("app.services.cit_agent").CITAgent
 
-                    if bug_exists:
-                        self._add_log(task_id, "✓ Bug confirmed by behavioral test (test failed as expected)")
-                        self._add_log(task_id, f"Test file: {test_file}")
+                        self._add_log(task, "Generating E2E test to verify bug behavior...")
 
-                        # Store test file path for later verification
-                        task.e2e_test_path = test_file
-                        self.db.add(task)
-                        self.db.commit()
-                    else:
-                        self._add_log(task_id, "⚠ Behavioral test passed - bug may not be reproducible via E2E test")
-                        self._add_log(task_id, "Continuing with unit test verification...")
+                        self._cit_workspace = task.workspace_path
+                        cit_agent = CITAgent(use_docker=True)
 
-                except Exception as e:
-                    # Don't fail the whole pipeline if CIT fails
-                    error_msg = f"CIT Agent error (non-fatal): {str(e)}"
-                    self._add_log(task_id, error_msg)
-                    self._add_log(task_id, "Continuing with unit test verification...")
+                        # Verify bug exists using behavioral test
+                        bug_exists, test_result, test_file = await asyncio.to_thread(
+                            cit_agent.verify_bug,
+                            bug_description=task.bug_description,
+                            workspace_path=task.workspace_path,
+                            app_context=""  # Could be enhanced with repo context
+                        )
 
-        # Step 3 - RUNNING_TESTS_BEFORE_FIX
-        if not self._set_status(task_id, "RUNNING_TESTS_BEFORE_FIX"):
-            return
+                        # Log results
+                        self._add_log(task, f"Behavioral test result: {test_result.get_summary()}")
+
+                        if bug_exists:
+                            self._add_log(task, "✓ Bug confirmed by behavioral test (test failed as expected)")
+                            self._add_log(task, f"Test file: {test_file}")
+
+                            # Store test file path for later verification
+                            task.e2e_test_path = test_file
+                            self.db.add(task)
+                            await asyncio.to_thread(self.db.commit)
+                        else:
+                            self._add_log(task, "⚠ Behavioral test passed - bug may not be reproducible via E2E test")
+                            self._add_log(task, "Continuing with unit test verification...")
+
+                    except Exception as e:
+                        # Don't fail the whole pipeline if CIT fails
+                        error_msg = f"CIT Agent error (non-fatal): {str(e)}"
+                        self._add_log(task, error_msg)
+                        self._add_log(task, "Continuing with unit test verification...")
+
+            # Step 3 - RUNNING_TESTS_BEFORE_FIX
+            await self._set_status(task, "RUNNING_TESTS_BEFORE_FIX")
+        finally:
+            # Don't leave pytest running in the workspace if the task stopped
+            if unit_tests is not None:
+                await asyncio.gather(unit_tests, return_exceptions=True)
 
-        # Load task again to get latest state
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task or not task.workspace_path:
-            self._add_log(task_id, "No workspace_path, cannot run tests")
-            self._set_status(task_id, "FAILED")
+        if not task.workspace_path:
+            self._add_log(task, "No workspace_path, cannot run tests")
+            await self._set_status(task, "FAILED")
             return
 
         try:
-            from app.services.test_runner import run_tests
-
-            tests_passed, test_output = run_tests(task.workspace_path, task.test_command)
-
-            # Truncate test output to avoid DB bloat (keep last 5000 chars)
-            truncated_output = test_output
-            if len(test_output) > 5000:
-                truncated_output = "... [truncated] ...\n" + test_output[-5000:]
+            if unit_tests is not None:
+                tests_passed, test_output = await unit_tests
+            else:
+                tests_passed, test_output = await asyncio.to_thread(
+                    run_tests, task.workspace_path, task.test_command, MODE_BEFORE
+                )
 
+            # run_tests keeps only the output tail, so it is small enough to store
             if tests_passed:
                 # Tests pass - no bug to fix
-                self._add_log(task_id, f"Tests passed. Output:\n{truncated_output}")
-                self._add_log(task_id, "No failing tests found, nothing to fix")
-                self._set_status(task_id, "FAILED")
+                self._add_log(task, f"Tests passed. Output:\n{test_output}")
+                self._add_log(task, "No failing tests found, nothing to fix")
+                await self._set_status(task, "FAILED")
                 return
             else:
                 # Tests fail - we've reproduced the bug
-                self._add_log(task_id, f"Tests failed (bug reproduced). Output:\n{truncated_output}")
+                self._add_log(task, f"Tests failed (bug reproduced). Output:\n{test_output}")
                 # Store the failing output for use in fix generation
-                task.test_output_before = truncated_output
+                task.test_output_before = test_output
                 self.db.add(task)
-                self.db.commit()
+                await asyncio.to_thread(self.db.commit)
 
         except Exception as e:
             error_msg = f"Failed to run tests: {str(e)}"
-            self._add_log(task_id, error_msg)
-            self._set_status(task_id, "FAILED")
+            self._add_log(task, error_msg)
+            await self._set_status(task, "FAILED")
             return
 
         # Step 4 - GENERATING_FIX
-        if not self._set_status(task_id, "GENERATING_FIX"):
-            return
+        await self._set_status(task, "GENERATING_FIX")
 
-        # Load task again to get latest state
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task or not task.workspace_path:
-            self._add_log(task_id, "No workspace_path, cannot generate fix")
-            self._set_status(task_id, "FAILED")
+        if not task.workspace_path:
+            self._add_log(task, "No workspace_path, cannot generate fix")
+            await self._set_status(task, "FAILED")
             return
 
         try:
             # Try enhanced CodeAgent first, fall back to legacy FixAgent
             use_enhanced = True
             try:
-                from app.services.code_agent import CodeAgent
-                from app.services.patch_applicator import PatchApplicator
+                CodeAgent = _lazy_import("app.services.code_agent").CodeAgent
+                PatchApplicator = _lazy_import("app.services.patch_applicator").PatchApplicator
             except ImportError:
                 use_enhanced = False
-                from app.services.fix_agent import FixAgent, apply_patches
-
-            # Rebuild code index with semantic search
-            try:
-                from app.services.semantic_index import SemanticCodeIndex
+                fix_agent = _lazy_import("app.services.fix_agent")
+                FixAgent, apply_patches = fix_agent.FixAgent, fix_agent.apply_patches
+
+            # Reuse the INDEXING_CODE index; if tests or the CIT agent touched
+            # Python files since, re-index just those files
+            snapshot = await asyncio.to_thread(self._workspace_snapshot, task.workspace_path)
+            if self._code_index is not None:
+                index = self._code_index
+                previous = self._index_snapshot or {}
+                changed = [
+                    path for path in snapshot.keys() | previous.keys()
+                    if snapshot.get(path) != previous.get(path)
+                ]
+                if changed:
+                    await asyncio.to_thread(index.update, changed)
+                    self._add_log(task, f"Updated code index for {len(changed)} changed file(s)")
+                else:
+                    self._add_log(task, "Reusing code index (workspace unchanged)")
+                self._index_snapshot = snapshot
+            else:
+                try:
+                    SemanticCodeIndex = _lazy_import("app.services.semantic_index").SemanticCodeIndex
 
-                index = SemanticCodeIndex(task.workspace_path)
-                index.build_index()
-                self._add_log(task_id, "Using semantic search for context")
-            except ImportError:
-                # Fall back to simple CodeIndex
-                from app.services.code_index import CodeIndex
+                    index = SemanticCodeIndex(task.workspace_path)
+                    await asyncio.to_thread(index.build_index)
+                    self._add_log(task, "Using semantic search for context")
+                except ImportError:
+                    # Fall back to simple CodeIndex
+                    index = CodeIndex(task.workspace_path)
+                    await asyncio.to_thread(index.build_index)
+                    self._add_log(task, "Using simple search for context")
 
-                index = CodeIndex(task.workspace_path)
-                index.build_index()
-                self._add_log(task_id, "Using simple search for context")
+                self._code_index = index
+                self._index_snapshot = snapshot
 
             if use_enhanced:
                 # Use enhanced Code Agent with structured patches
-                self._add_log(task_id, "Using enhanced Code Agent (line-accurate patches)")
+                self._add_log(task, "Using enhanced Code Agent (line-accurate patches)")
 
                 agent = CodeAgent(task_id=task_id)
 
@@ -294,160 +452,147 @@ class TaskOrchestrator:
                     code_context = index.get_context(task.bug_description, max_results=5)
                 else:
                     snippets = index.search(task.bug_description, max_results=5)
-                    context_parts = []
-                    for i, snippet in enumerate(snippets, 1):
-                        context_parts.append(
-                            f"### File {i}: {snippet.file_path} (lines {snippet.start_line}-{snippet.end_line})\n"
-                            f"```python\n{snippet.snippet}\n```"
-                        )
-                    code_context = "\n\n".join(context_parts)
+                    code_context = "\n\n".join(
+                        f"### File {i}: {snippet.file_path} (lines {snippet.start_line}-{snippet.end_line})\n"
+                        f"```python\n{snippet.snippet}\n```"
+                        for i, snippet in enumerate(snippets, 1)
+                    )
 
                 # Generate patches
-                self._add_log(task_id, "Generating structured patches...")
-                patch_set = agent.generate_fix(
+                self._add_log(task, "Generating structured patches...")
+                patch_set = await asyncio.to_thread(
+                    agent.generate_fix,
                     bug_description=task.bug_description,
                     test_failure_log=task.test_output_before or "",
                     code_context=code_context
                 )
 
-                self._add_log(task_id,
+                self._add_log(task,
                              f"Generated {len(patch_set.patches)} patch(es) "
                              f"(confidence: {patch_set.confidence:.2f})")
-                self._add_log(task_id, f"Rationale: {patch_set.rationale}")
+                self._add_log(task, f"Rationale: {patch_set.rationale}")
 
                 # Apply patches
                 applicator = PatchApplicator(task.workspace_path, create_backups=True)
-                results = applicator.apply_patch_set(patch_set, dry_run=False, fail_fast=False)
+                results = await asyncio.to_thread(
+                    applicator.apply_patch_set, patch_set, dry_run=False, fail_fast=False
+                )
 
                 if results["success"]:
-                    self._add_log(task_id,
+                    self._add_log(task,
                                  f"Applied {results['applied']} patch(es) successfully")
                 else:
-                    self._add_log(task_id,
+                    self._add_log(task,
                                  f"Patch application completed with {results['failed']} error(s)")
                     for error in results["errors"]:
-                        self._add_log(task_id, f"  - {error}")
+                        self._add_log(task, f"  - {error}")
 
             else:
                 # Fall back to legacy FixAgent
-                self._add_log(task_id, "Using legacy FixAgent")
+                self._add_log(task, "Using legacy FixAgent")
 
                 fix_agent = FixAgent(task_id=task_id)
 
                 # Generate patches
-                self._add_log(task_id, "Calling LLM to generate fix...")
-                patches = fix_agent.generate_patch(
+                self._add_log(task, "Calling LLM to generate fix...")
+                patches = await asyncio.to_thread(
+                    fix_agent.generate_patch,
                     task=task,
                     failing_output=task.test_output_before or "",
                     code_index=index
                 )
 
-                self._add_log(task_id, f"Generated {len(patches)} patch(es)")
+                self._add_log(task, f"Generated {len(patches)} patch(es)")
 
                 # Apply patches
-                apply_patches(patches, workspace_path=task.workspace_path)
-                self._add_log(task_id, "Applied patches to source files")
+                await asyncio.to_thread(apply_patches, patches, workspace_path=task.workspace_path)
+                self._add_log(task, "Applied patches to source files")
 
         except Exception as e:
             error_msg = f"Failed to generate or apply fix: {str(e)}"
-            self._add_log(task_id, error_msg)
-            self._set_status(task_id, "FAILED")
+            self._add_log(task, error_msg)
+            await self._set_status(task, "FAILED")
             return
 
         # Step 5 - RUNNING_TESTS_AFTER_FIX
-        if not self._set_status(task_id, "RUNNING_TESTS_AFTER_FIX"):
-            return
+        await self._set_status(task, "RUNNING_TESTS_AFTER_FIX")
 
-        # Load task again
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task or not task.workspace_path:
-            self._add_log(task_id, "No workspace_path, cannot run tests")
-            self._set_status(task_id, "FAILED")
+        if not task.workspace_path:
+            self._add_log(task, "No workspace_path, cannot run tests")
+            await self._set_status(task, "FAILED")
             return
 
         try:
-            from app.services.test_runner import run_tests
-
-            tests_passed, test_output = run_tests(task.workspace_path, task.test_command)
-
-            # Truncate test output
-            truncated_output = test_output
-            if len(test_output) > 5000:
-                truncated_output = "... [truncated] ...\n" + test_output[-5000:]
+            tests_passed, test_output = await asyncio.to_thread(
+                run_tests, task.workspace_path, task.test_command, MODE_AFTER
+            )
 
             if tests_passed:
                 # Success! Fix worked
-                self._add_log(task_id, f"Tests passed after fix! Output:\n{truncated_output}")
+                self._add_log(task, f"Tests passed after fix! Output:\n{test_output}")
                 # Continue to behavioral verification if enabled
             else:
                 # Fix didn't work
-                self._add_log(task_id, f"Tests still failing after fix. Output:\n{truncated_output}")
-                self._set_status(task_id, "FAILED")
+                self._add_log(task, f"Tests still failing after fix. Output:\n{test_output}")
+                await self._set_status(task, "FAILED")
                 return
 
         except Exception as e:
             error_msg = f"Failed to run tests after fix: {str(e)}"
-            self._add_log(task_id, error_msg)
-            self._set_status(task_id, "FAILED")
+            self._add_log(task, error_msg)
+            await self._set_status(task, "FAILED")
             return
 
         # Step 5.5 - VERIFYING_FIX_BEHAVIOR (optional CIT Agent verification)
-        enable_cit = os.getenv("ENABLE_CIT_AGENT", "false").lower() == "true"
-
-        if enable_cit:
-            task = self.db.query(Task).filter(Task.id == task_id).first()
-
+        if self.enable_cit:
             # Check if we have a behavioral test to re-run
-            if task and hasattr(task, 'e2e_test_path') and task.e2e_test_path:
-                if not self._set_status(task_id, "VERIFYING_FIX_BEHAVIOR"):
-                    return
+            if task.e2e_test_path:
+                await self._set_status(task, "VERIFYING_FIX_BEHAVIOR")
 
                 try:
-                    from app.services.cit_agent import CITAgent
+                    CITAgent = _lazy_import("app.services.cit_agent").CITAgent
 
-                    self._add_log(task_id, "Re-running E2E test to verify fix...")
+                    self._add_log(task, "Re-running E2E test to verify fix...")
 
+                    self._cit_workspace = task.workspace_path
                     cit_agent = CITAgent(use_docker=True)
 
                     # Verify fix works
-                    fix_works, test_result = cit_agent.verify_fix(
+                    fix_works, test_result = await asyncio.to_thread(
+                        cit_agent.verify_fix,
                         test_file_path=task.e2e_test_path,
                         workspace_path=task.workspace_path
                     )
 
-                    self._add_log(task_id, f"Behavioral verification: {test_result.get_summary()}")
+                    self._add_log(task, f"Behavioral verification: {test_result.get_summary()}")
 
                     if fix_works:
-                        self._add_log(task_id, "✓ Fix confirmed by behavioral test (E2E test now passes)")
+                        self._add_log(task, "✓ Fix confirmed by behavioral test (E2E test now passes)")
                     else:
-                        self._add_log(task_id, "⚠ E2E test still failing, but unit tests pass")
-                        self._add_log(task_id, test_result.get_failure_details())
+                        self._add_log(task, "⚠ E2E test still failing, but unit tests pass")
+                        self._add_log(task, test_result.get_failure_details())
                         # Don't fail - unit tests passed, E2E might need different fix
 
                 except Exception as e:
                     error_msg = f"CIT verification error (non-fatal): {str(e)}"
-                    self._add_log(task_id, error_msg)
+                    self._add_log(task, error_msg)
 
         # Step 6 - CREATING_PR_BRANCH
-        if not self._set_status(task_id, "CREATING_PR_BRANCH"):
-            return
+        await self._set_status(task, "CREATING_PR_BRANCH")
 
-        # Load task again
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task or not task.workspace_path:
-            self._add_log(task_id, "No workspace_path, cannot create PR branch")
-            self._set_status(task_id, "FAILED")
+        if not task.workspace_path:
+            self._add_log(task, "No workspace_path, cannot create PR branch")
+            await self._set_status(task, "FAILED")
             return
 
         try:
-            from app.services.repo_manager import create_pr_branch_local
-
             # Create branch and commit changes
             # For v0.1: don't push to remote (set to False)
             # Later: can set to True to enable push
             push_to_remote = False
 
-            branch_name = create_pr_branch_local(
+            branch_name = await asyncio.to_thread(
+                create_pr_branch_local,
                 workspace_path=task.workspace_path,
                 task_id=task_id,
                 push_to_remote=push_to_remote
@@ -456,112 +601,142 @@ class TaskOrchestrator:
             # Store branch name in task
             task.branch_name = branch_name
             self.db.add(task)
-            self.db.commit()
+            await asyncio.to_thread(self.db.commit)
 
-            self._add_log(task_id, f"Created branch: {branch_name}")
+            self._add_log(task, f"Created branch: {branch_name}")
 
             if push_to_remote:
-                self._add_log(task_id, f"Branch pushed to remote: {branch_name}")
+                self._add_log(task, f"Branch pushed to remote: {branch_name}")
             else:
-                self._add_log(task_id, f"Branch created locally (not pushed to remote)")
+                self._add_log(task, f"Branch created locally (not pushed to remote)")
 
             # Mark as completed
-            self._set_status(task_id, "COMPLETED")
+            await self._set_status(task, "COMPLETED")
             return
 
         except Exception as e:
             error_msg = f"Failed to create PR branch: {str(e)}"
-            self._add_log(task_id, error_msg)
+            self._add_log(task, error_msg)
             # Still mark as completed since the fix worked, just PR creation failed
-            self._add_log(task_id, "Fix was successful, but PR branch creation failed")
-            self._set_status(task_id, "COMPLETED")
+            self._add_log(task, "Fix was successful, but PR branch creation failed")
+            await self._set_status(task, "COMPLETED")
             return
 
-    def _set_status(self, task_id: str, new_status: str) -> bool:
-
+    @staticmethod
+    def _workspace_snapshot(workspace_path: str) -> Dict[str, Tuple[int, int]]:
         """
+        Cheap change detector for the workspace's Python files.
+
+        Records each file's mtime and size (no file contents) for the same
+        file set, and the same path strings, that the indexes use.
 
-        Load the task fresh, update status and logs, commit.
+        Args:
+            workspace_path: Workspace to snapshot
 
         Returns:
+            Mapping of file path to (mtime_ns, size); comparing two snapshots
+            yields the files added, removed or modified in between
+        """
+        snapshot = {}
+
+        for py_file in iter_python_files(workspace_path):
+            try:
+                stat = py_file.stat()
+            except OSError:
+                continue
+            snapshot[str(py_file)] = (stat.st_mtime_ns, stat.st_size)
 
-            True if the task was found and updated.
+        return snapshot
 
-            False if the task does not exist.
+    async def _set_status(self, task: Task, new_status: str) -> None:
 
         """
 
-        task: Optional[Task] = (
+        Write a status change from a worker thread (see _write_status).
 
-            self.db.query(Task)
+        """
 
-            .filter(Task.id == task_id)
+        await asyncio.to_thread(self._write_status, task, new_status)
 
-            .first()
+    def _write_status(self, task: Task, new_status: str) -> None:
 
-        )
+        """
 
-        if task is None:
+        Update status, write buffered logs plus the transition line, commit.
 
-            # In a real app you might want structured logging here
+        The status is written with a Core UPDATE rather than through the
 
-            print(f"[TaskOrchestrator] Task {task_id} not found. Stopping.")
+        unit of work; the loaded Task is then patched in place without
 
-            return False
+        being marked dirty, so it stays in sync at no extra round-trip.
 
-        timestamp = datetime.utcnow().isoformat()
+        The existence and "not already terminal" checks ride on the same
 
-        log_line = f"[{timestamp}] Moved to {new_status}"
+        UPDATE: if it matches no row, the task was cancelled (deleted) or
 
-        # Append to logs. Ensure logs is a string.
+        finished elsewhere, and TaskStopped is raised instead of writing.
 
-        existing_logs = task.logs or ""
+        """
 
-        if existing_logs:
+        now = datetime.utcnow()
 
-            task.logs = existing_logs + "\n" + log_line
+        result = self.db.execute(
 
-        else:
+            update(Task)
 
-            task.logs = log_line
+            .where(Task.id == task.id, Task.status.notin_(TERMINAL_STATUSES))
 
-        task.status = new_status
+            .values(status=new_status, updated_at=now)
 
-        task.updated_at = datetime.utcnow()
+            .execution_options(synchronize_session=False)
 
-        self.db.add(task)
+        )
 
-        self.db.commit()
+        if result.rowcount == 0:
 
-        # Optional: refresh to make sure we have the latest state
+            self._pending_logs = []
 
-        self.db.refresh(task)
+            self.db.rollback()
 
-        return True
+            raise TaskStopped(f"Task {task.id} was deleted or already finished")
 
-    def _add_log(self, task_id: str, message: str) -> None:
-        """
-        Add a log message to the task's logs field.
+        set_committed_value(task, "status", new_status)
+
+        set_committed_value(task, "updated_at", now)
+
+        self._add_log(task, f"Moved to {new_status}", timestamp=now.isoformat())
+
+        self._flush_logs()
+
+        self.db.commit()
+
+        publish_task_update(task.id)
+
+    def _add_log(self, task: Task, message: str, timestamp: Optional[str] = None) -> None:
         """
-        task: Optional[Task] = (
-            self.db.query(Task)
-            .filter(Task.id == task_id)
-            .first()
-        )
-        
-        if task is None:
-            return
+        Buffer a log message for the task.
 
-        timestamp = datetime.utcnow().isoformat()
+        Nothing is written until the next _set_status, so a stage's log
+        lines and its status change share one commit.
+        """
+        timestamp = timestamp or _utc_timestamp()
         log_line = f"[{timestamp}] {message}"
 
-        existing_logs = task.logs or ""
-        if existing_logs:
-            task.logs = existing_logs + "\n" + log_line
-        else:
-            task.logs = log_line
+        self._pending_logs.append({"task_id": task.id, "message": log_line})
 
-        task.updated_at = datetime.utcnow()
-        self.db.add(task)
-        self.db.commit()
-        self.db.refresh(task)
+    def _flush_remaining_logs(self) -> None:
+        """Write and commit any buffered log lines, best effort."""
+        if not self._pending_logs:
+            return
+        try:
+            self._flush_logs()
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"[TaskOrchestrator] Failed to flush buffered logs: {e}")
+
+    def _flush_logs(self) -> None:
+        """Insert buffered log lines in one statement (committed by the caller)."""
+        if self._pending_logs:
+            self.db.execute(insert(TaskLog), self._pending_logs)
+            self._pending_logs = []
@@ -8,6 +8,7 @@ This module provides a production-grade task queue using Redis Queue (RQ) with:
 - Job status tracking
 """
 
+import signal
 import redis
 from rq import Queue, Worker
 from rq.job import Job, JobStatus
@@ -154,11 +155,14 @@ class TaskQueue:
         queue = self.high_priority_queue if high_priority else self.default_queue
 
         # Enqueue with metadata
-        # Note: job_timeout=None disables timeout (required for Windows compatibility)
+        # RQ enforces job_timeout with SIGALRM, which Windows lacks; there the
+        # timeout stays disabled, elsewhere a hung LLM call or test run can't
+        # hold a worker for longer than JOB_TIMEOUT
+        job_timeout = self.config.JOB_TIMEOUT if hasattr(signal, "SIGALRM") else None
         job = queue.enqueue(
             func,
             task_id,
-            job_timeout=None,  # None means no timeout (Windows compatible)
+            job_timeout=job_timeout,
             result_ttl=self.config.RESULT_TTL,
             failure_ttl=self.config.FAILURE_TTL,
             meta={
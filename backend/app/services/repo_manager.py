@@ -1,7 +1,19 @@
 import os
+import hashlib
+import shutil
 import subprocess
 from pathlib import Path
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Opt-in: local bare mirrors that task workspaces are checked out from as worktrees
+MIRROR_DIR = Path(os.getenv("ASA_MIRROR_DIR", str(Path.home() / ".asa" / "mirrors")))
+USE_MIRRORS = HAS_FCNTL and os.getenv("ASA_GIT_MIRRORS", "false").lower() == "true"
+
 def create_workspace(task_id: str, base_dir: str = "workspaces") -> str:
     """
     Creates the base directory if needed and a subdirectory for the task.
@@ -11,25 +23,172 @@ def create_workspace(task_id: str, base_dir: str = "workspaces") -> str:
     path.mkdir(parents=True, exist_ok=True)
     return str(path.absolute())
 
+def _git_env() -> dict:
+    """Environment for network git commands: abort transfers stalled below 1KB/s for 30s."""
+    return {
+        **os.environ,
+        'GIT_HTTP_LOW_SPEED_LIMIT': '1000',
+        'GIT_HTTP_LOW_SPEED_TIME': '30',
+    }
+
+def _mirror_path(repo_url: str) -> Path:
+    """Returns the local bare mirror path for a repository URL."""
+    repo_hash = hashlib.sha256(repo_url.encode('utf-8')).hexdigest()[:16]
+    return MIRROR_DIR / f"{repo_hash}.git"
+
+def _worktree_from_mirror(repo_url: str, workspace_path: str, branch: str) -> None:
+    """
+    Checks out the branch tip as a worktree of the repository's local mirror.
+
+    The mirror is a shallow, blob-less bare clone shared by all tasks; it
+    is created on first use and the branch tip is fetched on every later
+    one, under a file lock so concurrent tasks on the same repository
+    don't race on it.
+    """
+    mirror = _mirror_path(repo_url)
+    mirror.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(f"{mirror}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        if not (mirror / 'HEAD').exists():
+            subprocess.run(
+                [
+                    'git', 'clone', '--bare', '-b', branch,
+                    '--depth=1', '--filter=blob:none', '--single-branch',
+                    repo_url, str(mirror)
+                ],
+                check=True, capture_output=True, text=True, env=_git_env()
+            )
+        subprocess.run(
+            ['git', '-C', str(mirror), 'fetch', '--depth=1', '--filter=blob:none', 'origin',
+             f'+refs/heads/{branch}:refs/heads/{branch}'],
+            check=True, capture_output=True, text=True, env=_git_env()
+        )
+
+        # Forget worktrees whose workspaces have been deleted
+        subprocess.run(
+            ['git', '-C', str(mirror), 'worktree', 'prune'],
+            check=True, capture_output=True, text=True
+        )
+        subprocess.run(
+            ['git', '-C', str(mirror), 'worktree', 'add', '--force', '--detach',
+             workspace_path, f'refs/heads/{branch}'],
+            check=True, capture_output=True, text=True, env=_git_env()
+        )
+
 def clone_repo(repo_url: str, workspace_path: str, branch: str = "main") -> None:
     """
     Clones the repository into the specified workspace path.
     Uses subprocess for git operations with basic error handling.
     Logs simple messages.
+
+    With ASA_GIT_MIRRORS=true the workspace is a worktree of a local bare
+    mirror (MIRROR_DIR), so repeat tasks on a repository only fetch the new
+    branch tip and share object storage; remove_workspace releases it. If
+    the mirror can't be used, a direct clone is made instead.
+
+    Either way only the tip of the branch is fetched (shallow,
+    single-branch) and file contents are fetched lazily
+    (--filter=blob:none); history is not needed to index, test and patch.
+    Stalled transfers abort after 30 seconds below 1KB/s.
     """
     print(f"Cloning started for {repo_url} into {workspace_path}")
+
+    if USE_MIRRORS:
+        try:
+            _worktree_from_mirror(repo_url, workspace_path, branch)
+            print("Cloning finished (worktree of local mirror)")
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Mirror checkout failed, falling back to clone: {getattr(e, 'stderr', None) or e}")
+
     try:
         result = subprocess.run(
-            ['git', 'clone', '-b', branch, repo_url, workspace_path],
+            [
+                'git', 'clone', '-b', branch,
+                '--depth=1', '--filter=blob:none', '--single-branch',
+                repo_url, workspace_path
+            ],
             check=True,
             capture_output=True,
-            text=True
+            text=True,
+            env=_git_env()
         )
         print("Cloning finished")
     except subprocess.CalledProcessError as e:
         print(f"Cloning failed: {e.stderr}")
         raise Exception(f"Failed to clone repo: {e.stderr}")
 
+def remove_workspace(workspace_path: str) -> None:
+    """
+    Deletes a task workspace.
+
+    A worktree of a local mirror is unregistered from the mirror and its
+    asa/fix-* branch deleted, so per-task branches don't pile up in the
+    shared mirror.
+
+    Args:
+        workspace_path: Path to the task's workspace directory
+    """
+    workspace = Path(workspace_path)
+    if not workspace.exists():
+        return
+
+    if HAS_FCNTL and (workspace / '.git').is_file():
+        try:
+            common_dir = subprocess.run(
+                ['git', 'rev-parse', '--git-common-dir'],
+                cwd=workspace, check=True, capture_output=True, text=True
+            ).stdout.strip()
+            mirror = (workspace / common_dir).resolve()
+
+            if mirror.parent == MIRROR_DIR.resolve():
+                branch = subprocess.run(
+                    ['git', 'symbolic-ref', '--short', '-q', 'HEAD'],
+                    cwd=workspace, capture_output=True, text=True
+                ).stdout.strip()
+
+                with open(f"{mirror}.lock", 'w') as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                    subprocess.run(
+                        ['git', '-C', str(mirror), 'worktree', 'remove', '--force', str(workspace)],
+                        check=True, capture_output=True, text=True
+                    )
+                    if branch.startswith('asa/fix-'):
+                        subprocess.run(
+                            ['git', '-C', str(mirror), 'branch', '-D', branch],
+                            check=True, capture_output=True, text=True
+                        )
+                print(f"Removed worktree {workspace_path} from mirror")
+                return
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to remove worktree, deleting directory: {e.stderr}")
+
+    shutil.rmtree(workspace, ignore_errors=True)
+    print(f"Removed workspace {workspace_path}")
+
+def get_head_commit(workspace_path: str) -> str:
+    """
+    Returns the SHA of the commit checked out in the workspace.
+
+    Args:
+        workspace_path: Path to the git repository
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=workspace_path,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip()
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to resolve HEAD: {e.stderr}")
+        raise Exception(f"Failed to resolve HEAD: {e.stderr}")
+
 def create_fix_branch(workspace_path: str, task_id: str) -> str:
     """
     Creates a new git branch for the fix.
@@ -46,7 +205,7 @@ def create_fix_branch(workspace_path: str, task_id: str) -> str:
     try:
         # Create and checkout new branch
         subprocess.run(
-            ['git', 'checkout', '-b', branch_name],
+            ['git', 'checkout', '-B', branch_name],
             cwd=workspace_path,
             check=True,
             capture_output=True,
@@ -10,7 +10,10 @@ Collects and formats:
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import statistics
@@ -20,6 +23,20 @@ from sqlalchemy import func
 from app.models import Task, LLMUsage, TaskMetrics
 
 
+# Case-insensitive "FAIL" probe; avoids upper-casing multi-MB test output
+_FAIL_RE = re.compile("fail", re.IGNORECASE)
+
+# Log lines that end the post-fix test section
+_TEST_SECTION_END = ("COMPLETED", "FAILED", "CREATING_PR")
+
+# Rendered PR bodies keyed by (task_id, task.updated_at). Retried PR
+# creation for an unchanged task reuses the body instead of re-running
+# the metric queries; any task write bumps updated_at and misses.
+PR_BODY_CACHE_SIZE = 32
+_pr_body_cache: "OrderedDict[Tuple[str, Any], str]" = OrderedDict()
+_pr_body_cache_lock = threading.Lock()
+
+
 class RunReport:
     """Generates comprehensive run reports for PR descriptions."""
 
@@ -42,9 +59,29 @@ class RunReport:
         """
         Generate PR body from template with all placeholders filled.
 
+        Bodies are cached per task version, see PR_BODY_CACHE_SIZE.
+
         Returns:
             Formatted PR description
         """
+        cache_key = (self.task_id, self.task.updated_at)
+        with _pr_body_cache_lock:
+            body = _pr_body_cache.get(cache_key)
+            if body is not None:
+                _pr_body_cache.move_to_end(cache_key)
+                return body
+
+        body = self._render_pr_body()
+
+        with _pr_body_cache_lock:
+            _pr_body_cache[cache_key] = body
+            if len(_pr_body_cache) > PR_BODY_CACHE_SIZE:
+                _pr_body_cache.popitem(last=False)
+
+        return body
+
+    def _render_pr_body(self) -> str:
+        """Render the PR body from the repo template, or the simple fallback."""
         # Load template
         template_path = Path(__file__).parent.parent.parent.parent / ".github" / "PULL_REQUEST_TEMPLATE.md"
 
@@ -221,29 +258,29 @@ class RunReport:
     def _get_test_results(self) -> Dict[str, Any]:
         """Extract test results from task."""
         pre_fix_output = self.task.test_output_before or "No pre-fix tests run"
-        pre_fix_status = "❌ FAILED" if "FAIL" in pre_fix_output.upper() else "✅ PASSED"
+        pre_fix_status = "❌ FAILED" if _FAIL_RE.search(pre_fix_output) else "✅ PASSED"
 
         # Extract post-fix test results from logs
         logs = self.task.logs or ""
         post_fix_output = "No post-fix tests run"
         post_fix_status = "⚠️ UNKNOWN"
 
-        if "RUNNING_TESTS_AFTER_FIX" in logs:
-            # Extract test output from logs
-            lines = logs.split('\n')
-            test_section = []
-            in_test_section = False
-
-            for line in lines:
-                if "RUNNING_TESTS_AFTER_FIX" in line:
-                    in_test_section = True
-                elif in_test_section:
-                    if any(s in line for s in ["COMPLETED", "FAILED", "CREATING_PR"]):
+        marker = logs.find("RUNNING_TESTS_AFTER_FIX")
+        if marker != -1:
+            # Only scan the log after the marker line, keeping the last 20 lines
+            line_end = logs.find('\n', marker)
+            test_section = deque(maxlen=20)
+
+            if line_end != -1:
+                for line in logs[line_end + 1:].split('\n'):
+                    if "RUNNING_TESTS_AFTER_FIX" in line:
+                        continue
+                    if any(s in line for s in _TEST_SECTION_END):
                         break
                     test_section.append(line)
 
             if test_section:
-                post_fix_output = "\n".join(test_section[-20:])  # Last 20 lines
+                post_fix_output = "\n".join(test_section)
                 post_fix_status = "✅ PASSED" if self.task.status == "COMPLETED" else "❌ FAILED"
 
         # E2E test summary
@@ -4,8 +4,16 @@ Semantic Code Index - Uses ChromaDB for vector-based semantic search.
 Combines AST parsing, embeddings, and vector search to find relevant code.
 """
 
-from typing import List, Optional
-from dataclasses import dataclass
+import os
+import copy
+import time
+import uuid
+import hashlib
+import weakref
+import threading
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, replace
 from pathlib import Path
 import chromadb
 from chromadb.config import Settings
@@ -13,6 +21,11 @@ from chromadb.config import Settings
 from app.services.ast_parser import ASTParser, CodeNode
 from app.services.embeddings import EmbeddingService
 
+# Built indexes kept per (repo_url, commit) for reuse by later tasks on the
+# same commit; 0 disables sharing
+INDEX_CACHE_MAX_ENTRIES = int(os.getenv("ASA_INDEX_CACHE_SIZE", "4"))
+INDEX_CACHE_TTL_SECONDS = 3600
+
 
 @dataclass
 class SearchResult:
@@ -64,6 +77,15 @@ class SemanticCodeIndex:
         # Storage for code nodes (ChromaDB has limited metadata storage)
         self.code_nodes: List[CodeNode] = []
 
+        # Collection id -> node; ids are never reused, so update() can drop
+        # and add nodes without renumbering the rest
+        self._nodes_by_id: Dict[str, CodeNode] = {}
+        self._next_id = 0
+
+        # Views handed out by for_workspace() share the collection with the
+        # cached index and copy it before their first update()
+        self._base: Optional["SemanticCodeIndex"] = None
+
     def build_index(self) -> None:
         """
         Build the semantic index by parsing the workspace and generating embeddings.
@@ -74,16 +96,112 @@ class SemanticCodeIndex:
 
         # Step 1: Parse all Python files using AST
         print("Step 1: Parsing code with tree-sitter...")
-        self.code_nodes = self.ast_parser.parse_workspace(self.workspace_path)
-        print(f"Found {len(self.code_nodes)} code nodes")
+        nodes = self.ast_parser.parse_workspace(self.workspace_path)
+        print(f"Found {len(nodes)} code nodes")
 
-        if not self.code_nodes:
+        if not nodes:
             print("Warning: No code nodes found in workspace")
             return
 
+        self._add_nodes(nodes)
+
+        print(f"Index built successfully with {len(self.code_nodes)} nodes")
+
+    def update(self, file_paths: Iterable[str]) -> None:
+        """
+        Re-index only the given files.
+
+        Nodes from these files are dropped; files that still exist are
+        re-parsed and embedded. Everything else in the index is kept.
+
+        Args:
+            file_paths: Changed, added or deleted Python files
+        """
+        file_paths = {str(path) for path in file_paths}
+
+        if self._base is not None:
+            self._detach()
+
+        stale_ids = [
+            node_id for node_id, node in self._nodes_by_id.items()
+            if node.file_path in file_paths
+        ]
+        if stale_ids:
+            self.collection.delete(ids=stale_ids)
+            for node_id in stale_ids:
+                del self._nodes_by_id[node_id]
+
+        nodes = []
+        for file_path in sorted(file_paths):
+            if file_path.endswith('.py') and os.path.isfile(file_path):
+                nodes.extend(self.ast_parser.parse_file(file_path))
+
+        if nodes:
+            self._add_nodes(nodes)
+        else:
+            self.code_nodes = list(self._nodes_by_id.values())
+
+        print(f"Index updated for {len(file_paths)} file(s): "
+              f"-{len(stale_ids)} +{len(nodes)} nodes")
+
+    def for_workspace(self, workspace_path: str) -> "SemanticCodeIndex":
+        """
+        Get a view of this index for another checkout of the same commit.
+
+        The view shares the embeddings and collection, with node paths
+        re-rooted at workspace_path. It never modifies this index.
+
+        Args:
+            workspace_path: Workspace holding the same files
+
+        Returns:
+            SemanticCodeIndex view
+        """
+        view = copy.copy(self)
+        view.workspace_path = workspace_path
+        view._nodes_by_id = {
+            node_id: replace(
+                node,
+                file_path=os.path.join(
+                    workspace_path, os.path.relpath(node.file_path, self.workspace_path)
+                )
+            )
+            for node_id, node in self._nodes_by_id.items()
+        }
+        view.code_nodes = list(view._nodes_by_id.values())
+        view._base = self._base or self
+        return view
+
+    def _detach(self) -> None:
+        """Copy the shared collection so this view can be modified."""
+        data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        collection_name = f"code_index_{uuid.uuid4().hex[:12]}"
+        collection = self.client.create_collection(
+            name=collection_name,
+            metadata={"description": "Code embeddings for semantic search"}
+        )
+        if data["ids"]:
+            metadatas = []
+            for node_id, metadata in zip(data["ids"], data["metadatas"]):
+                node = self._nodes_by_id.get(node_id)
+                metadatas.append({**metadata, "file_path": node.file_path} if node else metadata)
+            collection.add(
+                ids=data["ids"],
+                embeddings=data["embeddings"],
+                documents=data["documents"],
+                metadatas=metadatas
+            )
+        weakref.finalize(self, _delete_collection, self.client, collection_name)
+
+        self.collection = collection
+        self.collection_name = collection_name
+        self._base = None
+
+    def _add_nodes(self, nodes: List[CodeNode]) -> None:
+        """Embed nodes and add them to the collection under fresh ids."""
         # Step 2: Prepare texts for embedding
         print("Step 2: Preparing texts for embedding...")
-        texts = [self.embedding_service.prepare_code_text(node) for node in self.code_nodes]
+        texts = [self.embedding_service.prepare_code_text(node) for node in nodes]
 
         # Step 3: Generate embeddings
         print("Step 3: Generating embeddings...")
@@ -91,11 +209,12 @@ class SemanticCodeIndex:
 
         # Step 4: Store in ChromaDB
         print("Step 4: Storing in ChromaDB...")
-        ids = [f"node_{i}" for i in range(len(self.code_nodes))]
+        ids = [f"node_{self._next_id + i}" for i in range(len(nodes))]
+        self._next_id += len(nodes)
 
         # Create metadata for each node
         metadatas = []
-        for node in self.code_nodes:
+        for node in nodes:
             metadatas.append({
                 "type": node.type,
                 "name": node.name,
@@ -112,7 +231,8 @@ class SemanticCodeIndex:
             metadatas=metadatas
         )
 
-        print(f"Index built successfully with {len(self.code_nodes)} nodes")
+        self._nodes_by_id.update(zip(ids, nodes))
+        self.code_nodes = list(self._nodes_by_id.values())
 
     def search(self, query: str, max_results: int = 10, min_score: float = 0.0) -> List[SearchResult]:
         """
@@ -146,8 +266,9 @@ class SemanticCodeIndex:
             distances = results['distances'][0]
 
             for rank, (id_str, distance) in enumerate(zip(ids, distances), 1):
-                # Extract index from id
-                idx = int(id_str.split('_')[1])
+                node = self._nodes_by_id.get(id_str)
+                if node is None:
+                    continue
 
                 # Convert distance to similarity score (ChromaDB returns L2 distance)
                 # Lower distance = higher similarity
@@ -156,7 +277,7 @@ class SemanticCodeIndex:
 
                 if score >= min_score:
                     search_results.append(SearchResult(
-                        code_node=self.code_nodes[idx],
+                        code_node=node,
                         score=score,
                         rank=rank
                     ))
@@ -192,6 +313,15 @@ class SemanticCodeIndex:
 
         return "\n\n".join(context_parts)
 
+    def digest(self) -> str:
+        """Hash of the indexed code nodes (relative path, position, code)."""
+        h = hashlib.sha256()
+        for node in sorted(self.code_nodes, key=lambda n: (n.file_path, n.start_line, n.end_line)):
+            rel_path = os.path.relpath(node.file_path, self.workspace_path)
+            h.update(f"{rel_path}:{node.start_line}:{node.end_line}\0".encode("utf-8"))
+            h.update(node.code.encode("utf-8") + b"\0")
+        return h.hexdigest()
+
     def get_stats(self) -> dict:
         """Get statistics about the index."""
         return {
@@ -203,3 +333,77 @@ class SemanticCodeIndex:
             "methods": sum(1 for n in self.code_nodes if n.type == 'method'),
             "collection_count": self.collection.count() if self.collection else 0
         }
+
+
+def _delete_collection(client, collection_name: str) -> None:
+    """Drop a collection once no index references it."""
+    try:
+        client.delete_collection(name=collection_name)
+    except Exception:
+        pass
+
+
+# Shared index cache: (repo_url, commit) -> (expires_at, index)
+_index_cache: Dict[Tuple[str, str], Tuple[float, SemanticCodeIndex]] = {}
+_index_build_locks: DefaultDict[Tuple[str, str], threading.Lock] = defaultdict(threading.Lock)
+_index_cache_lock = threading.Lock()
+
+
+def get_shared_index(repo_url: str, commit_sha: str, workspace_path: str) -> SemanticCodeIndex:
+    """
+    Get a built index for repo_url@commit_sha, rooted at workspace_path.
+
+    The first task on a commit builds the index; later tasks in the same
+    process get a view of it until it expires. Concurrent tasks on the
+    same commit wait for a single build instead of each building their own.
+
+    Args:
+        repo_url: Repository URL
+        commit_sha: Commit checked out in workspace_path
+        workspace_path: Workspace the returned index is rooted at
+
+    Returns:
+        SemanticCodeIndex view that is safe to update()
+    """
+    key = (repo_url, commit_sha)
+
+    if INDEX_CACHE_MAX_ENTRIES <= 0:
+        index = SemanticCodeIndex(workspace_path)
+        index.build_index()
+        return index
+
+    with _index_cache_lock:
+        build_lock = _index_build_locks[key]
+
+    with build_lock:
+        with _index_cache_lock:
+            entry = _index_cache.get(key)
+
+        if entry is not None and entry[0] >= time.monotonic():
+            print(f"Reusing semantic index for {repo_url}@{commit_sha[:12]}")
+            index = entry[1]
+        else:
+            collection_name = f"code_index_{uuid.uuid4().hex[:12]}"
+            index = SemanticCodeIndex(workspace_path, collection_name=collection_name)
+            index.build_index()
+            # Drop the collection once the cache and every view let go of it
+            weakref.finalize(index, _delete_collection, index.client, collection_name)
+
+            with _index_cache_lock:
+                _index_cache[key] = (time.monotonic() + INDEX_CACHE_TTL_SECONDS, index)
+                _evict_indexes()
+
+    return index.for_workspace(workspace_path)
+
+
+def _evict_indexes() -> None:
+    """Drop expired entries, then the oldest ones over the size limit."""
+    now = time.monotonic()
+    for key in [key for key, (expires_at, _) in _index_cache.items() if expires_at < now]:
+        del _index_cache[key]
+        _index_build_locks.pop(key, None)
+
+    while len(_index_cache) > INDEX_CACHE_MAX_ENTRIES:
+        key = min(_index_cache, key=lambda k: _index_cache[k][0])
+        del _index_cache[key]
+        _index_build_locks.pop(key, None)
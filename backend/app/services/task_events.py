@@ -0,0 +1,131 @@
+"""
+Task Events - Push task updates to API processes over Redis pub/sub.
+
+Orchestrators run in RQ worker processes and publish a small event each
+time they commit a task change. Each API process holds a single Redis
+subscription (TaskUpdateHub) and fans events out to the WebSocket
+connections watching that task, so clients are woken on real changes
+instead of re-querying the database on a timer.
+"""
+
+import json
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+import redis
+
+from app.services.queue import QueueConfig
+
+logger = logging.getLogger(__name__)
+
+TASK_UPDATES_CHANNEL = "asa:task_updates"
+
+# Per-subscriber buffer; a client that falls this far behind only needs
+# to know "something changed", so extra events are dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+# Delay before re-subscribing after the Redis connection drops
+RESUBSCRIBE_DELAY_SECONDS = 5
+
+_publisher: Optional[redis.Redis] = None
+
+
+def publish_task_update(task_id: str) -> None:
+    """
+    Announce that a task row or its logs changed.
+
+    Publishing is best effort: a Redis outage must never fail the pipeline,
+    and WebSocket clients fall back to periodic polling.
+
+    Args:
+        task_id: Task that changed
+    """
+    global _publisher
+
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis(
+                host=QueueConfig.REDIS_HOST,
+                port=QueueConfig.REDIS_PORT,
+                db=QueueConfig.REDIS_DB
+            )
+        _publisher.publish(TASK_UPDATES_CHANNEL, json.dumps({"id": task_id}))
+    except Exception as e:
+        logger.warning(f"[TaskEvents] Failed to publish update for {task_id}: {e}")
+
+
+class TaskUpdateHub:
+    """One Redis subscription per process, fanned out to asyncio queues."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """
+        Start receiving update events for a task.
+
+        Args:
+            task_id: Task to watch
+
+        Returns:
+            Queue that receives one item per update event
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue) -> None:
+        """Stop delivering events for a task to this queue."""
+        queues = self._subscribers.get(task_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[task_id]
+
+    async def _listen(self) -> None:
+        """Relay channel messages to subscribers, reconnecting on errors."""
+        import redis.asyncio as aioredis
+
+        while True:
+            conn = aioredis.Redis(
+                host=QueueConfig.REDIS_HOST,
+                port=QueueConfig.REDIS_PORT,
+                db=QueueConfig.REDIS_DB
+            )
+            try:
+                pubsub = conn.pubsub()
+                await pubsub.subscribe(TASK_UPDATES_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    event = json.loads(message["data"])
+                    for queue in list(self._subscribers.get(event["id"], ())):
+                        try:
+                            queue.put_nowait(event)
+                        except asyncio.QueueFull:
+                            pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[TaskEvents] Subscription failed, retrying: {e}")
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                await conn.close()
+
+
+# Global hub instance
+_task_update_hub: Optional[TaskUpdateHub] = None
+
+
+def get_task_update_hub() -> TaskUpdateHub:
+    """Get or create the global task update hub."""
+    global _task_update_hub
+    if _task_update_hub is None:
+        _task_update_hub = TaskUpdateHub()
+    return _task_update_hub
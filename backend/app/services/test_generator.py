@@ -92,6 +92,9 @@ class TestGenerator:
             print(f"Error generating test: {e}")
             raise Exception(f"Failed to generate test: {str(e)}")
 
+        finally:
+            self.llm_gateway.flush_usage()
+
     def _create_test_prompt(self, bug_description: str, app_context: str) -> str:
         """Create the prompt for test generation."""
         context_section = ""
@@ -8,23 +8,125 @@ Handles:
 - Running in Docker sandbox for isolation
 """
 
+import os
 import subprocess
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Deque, List, Tuple, Optional
 
-def run_tests(workspace_path: str, test_command: Optional[str]) -> Tuple[bool, str]:
+# Only the tail of the test output is kept; callers store it on the task
+OUTPUT_TAIL_CHARS = 5000
+READ_CHUNK_SIZE = 4096
+TEST_TIMEOUT_SECONDS = 300  # 5 minute timeout
+TRUNCATED_MARKER = "... [truncated] ...\n"
+
+# Test run modes: "before" runs the full suite; "after" runs it again
+# unless ASA_TESTS_AFTER_FIX_FULL=false limits it to the previous failures
+MODE_BEFORE = "before"
+MODE_AFTER = "after"
+
+# Opt-in: spread the target repo's tests over all cores with pytest-xdist.
+# Needs xdist in the environment the test command runs from, and a suite
+# that tolerates running in several processes
+USE_XDIST = os.getenv("ASA_TESTS_XDIST", "false").lower() == "true"
+
+
+def is_pytest_command(cmd_parts: List[str]) -> bool:
+    """True for "pytest ..." and "python -m pytest ..." commands."""
+    if not cmd_parts:
+        return False
+    if Path(cmd_parts[0]).name in ("pytest", "py.test"):
+        return True
+    return cmd_parts[1:3] == ["-m", "pytest"]
+
+
+def _pytest_args(cmd_parts: List[str], mode: str) -> List[str]:
+    """
+    Add mode-specific pytest flags to a command.
+
+    Args:
+        cmd_parts: Split pytest command
+        mode: MODE_BEFORE or MODE_AFTER
+
+    Returns:
+        Command with the extra flags appended
+    """
+    extra = []
+    # Respect a worker count the user already chose ("-n 4", "-n4",
+    # "--numprocesses=4"); loadfile keeps each module's tests on one
+    # worker so module-scoped fixtures and state aren't split
+    user_set_workers = any(
+        part.startswith("-n") or part.startswith("--numprocesses") for part in cmd_parts
+    )
+    if USE_XDIST and not user_set_workers:
+        extra += ["-n", "auto", "--dist=loadfile"]
+    # The after-run checks the whole suite by default, so tests the fix
+    # breaks elsewhere are caught. ASA_TESTS_AFTER_FIX_FULL=false only
+    # re-runs the tests in the before-run's lastfailed cache.
+    if mode == MODE_AFTER and os.getenv("ASA_TESTS_AFTER_FIX_FULL", "true").lower() != "true":
+        extra += ["--lf"]
+    return cmd_parts + extra
+
+
+def _read_tail(stream, limit: int) -> Tuple[bytes, bool]:
+    """
+    Drain a stream in chunks, keeping only the last ``limit`` bytes.
+
+    Args:
+        stream: Binary stream to read until EOF
+        limit: Number of trailing bytes to keep
+
+    Returns:
+        Tuple of (tail: bytes, truncated: bool)
+    """
+    chunks: Deque[bytes] = deque()
+    size = 0
+    truncated = False
+
+    while True:
+        chunk = stream.read1(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        # Drop whole chunks from the front while the rest still covers the limit
+        while size - len(chunks[0]) >= limit:
+            size -= len(chunks.popleft())
+            truncated = True
+
+    tail = b"".join(chunks)
+    if len(tail) > limit:
+        tail = tail[-limit:]
+        truncated = True
+    return tail, truncated
+
+
+def run_tests(
+    workspace_path: str,
+    test_command: Optional[str],
+    mode: str = MODE_BEFORE
+) -> Tuple[bool, str]:
     """
     Run tests in the workspace directory.
     
+    Output is read through a buffered pipe in 4KB chunks and only the last
+    OUTPUT_TAIL_CHARS are kept, so a noisy test suite never has its full
+    output held in memory.
+
     Args:
         workspace_path: Path to the workspace directory
         test_command: Test command to run (e.g., "pytest", "npm test"). 
                      If None, defaults to "pytest"
+        mode: MODE_BEFORE or MODE_AFTER; both run the full suite unless
+              ASA_TESTS_AFTER_FIX_FULL=false makes MODE_AFTER re-run only
+              the previously failing tests (pytest only)
     
     Returns:
         Tuple of (tests_passed: bool, output: str)
         - tests_passed: True if returncode == 0, False otherwise
-        - output: Combined stdout + stderr as a single string
+        - output: Tail of the interleaved stdout + stderr, prefixed with a
+          truncation marker if earlier output was dropped
     """
     if test_command is None:
         test_command = "pytest"
@@ -37,31 +139,46 @@ def run_tests(workspace_path: str, test_command: Optional[str]) -> Tuple[bool, s
         # Split the command into a list for subprocess
         # Handle commands like "pytest -v" or "npm test"
         cmd_parts = test_command.split()
-        
-        result = subprocess.run(
+        if is_pytest_command(cmd_parts):
+            cmd_parts = _pytest_args(cmd_parts, mode)
+
+        # stderr is merged into stdout so one reader can drain both
+        # without the pipes deadlocking
+        process = subprocess.Popen(
             cmd_parts,
             cwd=str(workspace),
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=-1
         )
-        
-        # Combine stdout and stderr
-        output = ""
-        if result.stdout:
-            output += result.stdout
-        if result.stderr:
-            if output:
-                output += "\n--- stderr ---\n"
-            output += result.stderr
+
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(TEST_TIMEOUT_SECONDS, _kill)
+        timer.start()
+        try:
+            with process.stdout:
+                tail, truncated = _read_tail(process.stdout, OUTPUT_TAIL_CHARS)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+
+        if timed_out.is_set():
+            return False, "Test execution timed out after 5 minutes"
+
+        output = tail.decode("utf-8", errors="replace")
+        if truncated:
+            output = TRUNCATED_MARKER + output
         
         # returncode == 0 means tests passed
-        tests_passed = (result.returncode == 0)
+        tests_passed = (returncode == 0)
         
         return tests_passed, output
         
-    except subprocess.TimeoutExpired:
-        return False, "Test execution timed out after 5 minutes"
     except FileNotFoundError:
         return False, f"Test command not found: {test_command}. Make sure it's installed in the workspace."
     except Exception as e:
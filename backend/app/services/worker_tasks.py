@@ -8,12 +8,12 @@ They wrap the autonomous orchestrator with proper error handling and cancellatio
 import logging
 from typing import Optional
 from rq import get_current_job
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from app.database import SessionLocal
 from app.services.autonomous_orchestrator import AutonomousOrchestrator
 from app.services.queue import get_task_queue
-from app.models import Task
+from app.models import Task, TaskLog
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +41,8 @@ def run_task_job(task_id: str) -> dict:
 
     db = SessionLocal()
     try:
-        # Fetch task
-        task = db.query(Task).filter(Task.id == task_id).first()
+        # Check the task exists; the orchestrator loads what it needs
+        task = db.query(Task.id).filter(Task.id == task_id).first()
         if not task:
             logger.error(f"Task {task_id} not found")
             return {"success": False, "error": "Task not found"}
@@ -52,9 +52,10 @@ def run_task_job(task_id: str) -> dict:
             queue = get_task_queue()
             if queue.is_job_cancelled(job_id):
                 logger.info(f"Task {task_id} was cancelled before starting")
-                task.status = "CANCELLED"
-                task.logs = (task.logs or "") + "\n[Worker] Task cancelled before execution"
-                db.commit()
+                updated = db.execute(update(Task).where(Task.id == task_id).values(status="CANCELLED"))
+                if updated.rowcount:
+                    db.add(TaskLog(task_id=task_id, message="[Worker] Task cancelled before execution"))
+                    db.commit()
                 return {"success": False, "error": "Task cancelled"}
 
         # Create orchestrator with cancellation callback
@@ -94,10 +95,10 @@ def run_task_job(task_id: str) -> dict:
             logger.error(f"Error executing task {task_id}: {e}", exc_info=True)
 
             # Update task status to failed
-            task = db.query(Task).filter(Task.id == task_id).first()
-            if task:
-                task.status = "FAILED"
-                task.logs = (task.logs or "") + f"\n[Worker] Execution error: {str(e)}"
+            db.rollback()
+            updated = db.execute(update(Task).where(Task.id == task_id).values(status="FAILED"))
+            if updated.rowcount:
+                db.add(TaskLog(task_id=task_id, message=f"[Worker] Execution error: {str(e)}"))
                 db.commit()
 
             return {
@@ -150,8 +151,7 @@ def run_evaluation_job(evaluation_case_id: str) -> dict:
         start_time = time.time()
 
         # Run the task
-        orchestrator = AutonomousOrchestrator()
-        result = orchestrator.start_task(task.id)
+        result = AutonomousOrchestrator.start_task(task.id)
 
         execution_time = time.time() - start_time
 
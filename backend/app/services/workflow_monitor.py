@@ -7,7 +7,7 @@ Provides metrics, status tracking, and visualization for ASA workflows.
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.models import Task
 from app.services.state_machine import TaskState
@@ -48,7 +48,7 @@ class WorkflowMonitor:
         Returns:
             WorkflowMetrics object
         """
-        query = self.db.query(Task)
+        query = self.db.query(Task.status, Task.created_at, Task.updated_at)
 
         if time_window_hours:
             cutoff = datetime.utcnow() - timedelta(hours=time_window_hours)
@@ -143,6 +143,7 @@ class WorkflowMonitor:
         """
         tasks = (
             self.db.query(Task)
+            .options(load_only(Task.status, Task.created_at, Task.bug_description))
             .order_by(Task.created_at.desc())
             .limit(limit)
             .all()
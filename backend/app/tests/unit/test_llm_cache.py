@@ -0,0 +1,104 @@
+"""
+Unit Tests for LLM Response Cache.
+
+Tests key stability, TTL expiry, LRU eviction, semantic matching and
+env gating.
+"""
+
+import pytest
+
+from app.services import llm_cache
+from app.services.llm_cache import (
+    LLMCache,
+    SemanticLLMCache,
+    get_llm_cache,
+    get_semantic_llm_cache,
+    make_cache_key
+)
+
+
+class TestMakeCacheKey:
+    """Test cache key construction."""
+
+    def test_key_is_stable(self):
+        """Identical requests produce identical keys."""
+        messages = [{"role": "user", "content": "hi"}]
+        assert make_cache_key("gpt-4o", messages, 0.0, 100) == \
+            make_cache_key("gpt-4o", [{"content": "hi", "role": "user"}], 0.0, 100)
+
+    def test_key_depends_on_parameters(self):
+        """Changing any parameter changes the key."""
+        messages = [{"role": "user", "content": "hi"}]
+        base = make_cache_key("gpt-4o", messages, 0.0, 100)
+        assert base != make_cache_key("gpt-4o-mini", messages, 0.0, 100)
+        assert base != make_cache_key("gpt-4o", messages, 0.0, 200)
+
+
+class TestLLMCache:
+    """Test the in-memory backend."""
+
+    def test_set_and_get(self):
+        """Stored values are returned until they expire."""
+        cache = LLMCache()
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.get("missing") is None
+
+    def test_expired_entry_is_dropped(self):
+        """Entries past their TTL read as misses."""
+        cache = LLMCache()
+        cache.set("k", "v", ttl=-1)
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = LLMCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+
+
+class TestSemanticLLMCache:
+    """Test the embedding-similarity tier."""
+
+    def test_similar_prompt_hits(self):
+        """A close embedding in the same scope returns the cached response."""
+        pytest.importorskip("numpy")
+        cache = SemanticLLMCache(threshold=0.9)
+        cache.set("gpt-4o:0.0:100", [1.0, 0.0, 0.0], "cached")
+        assert cache.get("gpt-4o:0.0:100", [0.99, 0.05, 0.0]) == "cached"
+        assert cache.get("gpt-4o:0.0:100", [0.0, 1.0, 0.0]) is None
+
+    def test_scopes_are_isolated(self):
+        """Entries never match requests with a different model or parameters."""
+        pytest.importorskip("numpy")
+        cache = SemanticLLMCache()
+        cache.set("gpt-4o:0.0:100", [1.0, 0.0], "cached")
+        assert cache.get("gpt-4o-mini:0.0:100", [1.0, 0.0]) is None
+
+
+class TestGetLLMCache:
+    """Test env var gating."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Caching is off unless ASA_LLM_CACHE is set."""
+        monkeypatch.delenv("ASA_LLM_CACHE", raising=False)
+        assert get_llm_cache() is None
+
+    def test_memory_backend(self, monkeypatch):
+        """ASA_LLM_CACHE=1 selects the in-process cache."""
+        monkeypatch.setenv("ASA_LLM_CACHE", "1")
+        monkeypatch.setattr(llm_cache, "_llm_cache", None)
+        assert isinstance(get_llm_cache(), LLMCache)
+
+    def test_semantic_disabled_by_default(self, monkeypatch):
+        """The semantic tier is off unless ASA_LLM_SEMANTIC_CACHE is set."""
+        monkeypatch.delenv("ASA_LLM_SEMANTIC_CACHE", raising=False)
+        assert get_semantic_llm_cache() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
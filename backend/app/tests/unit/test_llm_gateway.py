@@ -67,6 +67,31 @@ class TestLLMGatewayBudgets:
 
         assert exc_info.value.error_type == ErrorType.COST_BUDGET_EXCEEDED
 
+    @patch('app.services.llm_gateway.SessionLocal')
+    @patch('app.services.llm_gateway.OpenAI')
+    def test_projected_tokens_rejected_before_call(self, mock_openai, mock_db):
+        """Test that a call that could overrun the budget is never sent."""
+        mock_session = Mock()
+        mock_db.return_value = mock_session
+
+        # Just under the budget, but not enough room for max_tokens
+        mock_result = Mock()
+        mock_result.total_tokens = 49990
+        mock_result.total_cost = 0.0
+        mock_session.query.return_value.filter.return_value.first.return_value = mock_result
+
+        gateway = LLMGateway(task_id="test-task", db=mock_session)
+        gateway.client = Mock()
+
+        with pytest.raises(ASAError) as exc_info:
+            gateway.chat_completion(
+                purpose=LLMPurpose.FIX_GENERATION,
+                messages=[{"role": "user", "content": "test"}]
+            )
+
+        assert exc_info.value.error_type == ErrorType.TOKEN_BUDGET_EXCEEDED
+        gateway.client.chat.completions.create.assert_not_called()
+
 
 class TestLLMGatewayErrorHandling:
     """Test error handling and classification."""
@@ -170,8 +195,10 @@ class TestLLMGatewayUsageTracking:
             messages=[{"role": "user", "content": "test"}]
         )
 
-        # Verify usage was logged
-        assert mock_session.add.called
+        # Usage is buffered, then written in one insert on flush
+        assert not mock_session.commit.called
+        gateway.flush_usage()
+        assert mock_session.execute.called
         assert mock_session.commit.called
         assert response == "test response"
 